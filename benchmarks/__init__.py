@@ -0,0 +1,12 @@
+# benchmarks/__init__.py
+"""
+Benchmarks for the eos hot paths.
+
+Run with:
+
+    python -m benchmarks                  # compare against the stored baseline
+    python -m benchmarks --save-baseline  # record a new baseline
+    python -m benchmarks --help
+
+Only meaningful with a real gamedata database (eve.db) available to eos.
+"""
@@ -0,0 +1,120 @@
+# benchmarks/__main__.py
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from benchmarks.corpus import SCENARIOS
+from benchmarks.loader import FitBuilder, init_eos
+from benchmarks.runner import (
+    BASELINE_FILE,
+    STAGES,
+    THRESHOLDS,
+    compare,
+    environment,
+    format_report,
+    load_baseline,
+    run_benchmarks,
+    save_baseline,
+)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the eos hot paths.")
+    parser.add_argument("--gamedata", type=Path, help="path to eve.db (default: the one eos is configured with)")
+    parser.add_argument("--scenario", action="append", help="only run scenarios whose name contains this")
+    parser.add_argument("--stage", action="append", choices=[s.name for s in STAGES], help="only run this stage")
+    parser.add_argument("--repeat", type=int, default=50, help="timed runs per stage (default: 50)")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed runs per stage (default: 3)")
+    parser.add_argument("--no-alloc", action="store_true", help="skip allocation tracking")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument(
+        "--profile-effects",
+        type=Path,
+        metavar="PREFIX",
+        help="profile effect handlers and write PREFIX.json and PREFIX.folded (skews timings)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help="allowed relative slowdown for every metric, e.g. 0.1 (default: per metric)",
+    )
+    args = parser.parse_args(argv)
+    if args.profile_effects is not None and args.save_baseline:
+        parser.error("--profile-effects skews timings and can't be combined with --save-baseline")
+
+    db = init_eos(args.gamedata)
+    builder = FitBuilder(db)
+
+    scenarios = [
+        s for s in SCENARIOS
+        if not args.scenario or any(part in s.name for part in args.scenario)
+    ]
+    stages = [s for s in STAGES if not args.stage or s.name in args.stage]
+    loaded = [builder.load(s) for s in scenarios]
+
+    profiler = None
+    if args.profile_effects is not None:
+        from eos import effectProfiler
+
+        profiler = effectProfiler.profiler
+        profiler.reset()
+        profiler.enable()
+
+    try:
+        results = run_benchmarks(
+            loaded,
+            stages=stages,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            allocations=not args.no_alloc,
+            progress=lambda key: print(f"  {key}", file=sys.stderr),
+        )
+    finally:
+        if profiler is not None:
+            profiler.disable()
+
+    if profiler is not None:
+        prefix = str(args.profile_effects)
+        profiler.exportJson(prefix + ".json")
+        profiler.exportFolded(prefix + ".folded")
+        print(f"Effect profile written to {prefix}.json and {prefix}.folded", file=sys.stderr)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(format_report(results))
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+
+    current_env = environment()
+    for field_name, value in baseline.get("environment", {}).items():
+        if current_env.get(field_name) != value:
+            print(f"\nNote: baseline {field_name} was {value!r}, now {current_env.get(field_name)!r}")
+
+    thresholds = THRESHOLDS
+    if args.threshold is not None:
+        thresholds = {metric: args.threshold for metric in THRESHOLDS}
+
+    regressions = compare(results, baseline, thresholds)
+    if not regressions:
+        print("\nNo regressions against the baseline.")
+        return 0
+
+    print(f"\n{len(regressions)} regression(s):")
+    for reg in regressions:
+        print(f"  {reg.key} {reg.metric}: {reg.baseline:.3f} -> {reg.current:.3f} ({(reg.ratio - 1.0) * 100:+.1f}%)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+# benchmarks/corpus.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+
+
+# --------------------------------------------------------------------------- #
+# Fits
+# --------------------------------------------------------------------------- #
+# Representative EFT fits, from frigates up to supercapitals and structures.
+# Keys are the short names used in reports and scenarios.
+
+FITS: Dict[str, str] = {
+    "rifter": """
+[Rifter, Bench Rifter]
+Gyrostabilizer II
+Small Ancillary Armor Repairer, Nanite Repair Paste
+200mm Steel Plates II
+
+5MN Y-T8 Compact Microwarpdrive
+Warp Scrambler II
+Stasis Webifier II
+
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+200mm AutoCannon II, Republic Fleet EMP S
+[Empty High slot]
+
+Small Projectile Burst Aerator I
+Small Projectile Collision Accelerator I
+Small Projectile Ambit Extension I
+""",
+    "vexor": """
+[Vexor, Bench Vexor]
+Drone Damage Amplifier II
+Drone Damage Amplifier II
+Medium Armor Repairer II
+Energized Adaptive Nano Membrane II
+1600mm Steel Plates II
+
+10MN Afterburner II
+Medium Cap Battery II
+Drone Navigation Computer II
+
+Heavy Neutron Blaster II, Null M
+Heavy Neutron Blaster II, Null M
+Heavy Neutron Blaster II, Null M
+Small Energy Neutralizer II
+
+Medium Auxiliary Nano Pump I
+Medium Auxiliary Nano Pump I
+Medium Nanobot Accelerator I
+
+Hammerhead II x5
+Hobgoblin II x5
+""",
+    "legion": """
+[Legion, Bench Legion]
+Heat Sink II
+Heat Sink II
+Medium Armor Repairer II
+Reactive Armor Hardener
+Energized Adaptive Nano Membrane II
+
+50MN Microwarpdrive II
+Medium Cap Battery II
+Warp Disruptor II
+
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+Heavy Pulse Laser II, Scorch M
+
+Medium Energy Collision Accelerator I
+Medium Energy Burst Aerator I
+
+Legion Core - Dissolution Sequencer
+Legion Defensive - Augmented Plating
+Legion Offensive - Liquid Crystal Magnifiers
+Legion Propulsion - Intercalated Nanofibers
+""",
+    "megathron": """
+[Megathron, Bench Megathron]
+Magnetic Field Stabilizer II
+Magnetic Field Stabilizer II
+Magnetic Field Stabilizer II
+Large Armor Repairer II
+1600mm Steel Plates II
+Energized Adaptive Nano Membrane II
+Damage Control II
+
+500MN Microwarpdrive II
+Large Cap Battery II
+Tracking Computer II, Optimal Range Script
+Stasis Webifier II
+
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+Neutron Blaster Cannon II, Void L
+
+Large Hybrid Collision Accelerator I
+Large Hybrid Burst Aerator I
+Large Auxiliary Nano Pump I
+
+Hammerhead II x5
+""",
+    "raven": """
+[Raven, Bench Raven]
+Ballistic Control System II
+Ballistic Control System II
+Ballistic Control System II
+Damage Control II
+
+Large Shield Extender II
+Large Shield Extender II
+Multispectrum Shield Hardener II
+Missile Guidance Computer II, Missile Range Script
+Large Micro Jump Drive
+Target Painter II
+
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+Cruise Missile Launcher II, Scourge Fury Cruise Missile
+
+Large Warhead Rigor Catalyst I
+Large Bay Loading Accelerator I
+Large Core Defense Field Extender I
+""",
+    "paladin": """
+[Paladin, Bench Paladin]
+Heat Sink II
+Heat Sink II
+Heat Sink II
+Large Armor Repairer II
+Large Armor Repairer II
+Energized Adaptive Nano Membrane II
+Damage Control II
+
+Large Micro Jump Drive
+Tracking Computer II, Optimal Range Script
+Heavy Capacitor Booster II, Navy Cap Booster 800
+Stasis Webifier II
+
+Mega Pulse Laser II, Conflagration L
+Mega Pulse Laser II, Conflagration L
+Mega Pulse Laser II, Conflagration L
+Mega Pulse Laser II, Conflagration L
+Bastion Module I
+
+Large Energy Metastasis Adjuster I
+Large Capacitor Control Circuit I
+""",
+    "maelstrom": """
+[Maelstrom, Bench Maelstrom]
+Gyrostabilizer II
+Gyrostabilizer II
+Gyrostabilizer II
+Damage Control II
+
+Large Shield Extender II
+Large Shield Extender II
+Multispectrum Shield Hardener II
+Multispectrum Shield Hardener II
+500MN Microwarpdrive II
+
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+1400mm Howitzer Artillery II, Republic Fleet EMP L
+
+Large Core Defense Field Extender I
+Large Core Defense Field Extender I
+Large Core Defense Field Extender I
+""",
+    "scimitar": """
+[Scimitar, Bench Scimitar]
+Damage Control II
+Power Diagnostic System II
+
+10MN Afterburner II
+Large Shield Extender II
+Multispectrum Shield Hardener II
+Multispectrum Shield Hardener II
+Sensor Booster II, Scan Resolution Script
+
+Large Remote Shield Booster II
+Large Remote Shield Booster II
+Large Remote Shield Booster II
+Large Remote Shield Booster II
+
+Medium Core Defense Field Extender I
+Medium Core Defense Field Extender I
+""",
+    "claymore": """
+[Claymore, Bench Claymore]
+Ballistic Control System II
+Damage Control II
+Power Diagnostic System II
+
+Large Shield Extender II
+Large Shield Extender II
+Multispectrum Shield Hardener II
+10MN Afterburner II
+
+Shield Command Burst II, Active Shielding Charge
+Shield Command Burst II, Shield Harmonizing Charge
+Skirmish Command Burst II, Interdiction Maneuvers Charge
+Heavy Assault Missile Launcher II, Scourge Rage Heavy Assault Missile
+Heavy Assault Missile Launcher II, Scourge Rage Heavy Assault Missile
+
+Medium Core Defense Field Extender I
+Medium Core Defense Field Extender I
+""",
+    "thanatos": """
+[Thanatos, Bench Thanatos]
+Capital Armor Repairer II
+Fighter Support Unit II
+Fighter Support Unit II
+Energized Adaptive Nano Membrane II
+Energized Adaptive Nano Membrane II
+Damage Control II
+
+Capital Cap Battery II
+Warp Disruptor II
+Stasis Webifier II
+
+Capital Remote Armor Repairer II
+
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+
+Firbolg x9
+Firbolg x9
+""",
+    "revelation": """
+[Revelation, Bench Revelation]
+Heat Sink II
+Heat Sink II
+Heat Sink II
+Capital Armor Repairer II
+Energized Adaptive Nano Membrane II
+Energized Adaptive Nano Membrane II
+
+Capital Cap Battery II
+Tracking Computer II, Optimal Range Script
+Stasis Webifier II
+
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Siege Module II
+
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+""",
+    "nyx": """
+[Nyx, Bench Nyx]
+Fighter Support Unit II
+Fighter Support Unit II
+Fighter Support Unit II
+Capital Armor Repairer II
+Energized Adaptive Nano Membrane II
+Energized Adaptive Nano Membrane II
+Damage Control II
+
+Capital Cap Battery II
+Warp Disruptor II
+
+Capital Remote Armor Repairer II
+
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+
+Firbolg x9
+Firbolg x9
+Ametat x6
+""",
+    "avatar": """
+[Avatar, Bench Avatar]
+Heat Sink II
+Heat Sink II
+Heat Sink II
+Capital Armor Repairer II
+Energized Adaptive Nano Membrane II
+Energized Adaptive Nano Membrane II
+Damage Control II
+
+Capital Cap Battery II
+Tracking Computer II, Optimal Range Script
+
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+Dual Giga Pulse Laser II, Conflagration XL
+
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+Capital Trimark Armor Pump I
+""",
+    "astrahus": """
+[Astrahus, Bench Astrahus]
+Standup Ballistic Control System I
+Standup Ballistic Control System I
+
+Standup Stasis Webifier I
+Standup Warp Scrambler I
+Standup Target Painter I
+
+Standup Multirole Missile Launcher I, Standup Cruise Missile
+Standup Multirole Missile Launcher I, Standup Cruise Missile
+Standup Point Defense Battery I
+""",
+}
+
+
+# --------------------------------------------------------------------------- #
+# Scenarios
+# --------------------------------------------------------------------------- #
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    One benchmark subject: a fit, optionally with projected and command fits.
+
+    `projected` and `command` name other entries of FITS. Each entry in
+    `projected` is (fit name, amount).
+    """
+    name: str
+    fit: str
+    projected: Tuple[Tuple[str, int], ...] = field(default_factory=tuple)
+    command: Tuple[str, ...] = field(default_factory=tuple)
+
+
+SCENARIOS: Tuple[Scenario, ...] = tuple(Scenario(name=name, fit=name) for name in FITS) + (
+    Scenario(
+        name="maelstrom+logi+links",
+        fit="maelstrom",
+        projected=(("scimitar", 3),),
+        command=("claymore",),
+    ),
+    Scenario(
+        name="paladin+neut",
+        fit="paladin",
+        projected=(("vexor", 2),),
+    ),
+)
@@ -0,0 +1,212 @@
+# benchmarks/loader.py
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.corpus import FITS, Scenario
+from evefit_core.fit_parser import EftFormatError, read_eft
+
+EOS_PARENT = Path(__file__).resolve().parent.parent / "evefit_core"
+
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+# --------------------------------------------------------------------------- #
+# eos setup
+# --------------------------------------------------------------------------- #
+
+def init_eos(gamedata_path: Optional[Path] = None):
+    """
+    Import eos with an in-memory saveddata database.
+
+    Saved data must never touch the user's database during a benchmark, so
+    the connection string is overridden before eos.db is first imported.
+    Returns the eos.db module.
+    """
+    if str(EOS_PARENT) not in sys.path:
+        sys.path.insert(0, str(EOS_PARENT))
+
+    import eos.config
+
+    if "eos.db" not in sys.modules:
+        eos.config.saveddata_connectionstring = "sqlite:///:memory:"
+        if gamedata_path is not None:
+            eos.config.gamedata_connectionstring = "sqlite:///" + str(Path(gamedata_path).resolve())
+
+    import eos.db
+
+    if eos.config.gamedata_version is None:
+        raise BenchmarkError(f"No usable gamedata at {eos.config.gamedata_connectionstring}")
+    return eos.db
+
+
+# --------------------------------------------------------------------------- #
+# EFT
+# --------------------------------------------------------------------------- #
+
+@dataclass
+class EftLine:
+    name: str
+    charge: Optional[str] = None
+    count: int = 1
+    offline: bool = False
+
+
+def parse_eft(eft_text: str) -> Tuple[str, str, List[EftLine]]:
+    """
+    Parse a single EFT block into (ship type, fit name, item lines).
+
+    Read with evefit_core.fit_parser.read_eft; empty slot markers are
+    dropped and names stay as written (no gamedata lookup).
+    """
+    try:
+        parsed = read_eft(eft_text)
+    except EftFormatError as e:
+        raise BenchmarkError(f"Bad EFT block: {e}") from e
+
+    items = [
+        EftLine(name=item.name, charge=item.charge, count=item.quantity, offline=item.offline)
+        for item in parsed.items
+    ]
+    return parsed.ship_type, parsed.name, items
+
+
+# --------------------------------------------------------------------------- #
+# Fit building
+# --------------------------------------------------------------------------- #
+
+@dataclass
+class LoadedScenario:
+    """
+    A scenario turned into eos objects.
+
+    `fit` is the fit being measured; projected and command fits hang off it.
+    `item_names` lists every type name resolved while building, for the
+    gamedata query benchmarks.
+    """
+    scenario: Scenario
+    fit: object
+    item_names: List[str] = field(default_factory=list)
+
+
+class FitBuilder:
+    """
+    Builds eos fits from corpus EFT text.
+
+    All fits share one in-memory All 5 character, so skill setup is paid
+    once and not measured.
+    """
+
+    def __init__(self, db) -> None:
+        from eos.saveddata.character import Character
+
+        self.db = db
+        self.character = Character("All 5", 5)
+        self._items: Dict[str, object] = {}
+
+    def item(self, name: str):
+        item = self._items.get(name)
+        if item is None:
+            item = self.db.getItem(name)
+            if item is None:
+                raise BenchmarkError(f"Unknown type: {name!r}")
+            self._items[name] = item
+        return item
+
+    def build_fit(self, eft_text: str, names: Optional[List[str]] = None):
+        from eos.const import FittingModuleState
+        from eos.saveddata.booster import Booster
+        from eos.saveddata.cargo import Cargo
+        from eos.saveddata.citadel import Citadel
+        from eos.saveddata.drone import Drone
+        from eos.saveddata.fighter import Fighter
+        from eos.saveddata.fit import Fit
+        from eos.saveddata.implant import Implant
+        from eos.saveddata.module import Module
+        from eos.saveddata.ship import Ship
+
+        ship_name, fit_name, lines = parse_eft(eft_text)
+        if names is not None:
+            names.append(ship_name)
+
+        ship_item = self.item(ship_name)
+        try:
+            ship = Ship(ship_item)
+        except ValueError:
+            ship = Citadel(ship_item)
+
+        fit = Fit(ship, fit_name)
+        fit.character = self.character
+
+        for line in lines:
+            item = self.item(line.name)
+            if names is not None:
+                names.append(line.name)
+                if line.charge:
+                    names.append(line.charge)
+
+            if item.isModule or item.isSubsystem:
+                for _ in range(line.count):
+                    mod = Module(item)
+                    if line.charge:
+                        mod.charge = self.item(line.charge)
+                    if line.offline:
+                        mod.state = FittingModuleState.OFFLINE
+                    elif mod.isValidState(FittingModuleState.ACTIVE):
+                        mod.state = FittingModuleState.ACTIVE
+                    fit.modules.append(mod)
+            elif item.isDrone:
+                drone = Drone(item)
+                drone.amount = line.count
+                drone.amountActive = line.count
+                fit.drones.append(drone)
+            elif item.isFighter:
+                fighter = Fighter(item)
+                fighter.amount = line.count
+                fit.fighters.append(fighter)
+            elif item.isImplant:
+                fit.implants.append(Implant(item))
+            elif item.isBooster:
+                fit.boosters.append(Booster(item))
+            else:
+                cargo = Cargo(item)
+                cargo.amount = line.count
+                fit.cargo.append(cargo)
+
+        return fit
+
+    def load(self, scenario: Scenario) -> LoadedScenario:
+        """
+        Build a scenario with fresh fit objects.
+
+        Projected and command links are stored through the in-memory saved
+        data session, the same way the app stores them.
+        """
+        names: List[str] = []
+        fit = self.build_fit(FITS[scenario.fit], names)
+
+        if scenario.projected or scenario.command:
+            self.db.save(fit)
+
+            for source_name, amount in scenario.projected:
+                source = self.build_fit(FITS[source_name], names)
+                self.db.save(source)
+                fit.projectedFitDict[source.ID] = source
+                self.db.commit()
+                source.getProjectionInfo(fit.ID).amount = amount
+
+            for booster_name in scenario.command:
+                booster = self.build_fit(FITS[booster_name], names)
+                self.db.save(booster)
+                fit.commandFitDict[booster.ID] = booster
+
+            self.db.commit()
+
+        return LoadedScenario(scenario=scenario, fit=fit, item_names=names)
@@ -0,0 +1,336 @@
+# benchmarks/runner.py
+
+from __future__ import annotations
+
+import gc
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from benchmarks.loader import LoadedScenario
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+
+# Allowed slowdown relative to the baseline, per metric. Tail percentiles
+# are noisier, so they get more slack.
+THRESHOLDS: Dict[str, float] = {
+    "p50_ms": 0.10,
+    "p95_ms": 0.20,
+    "p99_ms": 0.30,
+    "peak_kib": 0.10,
+}
+# Differences below these are noise, whatever the ratio
+MIN_DELTA = {
+    "p50_ms": 0.05,
+    "p95_ms": 0.05,
+    "p99_ms": 0.05,
+    "peak_kib": 16.0,
+}
+
+
+# --------------------------------------------------------------------------- #
+# Stages
+# --------------------------------------------------------------------------- #
+
+def _reset_fit_cache(fit, *names: str) -> None:
+    # Fit keeps its derived numbers in name-mangled private attributes; the
+    # stages below time the computation, not the cache hit.
+    for name in names:
+        value = getattr(fit, "_Fit__" + name)
+        setattr(fit, "_Fit__" + name, {} if isinstance(value, dict) else None)
+
+
+def _calc(loaded: LoadedScenario) -> None:
+    fit = loaded.fit
+    fit.clear()
+    fit.calculateModifiedAttributes()
+
+
+def _cap_sim(loaded: LoadedScenario) -> None:
+    loaded.fit.simulateCap()
+
+
+def _reset_sustainable_tank(loaded: LoadedScenario) -> None:
+    _reset_fit_cache(loaded.fit, "sustainableTank", "effectiveSustainableTank")
+
+
+def _sustainable_tank(loaded: LoadedScenario) -> None:
+    loaded.fit.calculateSustainableTank()
+
+
+def _reset_damage(loaded: LoadedScenario) -> None:
+    _reset_fit_cache(loaded.fit, "weaponDpsMap", "weaponVolleyMap", "droneDps", "droneVolley", "remoteRepMap")
+
+
+def _damage(loaded: LoadedScenario) -> None:
+    from eos.utils.spoolSupport import SpoolOptions, SpoolType
+
+    fit = loaded.fit
+    full_spool = SpoolOptions(SpoolType.SPOOL_SCALE, 1, True)
+    fit.getTotalDps()
+    fit.getTotalVolley()
+    fit.getTotalDps(spoolOptions=full_spool)
+    fit.getTotalVolley(spoolOptions=full_spool)
+    fit.getRemoteReps()
+
+
+def _ehp_patterns(loaded: LoadedScenario) -> None:
+    from eos.saveddata.damagePattern import DamagePattern
+
+    fit = loaded.fit
+    for pattern in DamagePattern.getBuiltinList():
+        # The setter drops the cached EHP and effective tank
+        fit.damagePattern = pattern
+        fit.ehp
+        fit.effectiveTank
+    fit.damagePattern = None
+
+
+def _gamedata(loaded: LoadedScenario) -> None:
+    import eos.db
+
+    for name in loaded.item_names:
+        eos.db.getItem(name, useCache=False)
+
+
+def _gamedata_cached(loaded: LoadedScenario) -> None:
+    import eos.db
+
+    for name in loaded.item_names:
+        eos.db.getItem(name)
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    run: Callable[[LoadedScenario], None]
+    # Runs before every sample, outside the timed region
+    setup: Optional[Callable[[LoadedScenario], None]] = None
+
+
+# Order matters: every stage after "calc" reads the calculated fit.
+STAGES: Sequence[Stage] = (
+    Stage("calc", _calc),
+    Stage("cap_sim", _cap_sim),
+    Stage("sustainable_tank", _sustainable_tank, setup=_reset_sustainable_tank),
+    Stage("damage", _damage, setup=_reset_damage),
+    Stage("ehp_patterns", _ehp_patterns),
+    Stage("gamedata", _gamedata),
+    Stage("gamedata_cached", _gamedata_cached),
+)
+
+
+# --------------------------------------------------------------------------- #
+# Measuring
+# --------------------------------------------------------------------------- #
+
+@dataclass
+class StageResult:
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    samples: int
+    # Allocations during one run, from tracemalloc
+    peak_kib: float
+    retained_kib: float
+    blocks: int
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _time_stage(stage: Stage, loaded: LoadedScenario, repeat: int, warmup: int) -> List[float]:
+    samples: List[float] = []
+    for i in range(warmup + repeat):
+        if stage.setup is not None:
+            stage.setup(loaded)
+        start = time.perf_counter_ns()
+        stage.run(loaded)
+        elapsed = time.perf_counter_ns() - start
+        if i >= warmup:
+            samples.append(elapsed / 1e6)
+    return samples
+
+
+def _measure_allocations(stage: Stage, loaded: LoadedScenario):
+    if stage.setup is not None:
+        stage.setup(loaded)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base_current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        stage.run(loaded)
+
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(max(0, diff.count_diff) for diff in after.compare_to(before, "lineno"))
+    return (peak - base_current) / 1024.0, (current - base_current) / 1024.0, blocks
+
+
+def run_benchmarks(
+    scenarios: Sequence[LoadedScenario],
+    stages: Sequence[Stage] = STAGES,
+    repeat: int = 50,
+    warmup: int = 3,
+    allocations: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, StageResult]:
+    """
+    Run every stage against every scenario.
+
+    Results are keyed "<stage>/<scenario>". Timing and allocation tracking
+    happen in separate passes so tracemalloc doesn't skew the timings.
+    """
+    results: Dict[str, StageResult] = {}
+
+    for loaded in scenarios:
+        # Everything after "calc" needs a calculated fit, even when "calc"
+        # itself isn't selected.
+        _calc(loaded)
+
+        for stage in stages:
+            key = f"{stage.name}/{loaded.scenario.name}"
+            if progress is not None:
+                progress(key)
+
+            gc.disable()
+            try:
+                samples = sorted(_time_stage(stage, loaded, repeat, warmup))
+            finally:
+                gc.enable()
+
+            peak_kib = retained_kib = 0.0
+            blocks = 0
+            if allocations:
+                peak_kib, retained_kib, blocks = _measure_allocations(stage, loaded)
+
+            results[key] = StageResult(
+                p50_ms=percentile(samples, 0.50),
+                p95_ms=percentile(samples, 0.95),
+                p99_ms=percentile(samples, 0.99),
+                samples=len(samples),
+                peak_kib=peak_kib,
+                retained_kib=retained_kib,
+                blocks=blocks,
+            )
+
+    return results
+
+
+# --------------------------------------------------------------------------- #
+# Baselines
+# --------------------------------------------------------------------------- #
+
+def environment() -> Dict[str, str]:
+    import eos.config
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "gamedata_version": str(eos.config.gamedata_version),
+    }
+
+
+def save_baseline(results: Dict[str, StageResult], path: Path = BASELINE_FILE) -> None:
+    data = {
+        "environment": environment(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {key: asdict(result) for key, result in sorted(results.items())},
+    }
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Optional[dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@dataclass
+class Regression:
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+
+def compare(
+    results: Dict[str, StageResult],
+    baseline: dict,
+    thresholds: Dict[str, float] = THRESHOLDS,
+) -> List[Regression]:
+    """
+    Metrics that got worse than the baseline by more than their threshold.
+
+    Stages missing from either side are skipped.
+    """
+    regressions: List[Regression] = []
+    stored = baseline.get("results", {})
+
+    for key, result in sorted(results.items()):
+        old = stored.get(key)
+        if old is None:
+            continue
+        for metric, allowed in thresholds.items():
+            before = float(old.get(metric, 0.0))
+            after = float(getattr(result, metric))
+            if after - before <= MIN_DELTA.get(metric, 0.0):
+                continue
+            if after > before * (1.0 + allowed):
+                regressions.append(Regression(key, metric, before, after))
+
+    return regressions
+
+
+# --------------------------------------------------------------------------- #
+# Reporting
+# --------------------------------------------------------------------------- #
+
+def format_report(results: Dict[str, StageResult], baseline: Optional[dict] = None) -> str:
+    stored = (baseline or {}).get("results", {})
+    width = max([len(key) for key in results] + [len("stage/scenario")])
+
+    header = f"{'stage/scenario':<{width}}  {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  {'peak KiB':>9} {'kept KiB':>9} {'blocks':>7}"
+    if stored:
+        header += f"  {'p50 vs base':>11}"
+    lines = [header, "-" * len(header)]
+
+    for key, r in results.items():
+        line = (
+            f"{key:<{width}}  {r.p50_ms:9.3f} {r.p95_ms:9.3f} {r.p99_ms:9.3f}"
+            f"  {r.peak_kib:9.1f} {r.retained_kib:9.1f} {r.blocks:7d}"
+        )
+        old = stored.get(key)
+        if old is not None and old.get("p50_ms"):
+            line += f"  {(r.p50_ms / old['p50_ms'] - 1.0) * 100:+10.1f}%"
+        lines.append(line)
+
+    return "\n".join(lines)
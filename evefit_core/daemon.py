@@ -0,0 +1,516 @@
+# evefit_core/daemon.py
+"""
+Long-lived evaluation daemon.
+
+Keeps the engine, its gamedata and the result caches warm, and answers
+evaluation requests from other local programs over
+
+  - a Unix domain socket, one JSON request per line and one JSON response
+    per line (requests on one connection may be pipelined; responses carry
+    the request's "id"), and/or
+  - local HTTP: POST /evaluate with a JSON body, GET /health.
+
+A request looks like
+
+    {"id": 1, "eft": "[Rifter, My Rifter]\\n...", "profile": "Main"}
+
+with either "profile" (name of a stored skill profile) or "skills" (a
+{skill name: level} mapping). The response carries FitStats as JSON:
+
+    {"id": 1, "ok": true, "cached": false, "elapsed_ms": 3.1, "stats": {...}}
+
+Identical requests that are in flight at the same time share one
+evaluation. At most `max_pending` requests are accepted at once; beyond that
+requests are rejected with "busy" (HTTP 503) instead of queueing up.
+
+    python -m evefit_core.daemon --socket data/evefit.sock --http 8765
+
+With --processes N, evaluations run in N worker processes forked from the
+warm daemon (see evefit_core.prefork); caching stays in the daemon.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from evefit_core.evaluation import FitEvaluator
+from evefit_core.fit_engine import FitEngine
+from evefit_core.fit_models import Fit, SkillProfile
+from evefit_core.fit_parser import EftFormatError, read_eft
+from evefit_core.prefork import PreforkEngine
+from evefit_core.result_cache import PersistentEvaluationCache
+from evefit_core.skills import MAX_SKILL_LEVEL, SkillProfileRepository, get_skill_repository
+from evefit_core.storage import DATA_DIR
+
+DEFAULT_SOCKET = DATA_DIR / "evefit.sock"
+DEFAULT_HTTP_PORT = 8765
+
+# Upper bound for one request line / HTTP body
+MAX_REQUEST_BYTES = 1 << 20
+
+_HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """
+    The request itself is wrong; reported back to the client.
+    """
+
+
+class DaemonBusy(Exception):
+    """
+    Too many requests in flight.
+    """
+
+
+def _is_skill_level(value: object) -> bool:
+    # JSON true/false arrive as bools, which are ints to Python
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= MAX_SKILL_LEVEL
+
+
+def fit_from_eft(eft_text: str) -> Fit:
+    """
+    Build a Fit from EFT text, the same way the add-fit dialog does.
+    """
+    try:
+        parsed = read_eft(eft_text)
+    except EftFormatError as e:
+        raise RequestError(str(e)) from e
+    ship, name = parsed.ship_type, parsed.name
+    return Fit(id=f"{ship}-{name}", name=name, ship_type=ship, eft_text=eft_text.strip())
+
+
+def _socket_in_use(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        try:
+            sock.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+        except OSError:
+            # Answered, but not in time: someone is there
+            return True
+    return True
+
+
+class EvaluationDaemon:
+    """
+    Protocol-independent request handling, plus the two servers.
+    """
+
+    # How often stored skill profiles are re-read from disk
+    PROFILE_REFRESH_SECONDS = 2.0
+
+    def __init__(
+        self,
+        evaluator: FitEvaluator,
+        skill_repository: Optional[SkillProfileRepository] = None,
+        max_pending: int = 256,
+    ) -> None:
+        self.evaluator = evaluator
+        self.skill_repository = skill_repository if skill_repository is not None else get_skill_repository()
+        self.max_pending = max_pending
+
+        self._pending = 0
+        self._last_profile_refresh = 0.0
+        # Cache lookups (SQLite, hashing) and profile rescans block; they run
+        # here, one at a time, so the profile repository is only ever used
+        # from this thread
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-io")
+        self._servers = []
+        self.counters: Dict[str, int] = {"requests": 0, "cached": 0, "evaluated": 0, "busy": 0, "errors": 0}
+
+    # ------------------------------------------------------------------ #
+    # Requests
+    # ------------------------------------------------------------------ #
+
+    async def handle(self, request: object) -> dict:
+        """
+        Answer one decoded request. Never raises.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        self.counters["requests"] += 1
+        start = time.perf_counter()
+
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+
+            op = request.get("op", "evaluate")
+            if op == "health":
+                return {"id": request_id, "ok": True, **self.health()}
+            if op != "evaluate":
+                raise RequestError(f"unknown op {op!r}")
+
+            stats, cached = await self._evaluate(request)
+        except RequestError as e:
+            self.counters["errors"] += 1
+            return {"id": request_id, "ok": False, "error": str(e)}
+        except DaemonBusy:
+            self.counters["busy"] += 1
+            return {"id": request_id, "ok": False, "error": "busy"}
+        except Exception as e:
+            self.counters["errors"] += 1
+            return {"id": request_id, "ok": False, "error": f"evaluation failed: {e}"}
+
+        self.counters["cached" if cached else "evaluated"] += 1
+        return {
+            "id": request_id,
+            "ok": True,
+            "cached": cached,
+            "elapsed_ms": (time.perf_counter() - start) * 1000.0,
+            "stats": asdict(stats),
+        }
+
+    def health(self) -> dict:
+        return {
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "gamedata_version": str(self.evaluator.engine.gamedata_version),
+            "counters": dict(self.counters),
+        }
+
+    async def _evaluate(self, request: dict):
+        eft = request.get("eft")
+        if not isinstance(eft, str) or not eft.strip():
+            raise RequestError("missing 'eft'")
+        fit = fit_from_eft(eft)
+        loop = asyncio.get_running_loop()
+        skills = await loop.run_in_executor(self._io, self._skills_for, request)
+
+        # Cache hits don't need an evaluation worker
+        cached = await loop.run_in_executor(self._io, self.evaluator.cached, fit, skills)
+        if cached is not None:
+            return cached.stats, True
+
+        if self._pending >= self.max_pending:
+            raise DaemonBusy()
+
+        self._pending += 1
+        try:
+            # submit() looks in the cache too
+            future = await loop.run_in_executor(self._io, self.evaluator.submit, fit, skills)
+            # Shielded: identical requests share this future, so one client
+            # going away must not cancel it for the others.
+            evaluated = await asyncio.shield(asyncio.wrap_future(future))
+        finally:
+            self._pending -= 1
+        return evaluated.stats, False
+
+    def _skills_for(self, request: dict) -> SkillProfile:
+        # Runs on the daemon's I/O thread
+        if "skills" in request:
+            skills = request["skills"]
+            if not isinstance(skills, dict) or not all(
+                isinstance(k, str) and _is_skill_level(v) for k, v in skills.items()
+            ):
+                raise RequestError(f"'skills' must map skill names to integer levels 0-{MAX_SKILL_LEVEL}")
+            return SkillProfile(name=str(request.get("profile") or "inline"), skills=skills)
+
+        name = request.get("profile")
+        if name is None:
+            return SkillProfile(name="none", skills={})
+        if not isinstance(name, str):
+            raise RequestError("'profile' must be a string")
+
+        now = time.monotonic()
+        if now - self._last_profile_refresh > self.PROFILE_REFRESH_SECONDS:
+            self.skill_repository.refresh()
+            self._last_profile_refresh = now
+
+        profile = self.skill_repository.get(name)
+        if profile is None:
+            raise RequestError(f"unknown skill profile {name!r}")
+        return profile
+
+    # ------------------------------------------------------------------ #
+    # Unix socket: JSON lines
+    # ------------------------------------------------------------------ #
+
+    async def serve_unix(self, path: Path) -> asyncio.AbstractServer:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            if _socket_in_use(path):
+                raise RuntimeError(f"another daemon is listening on {path}")
+            # Left behind by a daemon that didn't shut down cleanly
+            path.unlink()
+        server = await asyncio.start_unix_server(self._handle_lines, path=str(path), limit=MAX_REQUEST_BYTES)
+        os.chmod(path, 0o600)
+        self._servers.append(server)
+        return server
+
+    async def _handle_lines(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"id": None, "ok": False, "error": "invalid JSON"}
+            else:
+                response = await self.handle(request)
+            async with write_lock:
+                writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line longer than MAX_REQUEST_BYTES
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------ #
+    # HTTP
+    # ------------------------------------------------------------------ #
+
+    async def serve_http(self, host: str = "127.0.0.1", port: int = DEFAULT_HTTP_PORT) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self._handle_http, host=host, port=port, limit=MAX_REQUEST_BYTES)
+        self._servers.append(server)
+        return server
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_http_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+
+                status, payload = await self._route_http(method, target, body)
+                keep_alive = body is not None and headers.get("connection", "").lower() != "close"
+                self._write_http_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_http_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Dict[str, str], Optional[bytes]]]:
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError("bad request line")
+        method, target, _version = parts
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0") or 0)
+        if length > MAX_REQUEST_BYTES:
+            # Body left unread; the connection is closed after answering
+            return method, target, headers, None
+        body = await reader.readexactly(length) if length else b""
+        return method, target, headers, body
+
+    async def _route_http(self, method: str, target: str, body: Optional[bytes]) -> Tuple[int, dict]:
+        path = target.split("?", 1)[0]
+
+        if path == "/health":
+            if method != "GET":
+                return 405, {"ok": False, "error": "use GET"}
+            return 200, {"ok": True, **self.health()}
+
+        if path != "/evaluate":
+            return 404, {"ok": False, "error": "not found"}
+        if method != "POST":
+            return 405, {"ok": False, "error": "use POST"}
+        if body is None:
+            return 413, {"ok": False, "error": "request too large"}
+
+        try:
+            request = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"ok": False, "error": "invalid JSON"}
+
+        response = await self.handle(request)
+        if response["ok"]:
+            return 200, response
+        return (503 if response.get("error") == "busy" else 400), response
+
+    @staticmethod
+    def _write_http_response(writer: asyncio.StreamWriter, status: int, payload: dict, keep_alive: bool) -> None:
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        self._io.shutdown(wait=True)
+
+
+# --------------------------------------------------------------------------- #
+# Client
+# --------------------------------------------------------------------------- #
+
+def evaluate_via_socket(
+    eft: str,
+    profile: Optional[str] = None,
+    skills: Optional[Dict[str, int]] = None,
+    path: Path = DEFAULT_SOCKET,
+    timeout: float = 30.0,
+) -> dict:
+    """
+    Send one request to a running daemon over its Unix socket.
+
+    Returns the decoded response; check its "ok" field.
+    """
+    request: Dict[str, object] = {"id": 1, "eft": eft}
+    if profile is not None:
+        request["profile"] = profile
+    if skills is not None:
+        request["skills"] = skills
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(path))
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    return json.loads(line)
+
+
+# --------------------------------------------------------------------------- #
+# Entry point
+# --------------------------------------------------------------------------- #
+
+async def run_daemon(
+    socket_path: Optional[Path],
+    http_port: Optional[int],
+    http_host: str = "127.0.0.1",
+    max_workers: Optional[int] = None,
+    max_pending: int = 256,
+    persistent_cache: bool = True,
+    processes: Optional[int] = None,
+) -> None:
+    loop = asyncio.get_running_loop()
+    if processes:
+        # Warms up and forks before the event loop starts any threads of its own
+        engine = PreforkEngine(FitEngine(), processes=processes)
+        max_workers = max(max_workers or 0, engine.processes)
+    else:
+        engine = FitEngine()
+        # Load gamedata etc. before accepting the first request
+        await loop.run_in_executor(None, engine.warm_up)
+
+    cache = PersistentEvaluationCache(gamedata_version=engine.gamedata_version) if persistent_cache else None
+    evaluator = FitEvaluator(engine, cache=cache, max_workers=max_workers)
+    daemon = EvaluationDaemon(evaluator, max_pending=max_pending)
+
+    if socket_path is not None:
+        await daemon.serve_unix(socket_path)
+        print(f"Listening on {socket_path}", flush=True)
+    if http_port is not None:
+        await daemon.serve_http(http_host, http_port)
+        print(f"Listening on http://{http_host}:{http_port}", flush=True)
+
+    stop = asyncio.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        await stop.wait()
+    finally:
+        await daemon.close()
+        evaluator.shutdown()
+        if processes:
+            engine.shutdown()
+        if cache is not None:
+            cache.close()
+        if socket_path is not None and Path(socket_path).exists():
+            Path(socket_path).unlink()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m evefit_core.daemon", description="Warm fit evaluation daemon.")
+    parser.add_argument("--socket", type=Path, help=f"Unix socket path (default: {DEFAULT_SOCKET} if --http isn't given)")
+    parser.add_argument("--http", type=int, metavar="PORT", help="also serve HTTP on this port")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address (default: 127.0.0.1)")
+    parser.add_argument("--workers", type=int, help="evaluation worker threads")
+    parser.add_argument("--processes", type=int, help="evaluate in this many pre-forked worker processes")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests in flight before rejecting (default: 256)")
+    parser.add_argument("--memory-cache", action="store_true", help="don't use the on-disk result cache")
+    args = parser.parse_args(argv)
+
+    socket_path = args.socket
+    if socket_path is None and args.http is None:
+        socket_path = DEFAULT_SOCKET
+
+    asyncio.run(run_daemon(
+        socket_path,
+        args.http,
+        http_host=args.host,
+        max_workers=args.workers,
+        max_pending=args.max_pending,
+        persistent_cache=not args.memory_cache,
+        processes=args.processes,
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
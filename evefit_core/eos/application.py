@@ -0,0 +1,325 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Applied damage: how much of a weapon's dps lands on a target that moves.
+
+Turrets hit with a chance that falls with range (optimal/falloff) and with
+angular speed against tracking and signature radius. A shot that hits rolls
+its damage quality uniformly between 0.5x and (chance + 0.49)x, and the
+lowest 1% of rolls are wrecking shots for 3x. Missiles always hit within
+flight range, and deal less damage to targets that are smaller than their
+explosion radius or outrun their explosion velocity.
+
+Weapon parameters are read from each module once, and expected damage is
+closed-form for any number of targets and ranges:
+
+    table = ApplicationTable(fit, TargetProfile.getBuiltinList(), [0, 10000, 30000])
+    for profile, dps in table.rows():
+        print(profile.fullName, dps)  # applied dps at each distance
+
+    TurretApplication.fromModule(mod).damageMults(distances, angularSpeeds, sigRadius)
+    MissileApplication.fromModule(mod).damageMults(distances, speed, sigRadius)
+
+With samples set, turret damage is averaged over that many random shots
+instead, for a Monte Carlo check of the closed form or to see the spread.
+Distances are surface to surface in meters, angular speeds in rad/s.
+"""
+
+import random
+
+from eos.calc import calculateRangeFactors
+from eos.const import FittingHardpoint, FittingModuleState
+from eos.damageMatrix import ProfileColumns
+from eos.rangeCurves import missileRangeFactors
+
+# Damage quality of a hit is roll + QUALITY_OFFSET, rolls below
+# WRECKING_CHANCE are wrecking shots
+QUALITY_OFFSET = 0.49
+WRECKING_CHANCE = 0.01
+WRECKING_MULT = 3
+
+
+def _broadcast(*values):
+    # Lists stay, scalars are repeated to the length of the lists
+    lengths = {len(value) for value in values if isinstance(value, (list, tuple))}
+    if len(lengths) > 1:
+        raise ValueError("value lists have different lengths: {}".format(sorted(lengths)))
+    length = lengths.pop() if lengths else 1
+    return [value if isinstance(value, (list, tuple)) else [value] * length for value in values]
+
+
+def turretDamageMult(chanceToHit):
+    """
+    Expected damage multiplier of a turret shot with the given chance to hit.
+    """
+    wreckingChance = min(chanceToHit, WRECKING_CHANCE)
+    normalChance = chanceToHit - wreckingChance
+    normalPart = 0
+    if normalChance > 0:
+        # Normal hits roll uniformly between 0.01 and the chance to hit
+        normalPart = normalChance * ((WRECKING_CHANCE + chanceToHit) / 2 + QUALITY_OFFSET)
+    return normalPart + wreckingChance * WRECKING_MULT
+
+
+def turretDamageDistribution(chanceToHit):
+    """
+    Damage quality distribution of a turret shot: (miss chance, wrecking
+    chance, normal hit chance, lowest and highest normal hit multiplier);
+    normal hits are spread uniformly between those multipliers.
+    """
+    wreckingChance = min(chanceToHit, WRECKING_CHANCE)
+    normalChance = chanceToHit - wreckingChance
+    return (
+        1 - chanceToHit, wreckingChance, normalChance,
+        WRECKING_CHANCE + QUALITY_OFFSET, chanceToHit + QUALITY_OFFSET)
+
+
+def sampleTurretDamageMult(chanceToHit, samples, rng=random):
+    """
+    Average damage multiplier of `samples` random shots.
+    """
+    total = 0
+    for _ in range(samples):
+        roll = rng.random()
+        if roll < chanceToHit:
+            total += WRECKING_MULT if roll < WRECKING_CHANCE else roll + QUALITY_OFFSET
+    return total / samples
+
+
+class TurretApplication:
+    """
+    Range and tracking parameters of a turret (or anything else with
+    optimal, falloff and tracking speed).
+    """
+
+    __slots__ = ("optimal", "falloff", "tracking", "optimalSigRadius")
+
+    def __init__(self, optimal, falloff, tracking, optimalSigRadius):
+        self.optimal = optimal
+        self.falloff = falloff
+        self.tracking = tracking
+        self.optimalSigRadius = optimalSigRadius
+
+    @classmethod
+    def fromModule(cls, mod):
+        return cls(
+            optimal=mod.maxRange or 0,
+            falloff=mod.falloff or 0,
+            tracking=mod.getModifiedItemAttr("trackingSpeed", 0),
+            optimalSigRadius=mod.getModifiedItemAttr("optimalSigRadius", 40000))
+
+    def chancesToHit(self, distances, angularSpeeds, sigRadii):
+        """
+        Chance to hit for each (distance, angular speed, signature radius);
+        any of them can be a single value.
+        """
+        distances, angularSpeeds, sigRadii = _broadcast(distances, angularSpeeds, sigRadii)
+        rangeFactors = calculateRangeFactors(self.optimal, self.falloff, distances, restrictedRange=False)
+        if not self.tracking:
+            return rangeFactors
+        chances = []
+        for rangeFactor, angularSpeed, sigRadius in zip(rangeFactors, angularSpeeds, sigRadii):
+            if not rangeFactor:
+                chances.append(0)
+                continue
+            if not angularSpeed:
+                chances.append(rangeFactor)
+                continue
+            if not sigRadius:
+                chances.append(0)
+                continue
+            trackingFactor = (angularSpeed * self.optimalSigRadius / (self.tracking * sigRadius)) ** 2
+            chances.append(rangeFactor * 0.5 ** trackingFactor)
+        return chances
+
+    def damageMults(self, distances, angularSpeeds, sigRadii, samples=None, rng=random):
+        """
+        Expected damage multiplier for each (distance, angular speed,
+        signature radius); averaged over `samples` random shots if set.
+        """
+        chances = self.chancesToHit(distances, angularSpeeds, sigRadii)
+        if samples:
+            return [sampleTurretDamageMult(chance, samples, rng) for chance in chances]
+        return [turretDamageMult(chance) for chance in chances]
+
+
+class MissileApplication:
+    """
+    Explosion parameters of a missile launcher's charge, plus its module to
+    get flight range from.
+    """
+
+    __slots__ = ("module", "explosionRadius", "explosionVelocity", "reductionFactor")
+
+    def __init__(self, module, explosionRadius, explosionVelocity, reductionFactor):
+        self.module = module
+        self.explosionRadius = explosionRadius
+        self.explosionVelocity = explosionVelocity
+        self.reductionFactor = reductionFactor
+
+    @classmethod
+    def fromModule(cls, mod):
+        return cls(
+            module=mod,
+            explosionRadius=mod.getModifiedChargeAttr("aoeCloudSize", 0),
+            explosionVelocity=mod.getModifiedChargeAttr("aoeVelocity", 0),
+            reductionFactor=mod.getModifiedChargeAttr("aoeDamageReductionFactor", 1))
+
+    def applicationFactors(self, speeds, sigRadii):
+        """
+        Share of missile damage applied for each (target speed, signature
+        radius); either can be a single value.
+        """
+        speeds, sigRadii = _broadcast(speeds, sigRadii)
+        radius = self.explosionRadius
+        velocity = self.explosionVelocity
+        if not radius:
+            return [1 for _ in speeds]
+        factors = []
+        for speed, sigRadius in zip(speeds, sigRadii):
+            factor = min(1, sigRadius / radius)
+            if velocity > 0 and speed > 0:
+                factor = min(factor, (velocity * sigRadius / (radius * speed)) ** self.reductionFactor)
+            factors.append(factor)
+        return factors
+
+    def damageMults(self, distances, speeds, sigRadii):
+        """
+        Expected damage multiplier for each (distance, speed, signature
+        radius), flight range included.
+        """
+        distances, speeds, sigRadii = _broadcast(distances, speeds, sigRadii)
+        rangeFactors = missileRangeFactors(self.module, distances) if self.module is not None else [1] * len(distances)
+        return [r * a for r, a in zip(rangeFactors, self.applicationFactors(speeds, sigRadii))]
+
+
+def applicationMults(fit, distance, speed, sigRadius, radius=0, transversal=1):
+    """
+    Share of damage each weapon and drone of the fit applies to one target
+    at one distance: {module or drone: multiplier}. Fighters apply fully.
+    """
+    shipRadius = fit.ship.getModifiedItemAttr("radius", 0)
+    mults = {}
+    for mod in fit.modules:
+        if mod.isEmpty or mod.state < FittingModuleState.ACTIVE:
+            continue
+        if mod.hardpoint == FittingHardpoint.TURRET:
+            angularSpeed = speed * transversal / max(1, distance + shipRadius + radius)
+            mults[mod] = TurretApplication.fromModule(mod).damageMults([distance], angularSpeed, sigRadius)[0]
+        elif mod.hardpoint == FittingHardpoint.MISSILE and not mod.isBreacher:
+            mults[mod] = MissileApplication.fromModule(mod).damageMults([distance], speed, sigRadius)[0]
+        elif mod.hardpoint == FittingHardpoint.MISSILE:
+            mults[mod] = missileRangeFactors(mod, [distance])[0]
+        elif mod.maxRange is not None:
+            mults[mod] = calculateRangeFactors(mod.maxRange, mod.falloff or 0, [distance])[0]
+    controlRange = fit.extraAttributes["droneControlRange"]
+    for drone in fit.drones:
+        mults[drone] = 1 if distance <= controlRange else 0
+    return mults
+
+
+class ApplicationTable:
+    """
+    Applied weapon dps of one fit against every profile of a ProfileColumns
+    (resists, speed, signature and radius) at every distance.
+
+    Targets are assumed to move at full speed; `transversal` is the share of
+    it that is perpendicular to the line of fire, for turret tracking. Drone
+    and fighter dps only get resists applied.
+    """
+
+    def __init__(self, fit, profiles=None, distances=(0,), transversal=1, spoolOptions=None, samples=None, seed=None):
+        if profiles is None:
+            columns = ProfileColumns.builtins()
+        elif isinstance(profiles, ProfileColumns):
+            columns = profiles
+        else:
+            columns = ProfileColumns(profiles)
+        self.columns = columns
+        self.profiles = columns.profiles
+        self.distances = list(distances)
+        rng = random.Random(seed)
+        shipRadius = fit.ship.getModifiedItemAttr("radius", 0)
+
+        # (module, rows): one row per profile, one value per distance
+        self.weapons = []
+        for mod in fit.modules:
+            if mod.isEmpty or mod.state < FittingModuleState.ACTIVE:
+                continue
+            raw = mod.getDps(spoolOptions=spoolOptions)
+            if not raw.total:
+                continue
+            paper = columns.apply(raw)
+            if mod.hardpoint == FittingHardpoint.TURRET:
+                application = TurretApplication.fromModule(mod)
+                rows = []
+                for profile, dps in zip(self.profiles, paper):
+                    speed = profile.maxVelocity * transversal
+                    # Center to center distance for angular speed
+                    angularSpeeds = [
+                        speed / max(1, distance + shipRadius + profile.radius) if speed else 0
+                        for distance in self.distances]
+                    mults = application.damageMults(
+                        self.distances, angularSpeeds, profile.signatureRadius, samples=samples, rng=rng)
+                    rows.append([dps * mult for mult in mults])
+            elif mod.hardpoint == FittingHardpoint.MISSILE and not mod.isBreacher:
+                application = MissileApplication.fromModule(mod)
+                rows = []
+                for profile, dps in zip(self.profiles, paper):
+                    mults = application.damageMults(self.distances, profile.maxVelocity, profile.signatureRadius)
+                    rows.append([dps * mult for mult in mults])
+            else:
+                # Breachers, smartbombs and the like: range only
+                if mod.hardpoint == FittingHardpoint.MISSILE:
+                    factors = missileRangeFactors(mod, self.distances)
+                else:
+                    factors = calculateRangeFactors(mod.maxRange or 0, mod.falloff or 0, self.distances) \
+                        if mod.maxRange is not None else [1] * len(self.distances)
+                rows = [[dps * factor for factor in factors] for dps in paper]
+            self.weapons.append((mod, rows))
+
+        # Not applied; only resists
+        self.otherDps = [0] * len(columns)
+        for drone in fit.drones:
+            for i, dps in enumerate(columns.apply(drone.getDps())):
+                self.otherDps[i] += dps
+        for fighter in fit.fighters:
+            if fighter.active and fighter.amount > 0:
+                for i, dps in enumerate(columns.apply(fighter.getDps())):
+                    self.otherDps[i] += dps
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def appliedWeaponDps(self, index):
+        """
+        Applied weapon dps against one profile at each distance.
+        """
+        total = [0] * len(self.distances)
+        for _, rows in self.weapons:
+            for i, value in enumerate(rows[index]):
+                total[i] += value
+        return total
+
+    def appliedDps(self, index):
+        other = self.otherDps[index]
+        return [weapon + other for weapon in self.appliedWeaponDps(index)]
+
+    def rows(self):
+        for index, profile in enumerate(self.profiles):
+            yield profile, self.appliedDps(index)
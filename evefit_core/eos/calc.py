@@ -69,3 +69,28 @@ def calculateLockTime(srcScanRes, tgtSigRadius):
     if not srcScanRes or not tgtSigRadius:
         return None
     return min(40000 / srcScanRes / math.asinh(tgtSigRadius) ** 2, 30 * 60)
+
+
+def calculateRangeFactors(srcOptimalRange, srcFalloffRange, distances, restrictedRange=True):
+    """
+    calculateRangeFactor() for many distances at once; branches are decided
+    once for the source instead of once per distance.
+    """
+    if srcFalloffRange > 0:
+        cutoff = srcOptimalRange + 3 * srcFalloffRange if restrictedRange else math.inf
+        return [
+            1 if distance is None else
+            0 if distance > cutoff else
+            0.5 ** ((max(0, distance - srcOptimalRange) / srcFalloffRange) ** 2)
+            for distance in distances]
+    return [1 if distance is None or distance <= srcOptimalRange else 0 for distance in distances]
+
+
+def calculateLockTimes(srcScanRes, tgtSigRadii):
+    """
+    calculateLockTime() for many signature radii at once.
+    """
+    if not srcScanRes:
+        return [None for _ in tgtSigRadii]
+    factor = 40000 / srcScanRes
+    return [min(factor / math.asinh(sigRadius) ** 2, 30 * 60) if sigRadius else None for sigRadius in tgtSigRadii]
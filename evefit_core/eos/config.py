@@ -9,6 +9,9 @@ pyfalog = Logger(__name__)
 
 debug = False
 gamedataCache = True
+# Defer the gamedata version probe, DB scheme import and query definitions
+# until eos.db is first used. See eos.db.initialize().
+lazyInit = os.environ.get('EOS_LAZY_INIT') == '1'
 saveddataCache = True
 gamedata_version = ""
 gamedata_date = ""
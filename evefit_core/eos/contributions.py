@@ -0,0 +1,96 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+What every module, implant, skill and so on adds to the attributes of a
+calculated fit.
+
+getModifiedItemAttrExtended(key, ignoreAfflictors=[mod]) answers this for one
+afflictor by calculating the attribute again. Here the "Affected by" data the
+calculation recorded is used to answer it for all afflictors of an attribute
+at once (see ModifiedAttributeDict.getContributions()):
+
+    contributions(fit.ship.itemModifiedAttributes, ["maxVelocity"])
+    # {"maxVelocity": {afflictor: change, ...}}
+    for item, isCharge, attrs in fitContributions(fit):
+        ...
+    skillContributions(fit)                # {skill: [(item, isCharge, attr, change)]}
+
+A change is how much the attribute would drop without the afflictor, i.e.
+what the afflictor adds; negative for penalties.
+"""
+
+from eos.saveddata.character import Skill
+
+
+def contributions(attrs, keys=None):
+    """
+    {attribute: {afflictor: change}} of a ModifiedAttributeDict, for the
+    given attribute names or every attribute something modifies.
+    """
+    if keys is None:
+        keys = list(attrs.iterAfflictions())
+    result = {}
+    for key in keys:
+        without = attrs.getContributions(key)
+        if not without:
+            continue
+        value = attrs[key]
+        result[key] = {afflictor: value - other for afflictor, other in without.items()}
+    return result
+
+
+def _attributeDicts(fit):
+    # (item, is charge, ModifiedAttributeDict) of everything on the fit with
+    # attributes; a module's charge comes with the module as item
+    yield fit.ship, False, fit.ship.itemModifiedAttributes
+    for mod in fit.modules:
+        if mod.isEmpty:
+            continue
+        yield mod, False, mod.itemModifiedAttributes
+        if mod.charge is not None:
+            yield mod, True, mod.chargeModifiedAttributes
+    for item in (*fit.drones, *fit.fighters, *fit.implants, *fit.boosters):
+        yield item, False, item.itemModifiedAttributes
+
+
+def fitContributions(fit, keys=None):
+    """
+    (item, is charge, {attribute: {afflictor: change}}) for the ship,
+    modules, charges, drones, fighters, implants and boosters of a
+    calculated fit. Charge attributes are listed with their module.
+    """
+    result = []
+    for item, isCharge, attrs in _attributeDicts(fit):
+        itemResult = contributions(attrs, keys)
+        if itemResult:
+            result.append((item, isCharge, itemResult))
+    return result
+
+
+def skillContributions(fit, keys=None):
+    """
+    {skill: [(item, is charge, attribute, change)]}: what each trained
+    skill adds to the fit's attributes.
+    """
+    result = {}
+    for item, isCharge, attrs in fitContributions(fit, keys):
+        for key, changes in attrs.items():
+            for afflictor, change in changes.items():
+                if isinstance(afflictor, Skill):
+                    result.setdefault(afflictor, []).append((item, isCharge, key, change))
+    return result
@@ -0,0 +1,188 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Damage of a calculated fit against many target profiles at once.
+
+Fit.getWeaponDps() and friends apply one target profile, stored on the fit,
+and re-applying another one means clearing caches and building new DmgTypes
+objects. Resists only scale the four damage types, so the raw (unresisted)
+damage is collected once per fit and then applied to all profiles as plain
+columns of multipliers:
+
+    columns = ProfileColumns.all()  # ideal, built-in and user profiles
+    matrix = DamageMatrix(fit, columns)
+    for profile, row in matrix.rows():
+        print(profile.fullName, row["totalDps"])
+
+One ProfileColumns can be reused for any number of fits. Breacher pod
+damage is applied against each profile's HP. Fighters pick between
+cycling without reloads and reloading per profile, like Fighter.getDps().
+"""
+
+from eos.saveddata.targetProfile import TargetProfile
+from eos.utils.stats import DmgTypes
+
+
+# Keys of DamageMatrix.row(), in display order
+STAT_NAMES = (
+    "weaponDps", "weaponVolley", "droneDps", "droneVolley",
+    "fighterDps", "fighterVolley", "totalDps", "totalVolley")
+
+
+def allTargetProfiles(includeUser=True):
+    """
+    Ideal target, all built-in profiles and, optionally, the user's.
+    """
+    profiles = [TargetProfile.getIdeal()]
+    profiles.extend(TargetProfile.getBuiltinList())
+    if includeUser:
+        import eos.db
+        profiles.extend(eos.db.getTargetProfileList())
+    return profiles
+
+
+class ProfileColumns:
+    """
+    Damage multipliers (1 - resist) and HP of a list of target profiles.
+    """
+
+    __slots__ = ("profiles", "em", "thermal", "kinetic", "explosive", "hp")
+
+    _builtins = None
+
+    def __init__(self, profiles):
+        self.profiles = list(profiles)
+        self.em = [1 - (p.emAmount or 0) for p in self.profiles]
+        self.thermal = [1 - (p.thermalAmount or 0) for p in self.profiles]
+        self.kinetic = [1 - (p.kineticAmount or 0) for p in self.profiles]
+        self.explosive = [1 - (p.explosiveAmount or 0) for p in self.profiles]
+        self.hp = [p.hp for p in self.profiles]
+
+    def __len__(self):
+        return len(self.profiles)
+
+    @classmethod
+    def builtins(cls):
+        """
+        Columns for the ideal target and built-in profiles; built once.
+        """
+        if cls._builtins is None:
+            cls._builtins = cls(allTargetProfiles(includeUser=False))
+        return cls._builtins
+
+    @classmethod
+    def all(cls):
+        return cls(allTargetProfiles())
+
+    def apply(self, raw):
+        """
+        Total damage of a raw DmgTypes (no profile set) against every
+        profile, breacher damage included.
+        """
+        em, thermal, kinetic, explosive = raw._em, raw._thermal, raw._kinetic, raw._explosive
+        totals = [
+            em * emMult + thermal * thermMult + kinetic * kinMult + explosive * expMult
+            for emMult, thermMult, kinMult, expMult in zip(self.em, self.thermal, self.kinetic, self.explosive)]
+        if raw._breachers:
+            for i, pure in enumerate(self.pure(raw)):
+                totals[i] += pure
+        return totals
+
+    def pure(self, raw):
+        """
+        Breacher damage of a raw DmgTypes against every profile.
+        """
+        groups = [[(b.absolute, b.relative) for b in group] for group in raw._breachers.values() if group]
+        if not groups:
+            return [0] * len(self.profiles)
+        return [
+            sum(max(min(absolute, relative * hp) for absolute, relative in group) for group in groups)
+            for hp in self.hp]
+
+
+def _fighterOptions(fighter):
+    # Raw dps of a fighter squad when it never reloads, and when it does;
+    # Fighter.getDps() uses whichever does more damage to the target
+    return [
+        DmgTypes.sum(
+            ability.getDps(cycleTimeOverride=cycleParams[ability.effectID].averageTime)
+            for ability in fighter.abilities if ability.effectID in cycleParams)
+        for cycleParams in (fighter.getCycleParametersPerEffectInfinite(), fighter.getCycleParametersPerEffect())]
+
+
+class DamageMatrix:
+    """
+    Weapon, drone and fighter dps and volley of one fit against every profile
+    of a ProfileColumns; each stat is a list with one value per profile.
+    """
+
+    def __init__(self, fit, columns=None, spoolOptions=None):
+        if columns is None:
+            columns = ProfileColumns.builtins()
+        elif not isinstance(columns, ProfileColumns):
+            columns = ProfileColumns(columns)
+        self.columns = columns
+        self.profiles = columns.profiles
+
+        # Weapon stats are cached by the fit; only their raw parts are used
+        self.weaponDps = columns.apply(fit.getWeaponDps(spoolOptions=spoolOptions))
+        self.weaponVolley = columns.apply(fit.getWeaponVolley(spoolOptions=spoolOptions))
+
+        self.droneDps = columns.apply(DmgTypes.sum(drone.getDps() for drone in fit.drones))
+        self.droneVolley = columns.apply(DmgTypes.sum(drone.getVolley() for drone in fit.drones))
+
+        fighters = [fighter for fighter in fit.fighters if fighter.active and fighter.amount > 0]
+        self.fighterVolley = columns.apply(DmgTypes.sum(fighter.getVolley() for fighter in fighters))
+        self.fighterDps = [0] * len(columns)
+        for fighter in fighters:
+            infinite, reloading = (columns.apply(option) for option in _fighterOptions(fighter))
+            for i, (infiniteDps, reloadingDps) in enumerate(zip(infinite, reloading)):
+                self.fighterDps[i] += infiniteDps if infiniteDps >= reloadingDps else reloadingDps
+
+        self.totalDps = [sum(values) for values in zip(self.weaponDps, self.droneDps, self.fighterDps)]
+        self.totalVolley = [sum(values) for values in zip(self.weaponVolley, self.droneVolley, self.fighterVolley)]
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def row(self, index):
+        return {name: getattr(self, name)[index] for name in STAT_NAMES}
+
+    def rows(self):
+        for index, profile in enumerate(self.profiles):
+            yield profile, self.row(index)
+
+    def best(self, stat="totalDps"):
+        """
+        (profile, value) of the profile the fit does the most damage to.
+        """
+        values = getattr(self, stat)
+        if not values:
+            return None, 0
+        index = max(range(len(values)), key=values.__getitem__)
+        return self.profiles[index], values[index]
+
+
+def damageMatrices(fits, profiles=None, spoolOptions=None):
+    """
+    DamageMatrix of each fit, all against the same profiles (built-in ones
+    by default).
+    """
+    columns = profiles if isinstance(profiles, ProfileColumns) else (
+        ProfileColumns.builtins() if profiles is None else ProfileColumns(profiles))
+    return [DamageMatrix(fit, columns, spoolOptions=spoolOptions) for fit in fits]
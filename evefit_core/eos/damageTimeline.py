@@ -0,0 +1,312 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Damage of a calculated fit over time.
+
+Every weapon, drone and fighter ability is turned into a DamageSource: the
+volleys it lands, as a short list of one-off events (spool-up) followed by a
+pattern that repeats every period (the cycle, or the cycles between two
+reloads). Damage dealt by any point in time then has a closed form, and the
+events only have to be expanded when a caller wants them listed:
+
+    timeline = DamageTimeline(fit, targetProfile)
+    timeline.dealt([0, 10000, 60000])                # damage dealt by each time
+    times, dealt = timeline.dealtOverTime(60000, 1000)
+    timeline.maxBurst(10000, until=60000)            # most damage in any 10s
+    times, amounts = timeline.events(60000)          # every volley, sorted
+
+Times are in milliseconds since the first activation of everything, damage
+is with the target profile applied (raw when it's None). Spooling weapons
+start cold unless spoolOptions say otherwise, and lose their spool when they
+reload. Breacher pods deal one tick per second, like Module.getDps() assumes.
+"""
+
+import math
+from bisect import bisect_right
+from itertools import accumulate
+
+from eos.const import SpoolType
+from eos.utils.cycles import CycleSequence
+from eos.utils.float import floatUnerr
+from eos.utils.spoolSupport import SpoolOptions, calculateSpoolup, resolveSpoolOptions
+
+# Spool state weapons start the timeline with by default
+COLD_SPOOL = SpoolOptions(SpoolType.CYCLES, 0, True)
+
+# Breacher DoT tick interval, ms
+BREACHER_TICK = 1000
+
+
+def _pattern(cycleParams):
+    # One pass of cycles as (active, inactive, isInactivityReload) and how
+    # many times the pass repeats
+    if isinstance(cycleParams, CycleSequence):
+        cycles = [cycle for cycleInfo in cycleParams.sequence for cycle in cycleInfo.iterCycles()]
+        return cycles, cycleParams.quantity
+    return [(cycleParams.activeTime, cycleParams.inactiveTime, cycleParams.isInactivityReload)], cycleParams.quantity
+
+
+class DamageSource:
+    """
+    Volleys landed by one weapon, drone stack or fighter ability.
+
+    Events are the one-off `prefix` ones, then `offsets`/`amounts` repeated
+    `repeats` times (possibly math.inf), every `period` ms from `start`.
+    """
+
+    __slots__ = ("item", "prefixTimes", "prefixDealt", "start", "period", "repeats", "offsets", "amounts")
+
+    def __init__(self, item, prefixTimes, prefixAmounts, start, period, repeats, offsets, amounts):
+        self.item = item
+        self.prefixTimes = prefixTimes
+        # Cumulative, for bisecting
+        self.prefixDealt = list(accumulate(prefixAmounts))
+        self.start = start
+        self.period = period
+        self.repeats = repeats
+        self.offsets = offsets
+        self.amounts = amounts
+
+    @classmethod
+    def fromCycles(cls, item, cycleParams, volleys, spool=None, spoolCycles=0):
+        """
+        Build a source from cycle parameters and (delay, damage) volleys
+        landed every cycle. spool is (max bonus, bonus per cycle) for
+        weapons that spool up, spoolCycles is how far they have spooled at
+        time 0.
+        """
+        cycles, repeats = _pattern(cycleParams)
+        passTime = sum(active + inactive for active, inactive, _ in cycles)
+        if passTime <= 0 or repeats <= 0:
+            return None
+        maxCycles = math.ceil(floatUnerr(spool[0] / spool[1])) if spool is not None else 0
+        activeTime = cycles[0][0]
+
+        def runPass(state):
+            # Events of one pass and the spool state it leaves behind
+            events = []
+            passOffset = 0
+            for active, inactive, isInactivityReload in cycles:
+                mult = 1
+                if spool is not None:
+                    mult += calculateSpoolup(spool[0], spool[1], activeTime / 1000, SpoolType.CYCLES, state)[0]
+                    state = 0 if isInactivityReload else min(state + 1, maxCycles)
+                for delay, amount in volleys:
+                    events.append((passOffset + delay, amount * mult))
+                passOffset += active + inactive
+            events.sort()
+            return events, state
+
+        prefixTimes = []
+        prefixAmounts = []
+        start = 0
+        passes = 0
+        state = min(spoolCycles, maxCycles)
+        # Without spool every pass is the same; with it, passes repeat once
+        # the spool state stops changing between them
+        while passes < repeats:
+            events, nextState = runPass(state)
+            if nextState == state:
+                return cls(
+                    item, prefixTimes, prefixAmounts, start, passTime, repeats - passes,
+                    [offset for offset, _ in events], [amount for _, amount in events])
+            prefixTimes.extend(start + offset for offset, _ in events)
+            prefixAmounts.extend(amount for _, amount in events)
+            start += passTime
+            passes += 1
+            state = nextState
+        return cls(item, prefixTimes, prefixAmounts, start, passTime, 0, [], [])
+
+    @property
+    def periodDamage(self):
+        return sum(self.amounts)
+
+    @property
+    def sustainedDps(self):
+        """
+        Damage per second once the repeating part is reached.
+        """
+        if not self.repeats:
+            return 0
+        return self.periodDamage / (self.period / 1000)
+
+    def dealtAt(self, time):
+        """
+        Damage dealt by the given time, volleys landing exactly then included.
+        """
+        dealt = 0
+        index = bisect_right(self.prefixTimes, time)
+        if index:
+            dealt = self.prefixDealt[index - 1]
+        if self.repeats:
+            since = time - self.start
+            for offset, amount in zip(self.offsets, self.amounts):
+                if since < offset:
+                    continue
+                count = math.floor(floatUnerr((since - offset) / self.period)) + 1
+                dealt += amount * min(count, self.repeats)
+        return dealt
+
+    def iterEvents(self, until):
+        """
+        (time, damage) of every volley up to `until`, in no particular order.
+        """
+        for time, dealt, previous in zip(self.prefixTimes, self.prefixDealt, [0] + self.prefixDealt):
+            if time > until:
+                break
+            yield time, dealt - previous
+        if not self.repeats or not self.offsets:
+            return
+        for offset, amount in zip(self.offsets, self.amounts):
+            time = self.start + offset
+            count = 0
+            while time <= until and count < self.repeats:
+                yield time, amount
+                count += 1
+                time = self.start + offset + count * self.period
+
+
+class DamageTimeline:
+    """
+    All damage sources of one fit against one target profile.
+
+    applicationMults optionally maps modules, drones and fighters to the
+    share of their damage that applies (see eos.application); anything not
+    in it applies fully.
+    """
+
+    def __init__(self, fit, targetProfile=None, spoolOptions=None, applicationMults=None):
+        self.fit = fit
+        self.targetProfile = targetProfile
+        self.spoolOptions = spoolOptions if spoolOptions is not None else COLD_SPOOL
+        self.applicationMults = applicationMults or {}
+        self.sources = []
+        for mod in fit.modules:
+            self._addSource(self._moduleSource(mod))
+        for drone in fit.drones:
+            cycleParams = drone.getCycleParameters()
+            volleys = self._applied(drone, [(0, drone.getVolley(targetProfile=targetProfile).total)])
+            if cycleParams is not None and volleys:
+                self._addSource(DamageSource.fromCycles(drone, cycleParams, volleys))
+        for fighter in fit.fighters:
+            if not fighter.active or fighter.amount <= 0:
+                continue
+            cycleParamsPerEffect = fighter.getCycleParametersPerEffectOptimizedDps(targetProfile=targetProfile)
+            volleysPerEffect = fighter.getVolleyParametersPerEffect(targetProfile=targetProfile)
+            for ability in fighter.abilities:
+                cycleParams = cycleParamsPerEffect.get(ability.effectID)
+                volleys = volleysPerEffect.get(ability.effectID)
+                if cycleParams is None or not volleys:
+                    continue
+                volleys = self._applied(fighter, [(delay, volley.total) for delay, volley in volleys.items()])
+                if volleys:
+                    self._addSource(DamageSource.fromCycles(ability, cycleParams, volleys))
+
+    def _addSource(self, source):
+        if source is not None:
+            self.sources.append(source)
+
+    def _applied(self, item, volleys):
+        # (delay, damage) volleys with application, those that do damage
+        mult = self.applicationMults.get(item, 1)
+        return [(delay, amount * mult) for delay, amount in volleys if amount * mult]
+
+    def _moduleSource(self, mod):
+        cycleParams = mod.getCycleParametersForDps()
+        if cycleParams is None:
+            return None
+        if mod.isBreacher:
+            volleyParams = mod.getVolleyParameters(targetProfile=self.targetProfile)
+            volleys = self._applied(mod, [(BREACHER_TICK, volleyParams[min(volleyParams)].total)])
+            return DamageSource.fromCycles(mod, cycleParams, volleys) if volleys else None
+        # Unspooled volleys; spool is added per cycle
+        volleyParams = mod.getVolleyParameters(spoolOptions=COLD_SPOOL, targetProfile=self.targetProfile)
+        volleys = sorted(self._applied(mod, [(delay, volley.total) for delay, volley in volleyParams.items()]))
+        if not volleys:
+            return None
+        spool = (
+            mod.getModifiedItemAttr("damageMultiplierBonusMax", 0),
+            mod.getModifiedItemAttr("damageMultiplierBonusPerCycle", 0))
+        if not spool[0] or not spool[1]:
+            return DamageSource.fromCycles(mod, cycleParams, volleys)
+        spoolType, spoolAmount = resolveSpoolOptions(self.spoolOptions, mod)
+        spoolCycles = calculateSpoolup(spool[0], spool[1], mod.rawCycleTime / 1000, spoolType, spoolAmount)[1]
+        return DamageSource.fromCycles(mod, cycleParams, volleys, spool=spool, spoolCycles=spoolCycles)
+
+    @property
+    def sustainedDps(self):
+        return sum(source.sustainedDps for source in self.sources)
+
+    def dealt(self, times):
+        """
+        Damage dealt by each of the given times.
+        """
+        return [sum(source.dealtAt(time) for source in self.sources) for time in times]
+
+    def dealtOverTime(self, until, step):
+        """
+        Times 0, step, 2 * step... up to `until` and damage dealt by each.
+        """
+        times = [i * step for i in range(int(floatUnerr(until / step)) + 1)]
+        return times, self.dealt(times)
+
+    def events(self, until):
+        """
+        Every volley landing up to `until`, merged: sorted times and the
+        damage landing at each.
+        """
+        merged = {}
+        for source in self.sources:
+            for time, amount in source.iterEvents(until):
+                merged[time] = merged.get(time, 0) + amount
+        times = sorted(merged)
+        return times, [merged[time] for time in times]
+
+    def cumulative(self, until):
+        """
+        Like events(), with damage dealt so far instead of damage per event.
+        """
+        times, amounts = self.events(until)
+        return times, list(accumulate(amounts))
+
+    def maxBurst(self, window, until):
+        """
+        Most damage landing within any `window` ms up to `until`, and the time
+        that window starts.
+        """
+        times, amounts = self.events(until)
+        best = 0
+        bestStart = 0
+        inWindow = 0
+        first = 0
+        for time, amount in zip(times, amounts):
+            inWindow += amount
+            while times[first] < time - window:
+                inWindow -= amounts[first]
+                first += 1
+            if inWindow > best:
+                best = inWindow
+                bestStart = times[first]
+        return best, bestStart
+
+
+def damageTimelines(fits, targetProfile=None, spoolOptions=None):
+    """
+    DamageTimeline of each fit, all against the same profile.
+    """
+    return [DamageTimeline(fit, targetProfile, spoolOptions) for fit in fits]
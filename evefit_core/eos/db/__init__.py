@@ -76,23 +76,28 @@ def get_gamedata_session():
     return gamedata_sessions[thread_id]
 
 
-pyfalog.debug('Getting gamedata version')
-# This should be moved elsewhere, maybe as an actual query. Current, without try-except, it breaks when making a new
-# game db because we haven't reached gamedata_meta.create_all()
-try:
-    config.gamedata_version = gamedata_session.execute(
-            "SELECT `field_value` FROM `metadata` WHERE `field_name` LIKE 'client_build'"
-    ).fetchone()[0]
-    config.gamedata_date = gamedata_session.execute(
-        "SELECT `field_value` FROM `metadata` WHERE `field_name` LIKE 'dump_time'"
-    ).fetchone()[0]
-except (KeyboardInterrupt, SystemExit):
-    raise
-except Exception as e:
-    pyfalog.warning("Missing gamedata version.")
-    pyfalog.critical(e)
-    config.gamedata_version = None
-    config.gamedata_date = None
+def probeGamedataVersion():
+    """
+    Read the gamedata build and dump time into eos.config.
+    """
+    pyfalog.debug('Getting gamedata version')
+    # This should be moved elsewhere, maybe as an actual query. Current, without try-except, it breaks when making a new
+    # game db because we haven't reached gamedata_meta.create_all()
+    try:
+        config.gamedata_version = gamedata_session.execute(
+                "SELECT `field_value` FROM `metadata` WHERE `field_name` LIKE 'client_build'"
+        ).fetchone()[0]
+        config.gamedata_date = gamedata_session.execute(
+            "SELECT `field_value` FROM `metadata` WHERE `field_name` LIKE 'dump_time'"
+        ).fetchone()[0]
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except Exception as e:
+        pyfalog.warning("Missing gamedata version.")
+        pyfalog.critical(e)
+        config.gamedata_version = None
+        config.gamedata_date = None
+
 
 pyfalog.debug('Initializing saveddata')
 saveddata_connectionstring = config.saveddata_connectionstring
@@ -111,26 +116,87 @@ else:
 # Lock controlling any changes introduced to session
 sd_lock = threading.RLock()
 
-pyfalog.debug('Importing gamedata DB scheme')
-# Import all the definitions for all our database stuff
-# noinspection PyPep8
-from eos.db.gamedata import alphaClones, attribute, category, effect, group, item, marketGroup, metaData, metaGroup, queries, traits, unit, dynamicAttributes, implantSet
-pyfalog.debug('Importing saveddata DB scheme')
-# noinspection PyPep8
-from eos.db.saveddata import booster, cargo, character, damagePattern, databaseRepair, drone, fighter, fit, implant, implantSet, \
-    miscData, mutatorMod, mutatorDrone, module, override, price, queries, skill, targetProfile, user
-
-pyfalog.debug('Importing gamedata queries')
-# noinspection PyPep8
-from eos.db.gamedata.queries import *
-pyfalog.debug('Importing saveddata queries')
-# noinspection PyPep8
-from eos.db.saveddata.queries import *
-
-# If using in memory saveddata, you'll want to reflect it so the data structure is good.
-if config.saveddata_connectionstring == "sqlite:///:memory:":
-    saveddata_meta.create_all()
-    pyfalog.info("Running database out of memory.")
+_initialized = False
+# True while initialize() runs; only ever seen by the thread running it
+_initializing = False
+_initLock = threading.RLock()
+
+
+def initialize():
+    """
+    Probe the gamedata version, import the gamedata and saveddata schemes and
+    define the queries.
+
+    Runs when eos.db is imported, unless eos.config.lazyInit is set; then it
+    runs the first time something that needs it (a query, save, commit...)
+    is looked up on eos.db. Calling it again does nothing.
+    """
+    global _initialized, _initializing
+    with _initLock:
+        # Re-entered from the scheme modules, which import eos.db themselves:
+        # they get what's defined so far
+        if _initialized or _initializing:
+            return
+        _initializing = True
+        try:
+            _initialize()
+            # Only once everything is in place; a failed run is retried on
+            # next use
+            _initialized = True
+        finally:
+            _initializing = False
+
+
+def _initialize():
+    probeGamedataVersion()
+
+    pyfalog.debug('Importing gamedata DB scheme')
+    # Import all the definitions for all our database stuff
+    from eos.db.gamedata import alphaClones, attribute, category, effect, group, item, marketGroup, metaData, metaGroup, queries, traits, unit, dynamicAttributes, implantSet  # noqa: F401
+    pyfalog.debug('Importing saveddata DB scheme')
+    from eos.db.saveddata import booster, cargo, character, damagePattern, databaseRepair, drone, fighter, fit, implant, implantSet, \
+        miscData, mutatorMod, mutatorDrone, module, override, price, queries, skill, targetProfile, user  # noqa: F401
+
+    # Equivalent of "from eos.db.<gamedata|saveddata>.queries import *"
+    pyfalog.debug('Importing gamedata queries')
+    from eos.db.gamedata import queries as gamedataQueries
+    pyfalog.debug('Importing saveddata queries')
+    from eos.db.saveddata import queries as saveddataQueries
+    namespace = globals()
+    for queryModule in (gamedataQueries, saveddataQueries):
+        namespace.update((name, value) for name, value in vars(queryModule).items() if not name.startswith("_"))
+
+    # If using in memory saveddata, you'll want to reflect it so the data structure is good.
+    if config.saveddata_connectionstring == "sqlite:///:memory:":
+        saveddata_meta.create_all()
+        pyfalog.info("Running database out of memory.")
+
+
+def __getattr__(name):
+    # Only reached for names that don't exist yet. With lazy init, these are
+    # the queries and helpers that initialize() defines. Other threads wait
+    # in initialize() until it's done.
+    initialize()
+    try:
+        return globals()[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name)) from None
+
+
+def getGamedataVersion():
+    """
+    Gamedata build, probing the database first if that hasn't happened yet.
+    """
+    initialize()
+    return config.gamedata_version
+
+
+if config.lazyInit:
+    pyfalog.debug('Lazy init: deferring gamedata version probe and DB scheme import')
+else:
+    initialize()
+    # noinspection PyPep8
+    import eos.effects  # noqa: E402,F401
 
 
 def rollback():
@@ -0,0 +1,287 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+One on one engagement between two calculated fits.
+
+Both fits lock each other and open fire at the same moment, at a fixed
+distance. Each side's volleys come from a DamageTimeline against the
+other's shield, armor and hull resonances, with turret and missile
+application against the other ship's speed and signature. Volleys spill
+over into the next layer. Every tick, each side gets its local reps
+(while its capacitor lasts under the other's neutralizers), passive
+shield regen at its current shield level and any remote reps it's given.
+Reactive armor hardeners adapt to the other side's damage profile before
+the fight starts.
+
+    result = simulateDuel(fitA, fitB, distance=15000, maxTime=600)
+    result.winner         # 0, 1 or None if nobody died in time
+    result.killTimes      # seconds each side needed to kill the other
+    result.traces[0]      # {"time": [...], "shield": [...], ...} of fitA
+
+Fits are recalculated when a hardener has to adapt, and once more with their
+own damage pattern after the fight; neutralizer drains are added for the
+capacitor simulation and removed again afterwards. Results
+are plain numbers and lists, so they can be sent between processes.
+"""
+
+import math
+
+from eos.application import applicationMults
+from eos.calc import calculateRangeFactor
+from eos.const import FittingModuleState
+from eos.damageTimeline import DamageTimeline
+from eos.resistMatrix import LAYERS, ResistMatrix
+from eos.saveddata.damagePattern import DamagePattern
+from eos.utils.stats import RRTypes
+
+# Seconds between rep ticks and trace points
+DEFAULT_TICK = 1.0
+
+
+class LayerProfile:
+    """
+    Target profile (duck-typed) for one layer of a ship: resists from the
+    layer's resonances, HP of the whole ship for breacher damage.
+    """
+
+    __slots__ = ("emAmount", "thermalAmount", "kineticAmount", "explosiveAmount", "hp")
+
+    def __init__(self, resonances, hp):
+        self.emAmount, self.thermalAmount, self.kineticAmount, self.explosiveAmount = (1 - r for r in resonances)
+        self.hp = hp
+
+
+class DuelResult:
+
+    __slots__ = ("winner", "time", "killTimes", "traces", "capOutTimes")
+
+    def __init__(self, winner, time, killTimes, traces, capOutTimes):
+        self.winner = winner
+        # Seconds the fight lasted
+        self.time = time
+        # Per side: seconds it took to kill the other, or None
+        self.killTimes = killTimes
+        # Per side: {"time", "shield", "armor", "hull"} lists
+        self.traces = traces
+        # Per side: seconds until the capacitor ran dry, None if stable
+        self.capOutTimes = capOutTimes
+
+    def __repr__(self):
+        return "DuelResult(winner={}, time={}, killTimes={})".format(self.winner, self.time, self.killTimes)
+
+
+def _hasRah(fit):
+    return any(
+        mod.item is not None and "adaptiveArmorHardener" in mod.item.effects and mod.state >= FittingModuleState.ACTIVE
+        for mod in fit.modules)
+
+
+def _adaptRah(fit, attacker):
+    # Let reactive hardeners adapt to the attacker's damage profile; returns
+    # the damage pattern to restore afterwards, or None if nothing changed
+    if not _hasRah(fit):
+        return None
+    dps = attacker.getTotalDps()
+    if not dps.total:
+        return None
+    previous = fit.damagePattern
+    fit.damagePattern = DamagePattern(dps.em, dps.thermal, dps.kinetic, dps.explosive)
+    fit.clear()
+    fit.calculateModifiedAttributes()
+    return previous
+
+
+def _restoreRah(fit, damagePattern):
+    fit.damagePattern = damagePattern
+    fit.clear()
+    fit.calculateModifiedAttributes()
+
+
+def _neutralizers(attacker, distance):
+    # (source, cycle time ms, GJ per cycle) of the attacker's neutralizers
+    drains = []
+    for mod in attacker.modules:
+        if mod.isEmpty or mod.state < FittingModuleState.ACTIVE:
+            continue
+        amount = mod.getModifiedItemAttr("energyNeutralizerAmount", 0)
+        cycleTime = mod.rawCycleTime
+        if amount and cycleTime:
+            amount *= calculateRangeFactor(
+                srcOptimalRange=mod.getModifiedItemAttr("maxRange", 0),
+                srcFalloffRange=mod.getModifiedItemAttr("falloffEffectiveness", 0),
+                distance=distance)
+            drains.append((mod, cycleTime, amount))
+    controlRange = attacker.extraAttributes["droneControlRange"]
+    for drone in attacker.drones:
+        amount = drone.getModifiedItemAttr("energyNeutralizerAmount", 0) * drone.amountActive
+        cycleTime = drone.getModifiedItemAttr("energyNeutralizerDuration", 0)
+        if amount and cycleTime and distance <= controlRange:
+            drains.append((drone, cycleTime, amount))
+    return drains
+
+
+def _capOutTime(fit, attacker, distance):
+    """
+    Seconds until the fit's capacitor runs dry under the attacker's
+    neutralizers, or None if it stays stable.
+    """
+    drains = _neutralizers(attacker, distance)
+    resistance = fit.ship.getModifiedItemAttr("energyWarfareResistance", 1)
+    before = len(list(fit.iterDrains()))
+    for src, cycleTime, amount in drains:
+        fit.addDrain(src, cycleTime, amount * resistance)
+    added = len(list(fit.iterDrains())) - before
+    fit.simulateCap()
+    capOut = None if fit.capStable else fit.capState
+    if added:
+        for _ in range(added):
+            fit.removeDrain(before)
+        fit.simulateCap()
+    return capOut
+
+
+class _Side:
+    # Running state of one fit
+
+    def __init__(self, fit, capOut, remoteReps):
+        self.fit = fit
+        self.maxHp = [fit.ship.getModifiedItemAttr(attr) for attr in ("shieldCapacity", "armorHP", "hp")]
+        self.hp = list(self.maxHp)
+        tank = fit.tank
+        # Local reps, HP/s, while the capacitor lasts
+        self.localReps = (tank["shieldRepair"], tank["armorRepair"], tank["hullRepair"])
+        self.remoteReps = remoteReps if remoteReps is not None else RRTypes(0, 0, 0, 0)
+        self.capOut = capOut if capOut is not None else math.inf
+        self.trace = {"time": [0], "shield": [self.hp[0]], "armor": [self.hp[1]], "hull": [self.hp[2]]}
+
+    @property
+    def dead(self):
+        return self.hp[2] <= 0
+
+    def takeDamage(self, amounts):
+        # amounts: damage the volley would do to each layer on its own
+        share = 1
+        for i, amount in enumerate(amounts):
+            if not self.hp[i]:
+                continue
+            # A layer that resists all of the volley still stops it
+            dealt = amount * share
+            if dealt < self.hp[i]:
+                self.hp[i] -= dealt
+                return
+            share -= self.hp[i] / amount
+            self.hp[i] = 0
+
+    def repair(self, time, dt):
+        shield, armor, hull = self.localReps if time <= self.capOut else (0, 0, 0)
+        shield += self.remoteReps.shield
+        if self.maxHp[0]:
+            shield += self.fit.calculateShieldRecharge(percent=self.hp[0] / self.maxHp[0])
+        armor += self.remoteReps.armor
+        hull += self.remoteReps.hull
+        for i, rate in enumerate((shield, armor, hull)):
+            if rate:
+                self.hp[i] = min(self.maxHp[i], self.hp[i] + rate * dt)
+
+    def record(self, time):
+        if self.trace["time"][-1] == time:
+            # Replace the point taken earlier at the same time
+            for values in self.trace.values():
+                values.pop()
+        self.trace["time"].append(time)
+        for i, layer in enumerate(LAYERS):
+            self.trace[layer].append(self.hp[i])
+
+
+def _events(attacker, defender, distance, maxTime, transversal, spoolOptions, delay):
+    # [(time s, (shield, armor, hull) damage)] of the attacker on the defender
+    resists = ResistMatrix.fromShip(defender.ship)
+    totalHp = sum(resists.hp.values())
+    getAttr = defender.ship.getModifiedItemAttr
+    mults = applicationMults(
+        attacker, distance, getAttr("maxVelocity", 0), getAttr("signatureRadius", 0),
+        getAttr("radius", 0), transversal=transversal)
+    untilMs = max(0, maxTime - delay) * 1000
+    merged = {}
+    for i, layer in enumerate(LAYERS):
+        timeline = DamageTimeline(
+            attacker, LayerProfile(resists.resonances[layer], totalHp), spoolOptions, applicationMults=mults)
+        for time, amount in zip(*timeline.events(untilMs)):
+            merged.setdefault(time, [0, 0, 0])[i] += amount
+    return [(delay + time / 1000, amounts) for time, amounts in sorted(merged.items())]
+
+
+def simulateDuel(
+        fitA, fitB, distance, maxTime=600, tick=DEFAULT_TICK, transversal=1,
+        remoteReps=(None, None), spoolOptions=None, adaptRah=True, lockDelay=True):
+    """
+    Fight fitA against fitB at `distance` meters for up to `maxTime`
+    seconds. remoteReps are RRTypes (HP/s) each side receives from outside.
+    """
+    fits = (fitA, fitB)
+    # (fit, damage pattern) of fits whose hardeners adapted
+    adapted = []
+    if adaptRah:
+        for fit, attacker in ((fitA, fitB), (fitB, fitA)):
+            previous = _adaptRah(fit, attacker)
+            if previous is not None:
+                adapted.append((fit, previous))
+
+    try:
+        capOuts = (_capOutTime(fitA, fitB, distance), _capOutTime(fitB, fitA, distance))
+        sides = [_Side(fit, capOut, reps) for fit, capOut, reps in zip(fits, capOuts, remoteReps)]
+
+        # Side index taking the damage, per event
+        events = []
+        for attacker, defender in ((0, 1), (1, 0)):
+            delay = 0
+            if lockDelay:
+                delay = fits[attacker].calculateLockTime(fits[defender].ship.getModifiedItemAttr("signatureRadius")) or 0
+            for time, amounts in _events(
+                    fits[attacker], fits[defender], distance, maxTime, transversal, spoolOptions, delay):
+                events.append((time, defender, amounts))
+        events.sort(key=lambda event: event[0])
+
+        killTimes = [None, None]
+        winner = None
+        time = 0
+        index = 0
+        nextTick = tick
+        while winner is None and time < maxTime:
+            while index < len(events) and events[index][0] < nextTick:
+                time, defender, amounts = events[index]
+                index += 1
+                sides[defender].takeDamage(amounts)
+                if sides[defender].dead:
+                    winner = 1 - defender
+                    killTimes[winner] = time
+                    break
+            if winner is not None:
+                break
+            time = min(nextTick, maxTime)
+            for side in sides:
+                side.repair(time, tick)
+                side.record(time)
+            nextTick += tick
+
+        for side in sides:
+            side.record(time)
+    finally:
+        for fit, damagePattern in adapted:
+            _restoreRah(fit, damagePattern)
+    return DuelResult(winner, time, killTimes, [side.trace for side in sides], list(capOuts))
@@ -0,0 +1,264 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Per-effect profiling of effect handler dispatch.
+
+Every item type runs its effects through Effect.handler. While profiling is
+enabled, that property hands out wrapped handlers which count calls, time
+them and count the modifier operations (preAssign, increase, multiply/boost,
+force) they issue. When it is disabled the original property and methods are
+put back, so there is no overhead at all.
+
+    from eos import effectProfiler
+
+    with effectProfiler.profiling() as prof:
+        fit.clear()
+        fit.calculateModifiedAttributes()
+    print(prof.exportJson())
+    prof.exportFolded("effects.folded")  # for flamegraph.pl / speedscope
+"""
+
+import functools
+import json
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+from logbook import Logger
+
+from eos.gamedata import Effect
+from eos.modifiedAttributeDict import ModifiedAttributeDict
+
+pyfalog = Logger(__name__)
+
+# Modifier operations that are counted. boost() goes through multiply()
+# and is counted there.
+MODIFIER_OPERATIONS = ("preAssign", "increase", "multiply", "force")
+
+
+class EffectStats:
+
+    __slots__ = ("effectID", "name", "runTime", "callCount", "totalTime", "maxTime", "modifierOps")
+
+    def __init__(self, effectID, name, runTime):
+        self.effectID = effectID
+        self.name = name
+        self.runTime = runTime
+        self.callCount = 0
+        self.totalTime = 0.0
+        self.maxTime = 0.0
+        self.modifierOps = 0
+
+    def toDict(self):
+        return {
+            "effectID": self.effectID,
+            "name": self.name,
+            "runTime": self.runTime,
+            "callCount": self.callCount,
+            "totalTime": self.totalTime,
+            "maxTime": self.maxTime,
+            "meanTime": self.totalTime / self.callCount if self.callCount else 0.0,
+            "modifierOps": self.modifierOps,
+        }
+
+
+class EffectProfiler:
+    """
+    Collects per-effect statistics while enabled.
+
+    Times are inclusive: modifier operations issued by a handler count
+    towards that handler. Safe to use while fits are calculated on several
+    threads.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__stats = {}
+        # (runTime, context, effect) -> total seconds, for folded stacks
+        self.__stacks = {}
+        self.__wrappers = {}
+        self.__originalHandler = None
+        self.__originalOps = {}
+
+    @property
+    def enabled(self):
+        return self.__originalHandler is not None
+
+    def enable(self):
+        if self.enabled:
+            return
+
+        pyfalog.info("Enabling effect profiling")
+        profiler = self
+        originalHandler = Effect.__dict__["handler"]
+
+        def profiledHandler(effect):
+            return profiler._wrap(effect, originalHandler.fget(effect))
+
+        self.__originalHandler = originalHandler
+        Effect.handler = property(profiledHandler, doc=originalHandler.__doc__)
+
+        for opName in MODIFIER_OPERATIONS:
+            original = ModifiedAttributeDict.__dict__[opName]
+            self.__originalOps[opName] = original
+            setattr(ModifiedAttributeDict, opName, self.__countingOp(original))
+
+    def disable(self):
+        if not self.enabled:
+            return
+
+        pyfalog.info("Disabling effect profiling")
+        Effect.handler = self.__originalHandler
+        self.__originalHandler = None
+        for opName, original in self.__originalOps.items():
+            setattr(ModifiedAttributeDict, opName, original)
+        self.__originalOps.clear()
+        self.__wrappers.clear()
+
+    def reset(self):
+        with self.__lock:
+            self.__stats.clear()
+            self.__stacks.clear()
+
+    # Results
+
+    def stats(self):
+        """
+        Per-effect statistics, most expensive first.
+        """
+        with self.__lock:
+            stats = [s.toDict() for s in self.__stats.values()]
+        stats.sort(key=lambda s: s["totalTime"], reverse=True)
+        return stats
+
+    def exportJson(self, path=None):
+        data = json.dumps({"effects": self.stats()}, indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
+
+    def exportFolded(self, path=None):
+        """
+        Collapsed stacks ("frame;frame;frame count" per line) with counts in
+        microseconds, as read by flamegraph.pl, inferno and speedscope.
+        """
+        with self.__lock:
+            stacks = sorted(self.__stacks.items())
+        lines = [
+            "calc;{};{};{} {}".format(runTime, context, effect, int(seconds * 1e6))
+            for (runTime, context, effect), seconds in stacks
+        ]
+        data = "\n".join(lines) + ("\n" if lines else "")
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+        return data
+
+    # Internals
+
+    def _wrap(self, effect, handler):
+        cached = self.__wrappers.get(effect.ID)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+
+        profiler = self
+        local = self.__local
+        effectID = effect.ID
+        frame = "Effect{}_{}".format(effectID, effect.name)
+        runTime = effect.runTime or "normal"
+
+        # functools.wraps sets __wrapped__, so code inspecting handlers
+        # (ProfileCharacter's skill scopes) still sees the real one
+        @functools.wraps(handler)
+        def profiled(fit, item, context, projectionRange, **kwargs):
+            ops = getattr(local, "ops", None)
+            if ops is None:
+                ops = local.ops = [0]
+            opsBefore = ops[0]
+            start = perf_counter()
+            try:
+                return handler(fit, item, context, projectionRange, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                profiler._record(effect, effectID, frame, runTime, context, elapsed, ops[0] - opsBefore)
+
+        self.__wrappers[effectID] = (handler, profiled)
+        return profiled
+
+    def _record(self, effect, effectID, frame, runTime, context, elapsed, ops):
+        if isinstance(context, (tuple, list)):
+            context = "+".join(context)
+        with self.__lock:
+            stats = self.__stats.get(effectID)
+            if stats is None:
+                stats = self.__stats[effectID] = EffectStats(effectID, effect.name, runTime)
+            stats.callCount += 1
+            stats.totalTime += elapsed
+            if elapsed > stats.maxTime:
+                stats.maxTime = elapsed
+            stats.modifierOps += ops
+
+            key = (runTime, context, frame)
+            self.__stacks[key] = self.__stacks.get(key, 0.0) + elapsed
+
+    def __countingOp(self, original):
+        local = self.__local
+
+        def counted(*args, **kwargs):
+            ops = getattr(local, "ops", None)
+            if ops is None:
+                ops = local.ops = [0]
+            ops[0] += 1
+            return original(*args, **kwargs)
+
+        counted.__name__ = original.__name__
+        counted.__doc__ = original.__doc__
+        return counted
+
+
+profiler = EffectProfiler()
+
+
+def enable():
+    profiler.enable()
+
+
+def disable():
+    profiler.disable()
+
+
+def isEnabled():
+    return profiler.enabled
+
+
+@contextmanager
+def profiling(reset=True):
+    """
+    Profile effect handlers for the duration of the block.
+    """
+    wasEnabled = profiler.enabled
+    if reset:
+        profiler.reset()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        if not wasEnabled:
+            profiler.disable()
@@ -0,0 +1,81 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Per-fit numbers for fleet stats: fits flown by several pilots each,
+optionally under one booster's command bursts.
+
+Each distinct fit is read once into a MemberStats of plain numbers:
+
+    applyCommandBoosts(fit, booster)       # recalculates fit with the bursts
+    stats = MemberStats(fit, columns)
+    stats.dps                              # one value per target profile
+    stats.ehp["armor"], stats.totalEhp
+    stats.remoteReps                       # RRTypes, HP/s and GJ/s
+
+MemberStats hold no eos objects, so they can be computed in other processes
+and added up in one place; evefit_core.fleet does that, counting each fit
+once per pilot. Damage is per ProfileColumns column; EHP is against each
+fit's own damage pattern, like Fit.ehp.
+"""
+
+from eos.const import CalcType
+from eos.damageMatrix import DamageMatrix
+from eos.resistMatrix import LAYERS
+
+
+def applyCommandBoosts(fit, booster):
+    """
+    Recalculate `fit` with the command bursts of the (calculated or not)
+    `booster` fit. Works on fits that aren't linked through saved data,
+    which Fit.commandFits needs; the booster can boost any number of fits
+    one after the other.
+    """
+    fit.clear()
+    if booster is not None and booster is not fit:
+        booster.calculateModifiedAttributes(fit, CalcType.COMMAND)
+    fit.calculateModifiedAttributes()
+
+
+class MemberStats:
+    """
+    Stats of one calculated fit, as plain numbers.
+    """
+
+    __slots__ = (
+        "profiles", "dps", "volley", "ehp", "remoteReps",
+        "minerYield", "droneYield", "capStable", "capState")
+
+    def __init__(self, fit, columns=None, spoolOptions=None):
+        matrix = DamageMatrix(fit, columns, spoolOptions=spoolOptions)
+        self.profiles = [profile.fullName for profile in matrix.profiles]
+        # One value per profile
+        self.dps = matrix.totalDps
+        self.volley = matrix.totalVolley
+        # layer -> EHP
+        self.ehp = {layer: fit.ehp[layer] for layer in LAYERS}
+        self.remoteReps = fit.getRemoteReps(spoolOptions=spoolOptions)
+        # m3/s
+        self.minerYield = fit.minerYield
+        self.droneYield = fit.droneYield
+        self.capStable = bool(fit.capStable)
+        # Stable percentage, or seconds until the capacitor is empty
+        self.capState = fit.capState
+
+    @property
+    def totalEhp(self):
+        return sum(self.ehp.values())
@@ -24,7 +24,6 @@ import re
 from logbook import Logger
 from sqlalchemy.orm import reconstructor
 
-import eos.effects
 import eos.db
 from eos.saveddata.price import Price as types_Price
 from .eqBase import EqBase
@@ -170,6 +169,9 @@ class Effect(EqBase):
         Grab the handler, type and runTime from the effect code if it exists,
         if it doesn't, set dummy values and add a dummy handler
         """
+        # Imported here so that importing eos doesn't load every effect up front
+        import eos.effects
+
         try:
             effectDefName = "Effect{}".format(self.ID)
             pyfalog.debug("Loading {0} ({1})".format(self.name, effectDefName))
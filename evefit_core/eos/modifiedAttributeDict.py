@@ -23,9 +23,16 @@ from copy import copy
 from math import exp
 
 from eos.const import Operator
+
+
 # TODO: This needs to be moved out, we shouldn't have *ANY* dependencies back to other modules/methods inside eos.
 # This also breaks writing any tests. :(
-from eos.db.gamedata.queries import getAttributeInfo
+def getAttributeInfo(*args, **kwargs):
+    # Importing the query pulls in the whole gamedata DB scheme, so it's done
+    # on first use; after that the real query replaces this function.
+    global getAttributeInfo
+    from eos.db.gamedata.queries import getAttributeInfo
+    return getAttributeInfo(*args, **kwargs)
 
 
 defaultValuesCache = {}
@@ -67,6 +74,85 @@ def getResistanceAttrID(modifyingItem, effect):
         return resistanceID
 
 
+def _penaltyChains(multipliers):
+    # Bonuses and penalties of one stacking group, most significant first,
+    # in the order __calculateValue() applies them
+    abssort = lambda _val: -abs(_val - 1)
+    return (
+        sorted((_val for _val in multipliers if _val > 1), key=abssort),
+        sorted((_val for _val in multipliers if _val < 1), key=abssort))
+
+
+def _chainProduct(chain):
+    product = 1
+    for i, bonus in enumerate(chain):
+        product *= 1 + (bonus - 1) * exp(- i ** 2 / 7.1289)
+    return product
+
+
+def _chainProductsWithout(chain):
+    """
+    Product of a sorted penalty chain with each of its elements left out.
+    Elements before the removed one keep their penalty, the ones after it
+    move up one place: prefix products times suffix products taken one
+    position earlier.
+    """
+    prefix = [1]
+    for i, bonus in enumerate(chain):
+        prefix.append(prefix[-1] * (1 + (bonus - 1) * exp(- i ** 2 / 7.1289)))
+    shifted = [1] * (len(chain) + 1)
+    for i in range(len(chain) - 1, 0, -1):
+        shifted[i] = shifted[i + 1] * (1 + (chain[i] - 1) * exp(- (i - 1) ** 2 / 7.1289))
+    return [prefix[i] * shifted[i + 1] for i in range(len(chain))]
+
+
+class _PenaltyGroup:
+    # Product of one stacking group, and of it without any one multiplier
+
+    __slots__ = ("chains", "products", "without")
+
+    def __init__(self, multipliers):
+        self.chains = _penaltyChains(multipliers)
+        self.products = tuple(_chainProduct(chain) for chain in self.chains)
+        self.without = None
+
+    @property
+    def product(self):
+        return self.products[0] * self.products[1]
+
+    def productWithout(self, removed):
+        if len(removed) > 1:
+            # Rare enough to just recompute
+            chains = [list(chain) for chain in self.chains]
+            for mult in removed:
+                for chain in chains:
+                    if mult in chain:
+                        chain.remove(mult)
+                        break
+            return _chainProduct(chains[0]) * _chainProduct(chains[1])
+        if self.without is None:
+            self.without = tuple(_chainProductsWithout(chain) for chain in self.chains)
+        mult = removed[0]
+        for i, chain in enumerate(self.chains):
+            if mult in chain:
+                return self.without[i][chain.index(mult)] * self.products[1 - i]
+        # Neutral multipliers aren't in either chain
+        return self.product
+
+
+class _Removal:
+    # What taking one afflictor out changes in an attribute's calculation
+
+    __slots__ = ("preIncrease", "multipliers", "penalized", "postIncrease")
+
+    def __init__(self):
+        self.preIncrease = 0
+        self.multipliers = []
+        # penalty group -> multipliers
+        self.penalized = {}
+        self.postIncrease = 0
+
+
 class ItemAttrShortcut:
 
     def getModifiedItemAttr(self, key, default=0):
@@ -77,6 +163,9 @@ class ItemAttrShortcut:
         return_value = self.itemModifiedAttributes.getExtended(key, extraMultipliers=extraMultipliers, ignoreAfflictors=ignoreAfflictors)
         return return_value if return_value is not None else default
 
+    def getModifiedItemAttrContributions(self, key):
+        return self.itemModifiedAttributes.getContributions(key)
+
     def getItemBaseAttrValue(self, key, default=0):
         return_value = self.itemModifiedAttributes.getOriginal(key)
         return return_value if return_value is not None else default
@@ -92,6 +181,9 @@ class ChargeAttrShortcut:
         return_value = self.chargeModifiedAttributes.getExtended(key, extraMultipliers=extraMultipliers, ignoreAfflictors=ignoreAfflictors)
         return return_value if return_value is not None else default
 
+    def getModifiedChargeAttrContributions(self, key):
+        return self.chargeModifiedAttributes.getContributions(key)
+
     def getChargeBaseAttrValue(self, key, default=0):
         return_value = self.chargeModifiedAttributes.getOriginal(key)
         return return_value if return_value is not None else default
@@ -257,6 +349,80 @@ class ModifiedAttributeDict(MutableMapping):
             return val
         return default
 
+    def getContributions(self, key):
+        """
+        Value of the attribute without each of its afflictors, for all of
+        them at once: {afflictor: value}. Same numbers as getExtended() with
+        ignoreAfflictors=[afflictor], without a full recalculation per
+        afflictor. Skills are afflictors too when they modify the attribute.
+
+        Like getExtended(), forced and pre-assigned values are not undone;
+        afflictors which only do those are left out.
+        """
+        afflictions = self.getAfflictions(key)
+        if not afflictions:
+            return {}
+
+        removals = {}
+        for afflictors in afflictions.values():
+            for afflictor, operator, stackingGroup, preResAmount, postResAmount, used in afflictors:
+                if operator == Operator.MULTIPLY:
+                    removal = removals.setdefault(afflictor, _Removal())
+                    if stackingGroup is None:
+                        removal.multipliers.append(postResAmount)
+                    else:
+                        removal.penalized.setdefault(stackingGroup, []).append(postResAmount)
+                elif operator == Operator.PREINCREASE:
+                    removals.setdefault(afflictor, _Removal()).preIncrease += postResAmount
+                elif operator == Operator.POSTINCREASE:
+                    removals.setdefault(afflictor, _Removal()).postIncrease += postResAmount
+
+        force = self.__forced.get(key)
+        if force is not None:
+            value = self[key]
+            return {afflictor: value for afflictor in removals}
+
+        cappingValue = self.__cappingValue(key)
+        default = getAttrDefault(key, fallback=0.0)
+        base = self.__intermediary.get(key, self.__preAssigns.get(key, self.getOriginal(key, default)))
+        preIncrease = self.__preIncreases.get(key, 0)
+        multiplier = self.__multipliers.get(key, 1)
+        postIncrease = self.__postIncreases.get(key, 0)
+        groups = {
+            penaltyGroup: _PenaltyGroup(penalizedMultipliers)
+            for penaltyGroup, penalizedMultipliers in self.__penalizedMultipliers.get(key, {}).items()}
+        penalized = 1
+        for group in groups.values():
+            penalized *= group.product
+
+        values = {}
+        for afflictor, removal in removals.items():
+            removalMultiplier = multiplier
+            for mult in removal.multipliers:
+                if mult == 0:
+                    # Can't be divided out; multiply everything else again
+                    removalMultiplier = 1
+                    for other, otherRemoval in removals.items():
+                        if other is not afflictor:
+                            for otherMult in otherRemoval.multipliers:
+                                removalMultiplier *= otherMult
+                    break
+                removalMultiplier /= mult
+            removalPenalized = penalized
+            if removal.penalized:
+                removalPenalized = 1
+                for penaltyGroup, group in groups.items():
+                    removed = removal.penalized.get(penaltyGroup)
+                    removalPenalized *= group.product if removed is None else group.productWithout(removed)
+            val = (base + preIncrease - removal.preIncrease) * removalMultiplier * removalPenalized
+            val += postIncrease - removal.postIncrease
+            if cappingValue is not None:
+                val = min(val, cappingValue)
+            if key in ("cpu", "power", "cpuOutput", "powerOutput"):
+                val = round(val, 2)
+            values[afflictor] = val
+        return values
+
     def __delitem__(self, key):
         if key in self.__modified:
             del self.__modified[key]
@@ -305,7 +471,7 @@ class ModifiedAttributeDict(MutableMapping):
         keys.update(iter(self.__intermediary.keys()))
         return len(keys)
 
-    def __calculateValue(self, key, extraMultipliers=None, preIncAdj=None, multAdj=None, postIncAdj=None, ignorePenMult=None):
+    def __cappingValue(self, key):
         # It's possible that various attributes are capped by other attributes,
         # it's defined by reference maxAttributeID
         try:
@@ -325,9 +491,11 @@ class ModifiedAttributeDict(MutableMapping):
 
         if cappingKey:
             cappingValue = self[cappingKey]
-            cappingValue = cappingValue.value if hasattr(cappingValue, "value") else cappingValue
-        else:
-            cappingValue = None
+            return cappingValue.value if hasattr(cappingValue, "value") else cappingValue
+        return None
+
+    def __calculateValue(self, key, extraMultipliers=None, preIncAdj=None, multAdj=None, postIncAdj=None, ignorePenMult=None):
+        cappingValue = self.__cappingValue(key)
 
         # If value is forced, we don't have to calculate anything,
         # just return forced value instead
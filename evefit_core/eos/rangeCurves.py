@@ -0,0 +1,184 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+How the stats of a calculated fit fall off with range, for every relevant
+module at once.
+
+Per-point graphs call calculateRangeFactor() for every distance and every
+module, and ask the module for its dps or reps each time. Here each module's
+full-strength value and range parameters are read once and a whole curve of
+distances is computed with calc.calculateRangeFactors():
+
+    distances = [i * 500 for i in range(500)]
+    curves = RangeCurves(fit, distances)
+    curves.totalDps()                  # one value per distance
+    for mod, factors in curves.ewar:   # share of full strength per distance
+        ...
+    lockTimeCurve(fit, [25, 40, 150, 400])
+
+Distances are in meters. Weapon damage is raw unless a target profile is
+given; target speed and signature don't affect it here.
+"""
+
+from eos.calc import calculateLockTimes, calculateRangeFactors
+from eos.const import FittingHardpoint, FittingModuleState
+
+
+def missileRangeFactors(mod, distances):
+    """
+    Share of missiles that reach each distance: all within the shorter
+    flight range, some between that and the longer one.
+    """
+    rangeData = mod.missileMaxRangeData
+    if rangeData is None:
+        return [1 for _ in distances]
+    lowerRange, higherRange, higherChance = rangeData
+    return [
+        1 if distance is None or distance <= lowerRange else
+        higherChance if distance <= higherRange else 0
+        for distance in distances]
+
+
+def moduleRangeFactors(mod, distances):
+    """
+    Range factor of a module's effect at each distance.
+    """
+    if mod.hardpoint == FittingHardpoint.MISSILE:
+        return missileRangeFactors(mod, distances)
+    optimal = mod.maxRange
+    if optimal is None:
+        return [1 for _ in distances]
+    # Guns can shoot past 3x falloff, with a tiny chance to hit
+    restricted = mod.hardpoint != FittingHardpoint.TURRET
+    return calculateRangeFactors(optimal, mod.falloff or 0, distances, restrictedRange=restricted)
+
+
+def _controlRangeFactors(fit, distances):
+    controlRange = fit.extraAttributes["droneControlRange"]
+    return [1 if distance is None or distance <= controlRange else 0 for distance in distances]
+
+
+def _isActive(mod):
+    return not mod.isEmpty and mod.item is not None and mod.state >= FittingModuleState.ACTIVE
+
+
+def _isProjected(mod):
+    return any(effect.isType("projected") for effect in mod.item.effects.values())
+
+
+def _hp(reps):
+    return reps.shield + reps.armor + reps.hull
+
+
+def _scaled(value, factors):
+    return [value * factor for factor in factors]
+
+
+def _total(curves, length):
+    total = [0] * length
+    for _, values in curves:
+        for i, value in enumerate(values):
+            total[i] += value
+    return total
+
+
+class RangeCurves:
+    """
+    Per-module curves of one fit over a list of distances.
+
+    weaponDps, droneDps, remoteReps, remoteCapacitor: (item, values) pairs,
+    values being dps, rep HP/s or GJ/s at each distance. ewar: (module,
+    factors) pairs for other projected modules (ewar, neutralizers, remote
+    boosts), factors being the share of full strength at each distance.
+    fighterDps doesn't depend on range and is a single number.
+    """
+
+    def __init__(self, fit, distances, spoolOptions=None, targetProfile=None):
+        self.distances = list(distances)
+        self.weaponDps = []
+        self.droneDps = []
+        self.remoteReps = []
+        self.remoteCapacitor = []
+        self.ewar = []
+
+        for mod in fit.modules:
+            if not _isActive(mod):
+                continue
+            dps = mod.getDps(spoolOptions=spoolOptions, targetProfile=targetProfile).total
+            if dps:
+                self.weaponDps.append((mod, _scaled(dps, moduleRangeFactors(mod, self.distances))))
+                continue
+            reps = mod.getRemoteReps(spoolOptions=spoolOptions)
+            if _hp(reps):
+                self.remoteReps.append((mod, _scaled(_hp(reps), moduleRangeFactors(mod, self.distances))))
+            elif reps.capacitor:
+                self.remoteCapacitor.append((mod, _scaled(reps.capacitor, moduleRangeFactors(mod, self.distances))))
+            elif _isProjected(mod):
+                self.ewar.append((mod, moduleRangeFactors(mod, self.distances)))
+
+        drones = [drone for drone in fit.drones if drone.amountActive > 0]
+        if drones:
+            controlFactors = _controlRangeFactors(fit, self.distances)
+            for drone in drones:
+                dps = drone.getDps(targetProfile=targetProfile).total
+                if dps:
+                    self.droneDps.append((drone, _scaled(dps, controlFactors)))
+                reps = drone.getRemoteReps()
+                if _hp(reps):
+                    self.remoteReps.append((drone, _scaled(_hp(reps), controlFactors)))
+
+        self.fighterDps = sum(
+            fighter.getDps(targetProfile=targetProfile).total
+            for fighter in fit.fighters if fighter.active and fighter.amount > 0)
+
+    def __len__(self):
+        return len(self.distances)
+
+    def totalWeaponDps(self):
+        return _total(self.weaponDps, len(self.distances))
+
+    def totalDroneDps(self):
+        return _total(self.droneDps, len(self.distances))
+
+    def totalDps(self):
+        return [
+            weapon + drone + self.fighterDps
+            for weapon, drone in zip(self.totalWeaponDps(), self.totalDroneDps())]
+
+    def totalRemoteReps(self):
+        return _total(self.remoteReps, len(self.distances))
+
+
+def lockTimeCurve(fit, sigRadii):
+    """
+    Seconds the fit needs to lock targets of each signature radius.
+    """
+    sigRadii = list(sigRadii)
+    scanRes = fit.ship.getModifiedItemAttr("scanResolution")
+    if scanRes is not None and scanRes > 0:
+        return calculateLockTimes(scanRes, sigRadii)
+    # Same fallback as Fit.calculateLockTime()
+    return [fit.ship.getModifiedItemAttr("scanSpeed") / 1000.0 for _ in sigRadii]
+
+
+def rangeCurves(fits, distances, spoolOptions=None, targetProfile=None):
+    """
+    RangeCurves of each fit over the same distances.
+    """
+    distances = list(distances)
+    return [RangeCurves(fit, distances, spoolOptions, targetProfile) for fit in fits]
@@ -0,0 +1,177 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+EHP and effective reps of calculated ships against many damage patterns.
+
+DamagePattern.calculateEhp() and calculateEffectiveTank() work for one
+pattern at a time and look up the ship's resonances again for every layer
+and every call. Here the 3x4 resonance matrix and the layer HP are read from
+the ship once, patterns are turned into columns of damage shares once, and
+every pattern is then a few multiply-adds:
+
+    columns = PatternColumns.builtins()
+    resists = ResistMatrix.fromShip(fit.ship)
+    resists.totalEhp(columns)                  # one value per pattern
+    resists.effectiveTank(fit.tank, columns)   # {"armorRepair": [...], ...}
+
+    ehpTable([fitA, fitB], columns)            # fits x patterns
+
+Numbers match DamagePattern.calculateEhp() / calculateEffectiveTank().
+"""
+
+from eos.saveddata.damagePattern import RESONANCE_ATTRIBUTES, DamagePattern
+
+LAYERS = ("shield", "armor", "hull")
+
+HP_ATTRIBUTES = {
+    "shield": "shieldCapacity",
+    "armor": "armorHP",
+    "hull": "hp"}
+
+# Fit.tank fields -> layer they repair, as in DamagePattern.calculateEffectiveTank()
+TANK_LAYERS = {
+    "passiveShield": "shield",
+    "shieldRepair": "shield",
+    "armorRepair": "armor",
+    "armorRepairPreSpool": "armor",
+    "armorRepairFullSpool": "armor",
+    "hullRepair": "hull"}
+
+
+def allDamagePatterns(includeUser=True):
+    """
+    All built-in damage patterns and, optionally, the user's.
+    """
+    patterns = DamagePattern.getBuiltinList()
+    if includeUser:
+        import eos.db
+        patterns.extend(eos.db.getDamagePatternList())
+    return patterns
+
+
+class PatternColumns:
+    """
+    Damage shares (amount / total) per damage type of a list of patterns.
+    """
+
+    __slots__ = ("patterns", "shares")
+
+    _builtins = None
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        shares = []
+        for pattern in self.patterns:
+            amounts = (pattern.emAmount, pattern.thermalAmount, pattern.kineticAmount, pattern.explosiveAmount)
+            total = float(sum(amounts) or 1)
+            shares.append(tuple(amount / total for amount in amounts))
+        # One (em, thermal, kinetic, explosive) tuple per pattern
+        self.shares = shares
+
+    def __len__(self):
+        return len(self.patterns)
+
+    @classmethod
+    def builtins(cls):
+        """
+        Columns for the built-in patterns; built once.
+        """
+        if cls._builtins is None:
+            cls._builtins = cls(allDamagePatterns(includeUser=False))
+        return cls._builtins
+
+    @classmethod
+    def all(cls):
+        return cls(allDamagePatterns())
+
+
+def _columns(patterns):
+    if patterns is None:
+        return PatternColumns.builtins()
+    if isinstance(patterns, PatternColumns):
+        return patterns
+    return PatternColumns(patterns)
+
+
+class ResistMatrix:
+    """
+    Layer HP and resonances of a calculated ship (or anything with
+    getModifiedItemAttr).
+    """
+
+    __slots__ = ("hp", "resonances")
+
+    def __init__(self, hp, resonances):
+        # layer -> raw HP
+        self.hp = hp
+        # layer -> (em, thermal, kinetic, explosive) resonance
+        self.resonances = resonances
+
+    @classmethod
+    def fromShip(cls, ship):
+        getAttr = ship.getModifiedItemAttr
+        return cls(
+            hp={layer: getAttr(HP_ATTRIBUTES[layer]) for layer in LAYERS},
+            resonances={layer: tuple(getAttr(attr) for attr in RESONANCE_ATTRIBUTES[layer]) for layer in LAYERS})
+
+    def divisors(self, patterns=None):
+        """
+        layer -> damage taken per point dealt, one value per pattern; amounts
+        are divided by these to make them effective.
+        """
+        columns = _columns(patterns)
+        divisors = {}
+        for layer in LAYERS:
+            em, thermal, kinetic, explosive = self.resonances[layer]
+            divisors[layer] = [
+                (emShare * em + thermShare * thermal + kinShare * kinetic + expShare * explosive) or 1
+                for emShare, thermShare, kinShare, expShare in columns.shares]
+        return divisors
+
+    def ehp(self, patterns=None):
+        """
+        layer -> EHP, one value per pattern.
+        """
+        divisors = self.divisors(patterns)
+        return {layer: [self.hp[layer] / divisor for divisor in divisors[layer]] for layer in LAYERS}
+
+    def totalEhp(self, patterns=None):
+        """
+        EHP of all layers together, one value per pattern.
+        """
+        ehp = self.ehp(patterns)
+        return [sum(values) for values in zip(*(ehp[layer] for layer in LAYERS))]
+
+    def effectiveTank(self, tank, patterns=None):
+        """
+        Effective reps of a Fit.tank / Fit.sustainableTank dict; field ->
+        one value per pattern. Fields without a layer are left out.
+        """
+        divisors = self.divisors(patterns)
+        return {
+            field: [amount / divisor for divisor in divisors[TANK_LAYERS[field]]]
+            for field, amount in tank.items() if field in TANK_LAYERS}
+
+
+def ehpTable(fits, patterns=None):
+    """
+    Total EHP of every fit against every pattern: one row per fit, one
+    column per pattern.
+    """
+    columns = _columns(patterns)
+    return [ResistMatrix.fromShip(fit.ship).totalEhp(columns) for fit in fits]
@@ -169,6 +169,15 @@ BUILTINS = OrderedDict([
     (-117, (_c(_t('NPC')) + _t('Sansha Incursion'), 1682, 1347, 3678, 3678)),
     (-118, (_c(_t('NPC')) + _t('Sleepers'), 1472, 1472, 1384, 1384))])
 
+# Resonance attribute names per tank layer, in DAMAGE_TYPES order
+RESONANCE_ATTRIBUTES = {
+    "shield": ("shieldEmDamageResonance", "shieldThermalDamageResonance",
+               "shieldKineticDamageResonance", "shieldExplosiveDamageResonance"),
+    "armor": ("armorEmDamageResonance", "armorThermalDamageResonance",
+              "armorKineticDamageResonance", "armorExplosiveDamageResonance"),
+    "hull": ("emDamageResonance", "thermalDamageResonance",
+             "kineticDamageResonance", "explosiveDamageResonance")}
+
 
 class DamagePattern:
     DAMAGE_TYPES = ('em', 'thermal', 'kinetic', 'explosive')
@@ -240,17 +249,10 @@ class DamagePattern:
         return ereps
 
     def effectivify(self, item, amount, type):
-        type = type if type != "hull" else ""
         totalDamage = sum((self.emAmount, self.thermalAmount, self.kineticAmount, self.explosiveAmount))
         specificDivider = 0
-        for damageType in self.DAMAGE_TYPES:
-            # Compose an attribute name, then make sure the first letter is NOT capitalized
-            attrName = "%s%sDamageResonance" % (type, damageType.capitalize())
-            attrName = attrName[0].lower() + attrName[1:]
-
+        for attrName, damage in zip(RESONANCE_ATTRIBUTES[type], (self.emAmount, self.thermalAmount, self.kineticAmount, self.explosiveAmount)):
             resonance = item.getModifiedItemAttr(attrName)
-            damage = getattr(self, "%sAmount" % damageType)
-
             specificDivider += damage / float(totalDamage or 1) * resonance
 
         return amount / (specificDivider or 1)
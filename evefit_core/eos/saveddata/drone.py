@@ -224,8 +224,7 @@ class Drone(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, Mu
         avgCycleTime = cycleParams.averageTime
         if len(repAmountParams) == 0 or avgCycleTime == 0:
             return rrDuringCycle
-        for rrAmount in repAmountParams.values():
-            rrDuringCycle += rrAmount
+        rrDuringCycle = RRTypes.sum(repAmountParams.values())
         rrFactor = 1 / (avgCycleTime / 1000)
         rrDuringCycle *= rrFactor
         return rrDuringCycle
@@ -217,16 +217,10 @@ class Fighter(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut):
 
     def getVolley(self, targetProfile=None):
         volleyParams = self.getVolleyParametersPerEffect(targetProfile=targetProfile)
-        volley = DmgTypes.default()
-        for volleyData in volleyParams.values():
-            volley += volleyData[0]
-        return volley
+        return DmgTypes.sum(volleyData[0] for volleyData in volleyParams.values())
 
     def getDps(self, targetProfile=None):
-        dps = DmgTypes.default()
-        for subdps in self.getDpsPerEffect(targetProfile=targetProfile).values():
-            dps += subdps
-        return dps
+        return DmgTypes.sum(self.getDpsPerEffect(targetProfile=targetProfile).values())
 
     def getDpsPerEffect(self, targetProfile=None):
         if not self.active or self.amount <= 0:
@@ -27,7 +27,7 @@ from logbook import Logger
 from sqlalchemy.orm import reconstructor, validates
 
 import eos.db
-from eos import capSim
+from eos import capSim, tracing
 from eos.calc import calculateLockTime, calculateMultiplier
 from eos.const import CalcType, FitSystemSecurity, FittingHardpoint, FittingModuleState, FittingSlot, ImplantLocation
 from eos.effectHandlerHelpers import (
@@ -39,6 +39,7 @@ from eos.saveddata.damagePattern import DamagePattern
 from eos.saveddata.module import Module
 from eos.saveddata.ship import Ship
 from eos.saveddata.targetProfile import TargetProfile
+from eos.spoolCurves import SpoolCurves
 from eos.utils.float import floatUnerr
 from eos.utils.stats import DmgTypes, RRTypes
 
@@ -138,6 +139,7 @@ class Fit:
         self.__weaponDpsMap = {}
         self.__weaponVolleyMap = {}
         self.__remoteRepMap = {}
+        self.__spoolCurves = None
         self.__minerYield = None
         self.__droneYield = None
         self.__minerDrain = None
@@ -172,6 +174,7 @@ class Fit:
         self.__weaponDpsMap.clear()
         self.__droneDps = None
         self.__remoteRepMap.clear()
+        self.__spoolCurves = None
         self.__capStable = None
         self.__capState = None
         self.__capUsed = None
@@ -516,6 +519,7 @@ class Fit:
         self.__weaponDpsMap = {}
         self.__weaponVolleyMap = {}
         self.__remoteRepMap = {}
+        self.__spoolCurves = None
         self.__minerYield = None
         self.__droneYield = None
         self.__minerDrain = None
@@ -975,7 +979,26 @@ class Fit:
                 The type of calculation our current iteration is in. This helps us determine the interactions between
                 fits that rely on others for proper calculations
         """
-        pyfalog.info("Starting fit calculation on: {0}, calc: {1}", repr(self), CalcType(type).name)
+        with tracing.span("fit.calc") as span:
+            if span.recording:
+                span.setAttributes(
+                    fitID=self.ID,
+                    targetFitID=targetFit.ID if targetFit is not None else None,
+                    calcType=CalcType(type).name,
+                    ship=self.ship.item.name if self.ship is not None else None,
+                    calculated=self.__calculated,
+                    modules=len(self.modules),
+                    drones=len(self.drones),
+                    fighters=len(self.fighters),
+                    implants=len(self.implants),
+                    boosters=len(self.boosters),
+                    projectedFits=len(self.projectedFits),
+                    commandFits=len(self.commandFits),
+                )
+            self.__calculateModifiedAttributes(targetFit, type)
+
+    def __calculateModifiedAttributes(self, targetFit, type):
+        pyfalog.debug("Starting fit calculation on: {0}, calc: {1}", self, type)
 
         # If we are projecting this fit onto another one, collect the projection info for later use
 
@@ -995,7 +1018,7 @@ class Fit:
                     value.boosted_fit.__resetDependentCalcs()
 
         if targetFit and type == CalcType.PROJECTED:
-            pyfalog.debug("Calculating projections from {0} to target {1}", repr(self), repr(targetFit))
+            pyfalog.debug("Calculating projections from {0} to target {1}", self, targetFit)
             projectionInfo = self.getProjectionInfo(targetFit.ID)
 
         # Start applying any command fits that we may have.
@@ -1003,13 +1026,14 @@ class Fit:
         # target fit to be used later on in the calculation. This does not apply when we're already calculating a
         # command fit.
         if type != CalcType.COMMAND and self.commandFits and not self.__calculated:
-            for fit in self.commandFits:
-                commandInfo = fit.getCommandInfo(self.ID)
-                # Continue loop if we're trying to apply ourselves or if this fit isn't active
-                if not commandInfo.active or self == commandInfo.booster_fit:
-                    continue
+            with tracing.span("fit.commandFits"):
+                for fit in self.commandFits:
+                    commandInfo = fit.getCommandInfo(self.ID)
+                    # Continue loop if we're trying to apply ourselves or if this fit isn't active
+                    if not commandInfo.active or self == commandInfo.booster_fit:
+                        continue
 
-                commandInfo.booster_fit.calculateModifiedAttributes(self, CalcType.COMMAND)
+                    commandInfo.booster_fit.calculateModifiedAttributes(self, CalcType.COMMAND)
 
         # If we're not explicitly asked to project fit onto something,
         # set self as target fit
@@ -1032,81 +1056,88 @@ class Fit:
             return
 
         if not self.__calculated:
-            pyfalog.info("Fit is not yet calculated; will be running local calcs for {}".format(repr(self)))
-            self.clear()
+            pyfalog.debug("Fit is not yet calculated; will be running local calcs for {0}", self)
+            with tracing.span("fit.clear"):
+                self.clear()
 
         # Loop through our run times here. These determine which effects are run in which order.
         for runTime in ("early", "normal", "late"):
-            # pyfalog.debug("Run time: {0}", runTime)
-            # Items that are unrestricted. These items are run on the local fit
-            # first and then projected onto the target fit it one is designated
-            u = [
-                (self.character, self.ship),
-                self.drones,
-                self.fighters,
-                self.boosters,
-                self.appliedImplants,
-                self.modules
-            ] if not self.isStructure else [
-                # Ensure a restricted set for citadels
-                (self.character, self.ship),
-                self.fighters,
-                self.modules
-            ]
-
-            # Items that are restricted. These items are only run on the local
-            # fit. They are NOT projected onto the target fit. # See issue 354
-            r = [(self.mode,), self.projectedDrones, self.projectedFighters, self.projectedModules]
-
-            # chain unrestricted and restricted into one iterable
-            c = chain.from_iterable(u + r)
-
-            for item in c:
-                # Registering the item about to affect the fit allows us to
-                # track "Affected By" relations correctly
-                if item is not None:
-                    # apply effects locally if this is first time running them on fit
-                    if not self.__calculated:
-                        self.register(item)
-                        item.calculateModifiedAttributes(self, runTime, False)
-
-                    # Run command effects against target fit. We only have to worry about modules
-                    if type == CalcType.COMMAND and item in self.modules:
-                        # Apply the gang boosts to target fit
-                        # targetFit.register(item, origin=self)
-                        item.calculateModifiedAttributes(targetFit, runTime, False, True)
-
-            # pyfalog.debug("Command Bonuses: {}".format(self.commandBonuses))
-
-            # If we are calculating our local or projected fit and have command bonuses, apply them
-            if type != CalcType.COMMAND and self.commandBonuses:
-                self.__runCommandBoosts(runTime)
-
-            # Run projection effects against target fit. Projection effects have been broken out of the main loop,
-            # see GH issue #1081
-            if type == CalcType.PROJECTED and projectionInfo:
-                self.__runProjectionEffects(runTime, targetFit, projectionInfo)
+            with tracing.span("fit.runTime", runTime=runTime):
+                # pyfalog.debug("Run time: {0}", runTime)
+                # Items that are unrestricted. These items are run on the local fit
+                # first and then projected onto the target fit it one is designated
+                u = [
+                    (self.character, self.ship),
+                    self.drones,
+                    self.fighters,
+                    self.boosters,
+                    self.appliedImplants,
+                    self.modules
+                ] if not self.isStructure else [
+                    # Ensure a restricted set for citadels
+                    (self.character, self.ship),
+                    self.fighters,
+                    self.modules
+                ]
+
+                # Items that are restricted. These items are only run on the local
+                # fit. They are NOT projected onto the target fit. # See issue 354
+                r = [(self.mode,), self.projectedDrones, self.projectedFighters, self.projectedModules]
+
+                # chain unrestricted and restricted into one iterable
+                c = chain.from_iterable(u + r)
+
+                for item in c:
+                    # Registering the item about to affect the fit allows us to
+                    # track "Affected By" relations correctly
+                    if item is not None:
+                        # apply effects locally if this is first time running them on fit
+                        if not self.__calculated:
+                            self.register(item)
+                            item.calculateModifiedAttributes(self, runTime, False)
+
+                        # Run command effects against target fit. We only have to worry about modules
+                        if type == CalcType.COMMAND and item in self.modules:
+                            # Apply the gang boosts to target fit
+                            # targetFit.register(item, origin=self)
+                            item.calculateModifiedAttributes(targetFit, runTime, False, True)
+
+                # pyfalog.debug("Command Bonuses: {}".format(self.commandBonuses))
+
+                # If we are calculating our local or projected fit and have command bonuses, apply them
+                if type != CalcType.COMMAND and self.commandBonuses:
+                    with tracing.span("fit.commandBoosts", runTime=runTime):
+                        self.__runCommandBoosts(runTime)
+
+                # Run projection effects against target fit. Projection effects have been broken out of the main loop,
+                # see GH issue #1081
+                if type == CalcType.PROJECTED and projectionInfo:
+                    with tracing.span("fit.projectionEffects", runTime=runTime, amount=projectionInfo.amount):
+                        self.__runProjectionEffects(runTime, targetFit, projectionInfo)
 
         # Recursive command ships (A <-> B) get marked as calculated, which means that they aren't recalced when changing
         # tabs. See GH issue 1193
         if type == CalcType.COMMAND and targetFit in self.commandFits:
-            pyfalog.debug("{} is in the command listing for COMMAND ({}), do not mark self as calculated (recursive)".format(repr(targetFit), repr(self)))
+            pyfalog.debug("{0} is in the command listing for COMMAND ({1}), do not mark self as calculated (recursive)", targetFit, self)
         else:
             self.__calculated = True
 
         # Only apply projected fits if fit it not projected itself.
         if type == CalcType.LOCAL:
-            for fit in self.projectedFits:
-                projInfo = fit.getProjectionInfo(self.ID)
-                if projInfo.active:
-                    if fit == self:
-                        # If doing self projection, no need to run through the recursion process. Simply run the
-                        # projection effects on ourselves
-                        pyfalog.debug("Running self-projection for {0}", repr(self))
-                        for runTime in ("early", "normal", "late"):
-                            self.__runProjectionEffects(runTime, self, projInfo)
-                    else:
-                        fit.calculateModifiedAttributes(self, type=CalcType.PROJECTED)
+            projectedFits = self.projectedFits
+            if projectedFits:
+                with tracing.span("fit.projectedFits"):
+                    for fit in projectedFits:
+                        projInfo = fit.getProjectionInfo(self.ID)
+                        if projInfo.active:
+                            if fit == self:
+                                # If doing self projection, no need to run through the recursion process. Simply run the
+                                # projection effects on ourselves
+                                pyfalog.debug("Running self-projection for {0}", self)
+                                for runTime in ("early", "normal", "late"):
+                                    self.__runProjectionEffects(runTime, self, projInfo)
+                            else:
+                                fit.calculateModifiedAttributes(self, type=CalcType.PROJECTED)
 
         pyfalog.debug('Done with fit calculation')
 
@@ -1472,6 +1503,7 @@ class Fit:
 
         return drains, capUsed, capAdded
 
+    @tracing.traced("fit.capSim")
     def simulateCap(self):
         drains, self.__capUsed, self.__capRecharge = self.__generateDrain()
         self.__capRecharge += self.calculateCapRecharge()
@@ -1524,20 +1556,43 @@ class Fit:
                 rechargeRate=self.ship.getModifiedItemAttrExtended("rechargeRate", ignoreAfflictors=[mod]) / 1000.0)
         return currentRegen - nomodRegen
 
+    def getCapRegenGains(self):
+        """
+        Return how much cap regen we gain from each afflictor of capacitor
+        capacity or recharge rate, for all of them at once
+        """
+        currentRegen = self.calculateCapRecharge()
+        capacities = self.ship.itemModifiedAttributes.getContributions("capacitorCapacity")
+        rechargeRates = self.ship.itemModifiedAttributes.getContributions("rechargeRate")
+        gains = {}
+        for afflictor in chain(capacities, rechargeRates):
+            if afflictor in gains:
+                continue
+            nomodRegen = self.calculateCapRecharge(
+                capacity=capacities.get(afflictor),
+                rechargeRate=rechargeRates[afflictor] / 1000.0 if afflictor in rechargeRates else None)
+            gains[afflictor] = currentRegen - nomodRegen
+        return gains
+
     def getRemoteReps(self, spoolOptions=None):
         if spoolOptions not in self.__remoteRepMap:
-            remoteReps = RRTypes(0, 0, 0, 0)
-
-            for module in self.modules:
-                remoteReps += module.getRemoteReps(spoolOptions=spoolOptions)
-
-            for drone in self.drones:
-                remoteReps += drone.getRemoteReps()
+            remoteReps = RRTypes.sum(chain(
+                (module.getRemoteReps(spoolOptions=spoolOptions) for module in self.modules),
+                (drone.getRemoteReps() for drone in self.drones)))
 
             self.__remoteRepMap[spoolOptions] = remoteReps
 
         return self.__remoteRepMap[spoolOptions]
 
+    def getSpoolCurves(self):
+        """
+        Dps and remote reps of spooling modules over their whole spool-up,
+        see eos.spoolCurves.
+        """
+        if self.__spoolCurves is None:
+            self.__spoolCurves = SpoolCurves(self)
+        return self.__spoolCurves
+
     @property
     def hp(self):
         hp = {}
@@ -1598,6 +1653,7 @@ class Fit:
             self.__effectiveSustainableTank = tank
         return self.__effectiveSustainableTank
 
+    @tracing.traced("fit.sustainableTank")
     def calculateSustainableTank(self):
         if self.__sustainableTank is None:
             sustainable = {
@@ -1750,13 +1806,10 @@ class Fit:
         self.__droneYield = droneYield
         self.__droneDrain = droneDrain
 
+    @tracing.traced("fit.weaponDmgStats")
     def calculateWeaponDmgStats(self, spoolOptions):
-        weaponVolley = DmgTypes.default()
-        weaponDps = DmgTypes.default()
-
-        for mod in self.modules:
-            weaponVolley += mod.getVolley(spoolOptions=spoolOptions)
-            weaponDps += mod.getDps(spoolOptions=spoolOptions)
+        weaponVolley = DmgTypes.sum(mod.getVolley(spoolOptions=spoolOptions) for mod in self.modules)
+        weaponDps = DmgTypes.sum(mod.getDps(spoolOptions=spoolOptions) for mod in self.modules)
 
         weaponVolley.profile = self.targetProfile
         weaponDps.profile = self.targetProfile
@@ -1764,17 +1817,14 @@ class Fit:
         self.__weaponVolleyMap[spoolOptions] = weaponVolley
         self.__weaponDpsMap[spoolOptions] = weaponDps
 
+    @tracing.traced("fit.droneDmgStats")
     def calculateDroneDmgStats(self):
-        droneVolley = DmgTypes.default()
-        droneDps = DmgTypes.default()
-
-        for drone in self.drones:
-            droneVolley += drone.getVolley()
-            droneDps += drone.getDps()
-
-        for fighter in self.fighters:
-            droneVolley += fighter.getVolley()
-            droneDps += fighter.getDps()
+        droneVolley = DmgTypes.sum(chain(
+            (drone.getVolley() for drone in self.drones),
+            (fighter.getVolley() for fighter in self.fighters)))
+        droneDps = DmgTypes.sum(chain(
+            (drone.getDps() for drone in self.drones),
+            (fighter.getDps() for fighter in self.fighters)))
 
         droneVolley.profile = self.targetProfile
         droneDps.profile = self.targetProfile
@@ -542,8 +542,7 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
             return dps
         if self.isBreacher:
             return volleyParams[min(volleyParams)]
-        for volleyValue in volleyParams.values():
-            dps += volleyValue
+        dps = DmgTypes.sum(volleyParams.values())
         dpsFactor = 1 / (avgCycleTime / 1000)
         dps *= dpsFactor
         return dps
@@ -612,11 +611,10 @@ class Module(HandledItem, HandledCharge, ItemAttrShortcut, ChargeAttrShortcut, M
         avgCycleTime = cycleParams.averageTime
         if len(repAmountParams) == 0 or avgCycleTime == 0:
             return rrDuringCycle
-        for rrAmount in repAmountParams.values():
-            rrDuringCycle += rrAmount
+        rrDuringCycle = RRTypes.sum(repAmountParams.values())
         rrFactor = 1 / (avgCycleTime / 1000)
-        rps = rrDuringCycle * rrFactor
-        return rps
+        rrDuringCycle *= rrFactor
+        return rrDuringCycle
 
     def getSpoolData(self, spoolOptions=None):
         weaponMultMax = self.getModifiedItemAttr("damageMultiplierBonusMax", 0)
@@ -0,0 +1,235 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Characters with fixed skill levels that only build and run the skills a fit
+can feel.
+
+A regular Character holds a Skill for every skill in the game and registers
+and runs all their effects for every fit. Most skill effects look like
+
+    fit.modules.filteredItemBoost(lambda mod: mod.item.requiresSkill('Gunnery'), ...)
+
+and can only touch items that require the named skill. Such effects are
+recognized from their handler source, and their skill is only run for fits
+holding an item with that requirement. Skills with any other kind of effect
+run for every fit, like on a regular Character.
+
+Skill objects are created on first use: when a fit needs the skill run, or
+when an effect asks for its level through getSkill(). Skills that aren't in
+the level map behave as untrained.
+
+    char = ProfileCharacter("Malaneve", {3300: 5, 3327: 4})  # skill ID -> level
+    fitA.character = char
+    fitB.character = char  # one character can serve any number of fits
+"""
+
+import ast
+import inspect
+import textwrap
+
+from logbook import Logger
+
+from eos.saveddata.character import Character, Skill
+
+pyfalog = Logger(__name__)
+
+# Calls an effect handler can make without modifying anything
+READ_ONLY_CALLS = frozenset(("getModifiedItemAttr", "getModifiedChargeAttr", "requiresSkill", "get", "getattr", "len", "min", "max", "isType"))
+
+# handler -> frozenset of skill names its modifications are limited to, or
+# None when the handler can modify anything
+_handlerScopes = {}
+# skill ID -> the same, for all passive effects of the skill together
+_skillScopes = {}
+
+
+def _lambdaScope(node):
+    # Skill names of a filter like `lambda mod: mod.item.requiresSkill('A') or ...`
+    if not isinstance(node, ast.Lambda):
+        return None
+    names = set()
+
+    def visit(expr):
+        if isinstance(expr, ast.BoolOp):
+            return all(visit(value) for value in expr.values)
+        if isinstance(expr, ast.Call) and isinstance(expr.func, ast.Attribute) and expr.func.attr == "requiresSkill" \
+                and len(expr.args) == 1 and isinstance(expr.args[0], ast.Constant) and isinstance(expr.args[0].value, str):
+            names.add(expr.args[0].value)
+            return True
+        return False
+
+    return frozenset(names) if visit(node.body) else None
+
+
+def handlerScope(handler):
+    """
+    Skill names an effect handler's modifications are limited to, or None
+    if it can modify items regardless of their skill requirements.
+
+    An empty set means the handler modifies nothing at all. Wrappers (like
+    the effect profiler's) are looked through, so a scope read while
+    profiling is the same one as without.
+    """
+    handler = inspect.unwrap(handler)
+    try:
+        return _handlerScopes[handler]
+    except KeyError:
+        pass
+
+    scope = frozenset()
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(handler)))
+    except (OSError, TypeError, SyntaxError):
+        tree = None
+        scope = None
+
+    if tree is not None:
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if name in READ_ONLY_CALLS:
+                continue
+            if name is not None and name.startswith("filtered") and node.args:
+                filterScope = _lambdaScope(node.args[0])
+                if filterScope is not None:
+                    scope = scope | filterScope
+                    continue
+            scope = None
+            break
+
+    _handlerScopes[handler] = scope
+    return scope
+
+
+def skillScope(item):
+    """
+    Skill names that limit where the passive effects of a skill apply, or
+    None if they can apply to anything.
+    """
+    try:
+        return _skillScopes[item.ID]
+    except KeyError:
+        pass
+
+    scope = frozenset()
+    for effect in item.effects.values():
+        if not effect.isType("passive"):
+            continue
+        effectScope = handlerScope(effect.handler)
+        if effectScope is None:
+            scope = None
+            break
+        scope = scope | effectScope
+
+    _skillScopes[item.ID] = scope
+    return scope
+
+
+def requiredSkillNames(fit):
+    """
+    Names of all skills that the fit's items (and their charges) require
+    directly; these are what requiresSkill() filters match on.
+    """
+    names = set()
+
+    def add(item):
+        if item is not None:
+            for skill in item.requiredSkills:
+                names.add(skill.typeName)
+
+    if fit.ship is not None:
+        add(fit.ship.item)
+    if fit.mode is not None:
+        add(fit.mode.item)
+    for mod in fit.modules:
+        add(mod.item)
+        add(mod.charge)
+    for container in (fit.drones, fit.fighters, fit.implants, fit.boosters):
+        for thing in container:
+            add(thing.item)
+    return frozenset(names)
+
+
+class ProfileCharacter(Character):
+    """
+    Character with a fixed map of skill ID -> level.
+
+    Not meant to be saved; it is built per skill profile and shared by every
+    fit calculated with that profile.
+    """
+
+    def __init__(self, name, levels):
+        Character.__init__(self, name, initSkills=False)
+        self.__levels = dict(levels)
+        self.__materialized = {}
+        # frozenset of required skill names -> skills to run for such fits
+        self.__runLists = {}
+
+    @property
+    def levels(self):
+        return dict(self.__levels)
+
+    @property
+    def materializedCount(self):
+        return len(self.__materialized)
+
+    def getSkill(self, item):
+        if isinstance(item, str):
+            item = Character.getSkillNameMap()[item]
+        elif isinstance(item, int):
+            item = Character.getSkillIDMap()[item]
+
+        skill = self.__materialized.get(item.ID)
+        if skill is None:
+            level = self.__levels.get(item.ID)
+            skill = Skill(self, item, level, False, level is not None)
+            self.addSkill(skill)
+            self.__materialized[item.ID] = skill
+        return skill
+
+    def skillsFor(self, fit):
+        """
+        Skills whose effects can change something on the fit.
+        """
+        required = requiredSkillNames(fit)
+        skills = self.__runLists.get(required)
+        if skills is None:
+            skillMap = Character.getSkillIDMap()
+            skills = []
+            for skillID in self.__levels:
+                item = skillMap.get(skillID)
+                if item is None:
+                    continue
+                scope = skillScope(item)
+                if scope is None or not scope.isdisjoint(required):
+                    skills.append(self.getSkill(item))
+            self.__runLists[required] = skills
+            pyfalog.debug("{0}: {1} of {2} skills apply to {3}", self.savedName, len(skills), len(self.__levels), fit)
+        return skills
+
+    def calculateModifiedAttributes(self, fit, runTime, forceProjected=False):
+        if forceProjected:
+            return
+        for skill in self.skillsFor(fit):
+            fit.register(skill)
+            skill.calculateModifiedAttributes(fit, runTime)
+
+    def __deepcopy__(self, memo):
+        return ProfileCharacter("%s copy" % self.savedName, self.__levels)
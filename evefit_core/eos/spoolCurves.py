@@ -0,0 +1,151 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Dps and remote reps of spooling modules over their whole spool-up.
+
+Fit.getWeaponDps() and Fit.getRemoteReps() aggregate every module again
+for each SpoolOptions they are asked for. Spool only multiplies a module's
+unspooled output by 1 + bonus, so the unspooled dps or reps are read once
+per module and any spool point is a multiplication:
+
+    curves = fit.getSpoolCurves()      # cached until the fit is recalculated
+    curves.timeToFull                  # seconds until everything is spooled
+    curves.weaponDpsAt([0, 10, 60])    # DmgTypes at each time, in seconds
+    curves.remoteRepsAt([0, 10, 60])   # RRTypes
+    for curve in curves.weapons:
+        curve.byCycle()                # one value per cycle until full spool
+
+Values are raw, like Fit.getWeaponDps(); apply a target profile to the
+returned DmgTypes if needed.
+"""
+
+import math
+
+from eos.const import SpoolType
+from eos.utils.float import floatUnerr
+from eos.utils.spoolSupport import SpoolOptions, calculateSpoolup
+from eos.utils.stats import DmgTypes, RRTypes
+
+# Unspooled output is read with this
+NO_SPOOL = SpoolOptions(SpoolType.CYCLES, 0, True)
+
+
+class SpoolCurve:
+    """
+    Output of one spooling module: `base` (DmgTypes dps or RRTypes reps
+    per second, unspooled) times 1 + spool bonus.
+    """
+
+    __slots__ = ("module", "base", "maxBonus", "bonusPerCycle", "cycleTime", "cyclesToFull", "timeToFull")
+
+    def __init__(self, module, base, maxBonus, bonusPerCycle, cycleTime):
+        self.module = module
+        self.base = base
+        self.maxBonus = maxBonus
+        self.bonusPerCycle = bonusPerCycle
+        # Seconds
+        self.cycleTime = cycleTime
+        self.cyclesToFull = math.ceil(floatUnerr(maxBonus / bonusPerCycle))
+        self.timeToFull = self.cyclesToFull * cycleTime
+
+    def multiplier(self, spoolType, spoolAmount):
+        return 1 + calculateSpoolup(self.maxBonus, self.bonusPerCycle, self.cycleTime, spoolType, spoolAmount)[0]
+
+    def at(self, spoolType, amounts):
+        """
+        Output at each spool amount of the given type.
+        """
+        return [self.base * self.multiplier(spoolType, amount) for amount in amounts]
+
+    def atTimes(self, times):
+        return self.at(SpoolType.TIME, times)
+
+    def byCycle(self):
+        """
+        Output after 0, 1, ... cycles, up to full spool.
+        """
+        return self.at(SpoolType.CYCLES, range(self.cyclesToFull + 1))
+
+
+def _moduleCurve(mod, kind):
+    if kind == "dps":
+        maxBonus = mod.getModifiedItemAttr("damageMultiplierBonusMax", 0)
+        bonusPerCycle = mod.getModifiedItemAttr("damageMultiplierBonusPerCycle", 0)
+    else:
+        maxBonus = mod.getModifiedItemAttr("repairMultiplierBonusMax", 0)
+        bonusPerCycle = mod.getModifiedItemAttr("repairMultiplierBonusPerCycle", 0)
+    if not maxBonus or not bonusPerCycle:
+        return None
+    base = mod.getDps(spoolOptions=NO_SPOOL) if kind == "dps" else mod.getRemoteReps(spoolOptions=NO_SPOOL)
+    if not base:
+        return None
+    return SpoolCurve(mod, base, maxBonus, bonusPerCycle, mod.rawCycleTime / 1000)
+
+
+class SpoolCurves:
+    """
+    Spool curves of all spooling weapons and remote repairers of a fit,
+    plus the fit's output that doesn't spool.
+    """
+
+    def __init__(self, fit):
+        self.weapons = []
+        self.remoteRepairers = []
+        steadyDps = []
+        steadyReps = [drone.getRemoteReps() for drone in fit.drones]
+        for mod in fit.modules:
+            curve = _moduleCurve(mod, "dps")
+            if curve is not None:
+                self.weapons.append(curve)
+            else:
+                steadyDps.append(mod.getDps())
+            curve = _moduleCurve(mod, "rr")
+            if curve is not None:
+                self.remoteRepairers.append(curve)
+            else:
+                steadyReps.append(mod.getRemoteReps())
+        # Output of everything else, which spool options don't change
+        self.steadyWeaponDps = DmgTypes.sum(steadyDps)
+        self.steadyRemoteReps = RRTypes.sum(steadyReps)
+
+    def __bool__(self):
+        return bool(self.weapons or self.remoteRepairers)
+
+    @property
+    def timeToFull(self):
+        return max((curve.timeToFull for curve in self.weapons + self.remoteRepairers), default=0)
+
+    def weaponDpsAt(self, times):
+        """
+        Weapon dps of the fit at each time (seconds since spool-up started).
+        """
+        times = list(times)
+        columns = [curve.atTimes(times) for curve in self.weapons]
+        return [
+            DmgTypes.sum((self.steadyWeaponDps, *(column[i] for column in columns)))
+            for i in range(len(times))]
+
+    def remoteRepsAt(self, times):
+        """
+        Remote reps of the fit at each time (seconds since spool-up started).
+        """
+        times = list(times)
+        columns = [curve.atTimes(times) for curve in self.remoteRepairers]
+        return [
+            RRTypes.sum((self.steadyRemoteReps, *(column[i] for column in columns)))
+            for i in range(len(times))]
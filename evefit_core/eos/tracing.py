@@ -0,0 +1,285 @@
+# ===============================================================================
+# This file is part of eos.
+#
+# eos is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# eos is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with eos.  If not, see <http://www.gnu.org/licenses/>.
+# ===============================================================================
+
+"""
+Span tracing for the fit calculation pipeline.
+
+Code marks interesting sections with
+
+    with tracing.span("fit.calc", fitID=fit.ID) as span:
+        ...
+
+When tracing is disabled, span() returns a shared no-op object, so the cost
+is one attribute check and an empty with block. When enabled, nested spans
+form a trace per top-level span; every finished trace is handed to the
+configured exporters. Sampling is decided once per trace.
+
+    from eos import tracing
+
+    ring = tracing.RingBufferExporter(capacity=100)
+    tracing.configure(exporters=[ring, tracing.JsonlExporter("calc.jsonl")], sampleRate=0.1)
+    tracing.enable()
+"""
+
+import functools
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from logbook import Logger
+
+pyfalog = Logger(__name__)
+
+_spanIDs = itertools.count(1)
+
+
+class _NoopSpan:
+    """
+    Stands in for a span when nothing is recorded.
+    """
+
+    __slots__ = ()
+
+    recording = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        return False
+
+    def setAttribute(self, key, value):
+        pass
+
+    def setAttributes(self, **attributes):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledRoot(_NoopSpan):
+    """
+    Root of a trace that was not sampled. Keeps its children from starting
+    traces of their own.
+    """
+
+    __slots__ = ("_local", "_previous")
+
+    def __init__(self, local):
+        self._local = local
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = getattr(self._local, "current", None)
+        self._local.current = self
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        self._local.current = self._previous
+        return False
+
+
+class Span:
+
+    __slots__ = (
+        "name", "traceID", "spanID", "parentID", "attributes", "thread",
+        "startTime", "duration", "error",
+        "_tracer", "_parent", "_trace", "_start",
+    )
+
+    recording = True
+
+    def __init__(self, tracer, name, parent, attributes):
+        self.name = name
+        self.spanID = next(_spanIDs)
+        self.attributes = attributes
+        self.thread = threading.current_thread().name
+        self.startTime = None
+        self.duration = None
+        self.error = None
+        self._tracer = tracer
+        self._parent = parent
+        if parent is None:
+            self.traceID = os.urandom(8).hex()
+            self.parentID = None
+            self._trace = []
+        else:
+            self.traceID = parent.traceID
+            self.parentID = parent.spanID
+            self._trace = parent._trace
+
+    def setAttribute(self, key, value):
+        self.attributes[key] = value
+
+    def setAttributes(self, **attributes):
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        self._tracer._local.current = self
+        self.startTime = time.time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        if exc is not None:
+            self.error = "{}: {}".format(excType.__name__, exc)
+        self._tracer._local.current = self._parent
+        self._trace.append(self)
+        if self._parent is None:
+            self._tracer._export(self._trace)
+        return False
+
+    def toDict(self):
+        return {
+            "name": self.name,
+            "traceID": self.traceID,
+            "spanID": self.spanID,
+            "parentID": self.parentID,
+            "thread": self.thread,
+            "startTime": self.startTime,
+            "durationMs": self.duration * 1000.0 if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Tracer:
+
+    def __init__(self):
+        self.enabled = False
+        self.sampleRate = 1.0
+        self.exporters = []
+        self._local = threading.local()
+
+    def configure(self, exporters=None, sampleRate=None):
+        if exporters is not None:
+            self.exporters = list(exporters)
+        if sampleRate is not None:
+            self.sampleRate = max(0.0, min(1.0, float(sampleRate)))
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return NOOP_SPAN
+
+        parent = getattr(self._local, "current", None)
+        if parent is not None and not parent.recording:
+            return NOOP_SPAN
+        if parent is None and self.sampleRate < 1.0 and random.random() >= self.sampleRate:
+            return _UnsampledRoot(self._local)
+        return Span(self, name, parent, attributes)
+
+    def currentSpan(self):
+        current = getattr(self._local, "current", None)
+        return current if current is not None else NOOP_SPAN
+
+    def _export(self, trace):
+        # Spans are appended as they finish; report them in start order
+        trace.sort(key=lambda s: s.spanID)
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except Exception as e:
+                pyfalog.error("Trace exporter {0} failed: {1}", type(exporter).__name__, e)
+
+
+# Exporters
+
+class RingBufferExporter:
+    """
+    Keeps the most recent traces in memory.
+    """
+
+    def __init__(self, capacity=1000):
+        self.__traces = deque(maxlen=capacity)
+        self.__lock = threading.Lock()
+
+    def export(self, trace):
+        with self.__lock:
+            self.__traces.append(tuple(trace))
+
+    def traces(self):
+        """
+        Stored traces, oldest first. Each trace is a tuple of spans, root first.
+        """
+        with self.__lock:
+            return list(self.__traces)
+
+    def clear(self):
+        with self.__lock:
+            self.__traces.clear()
+
+
+class JsonlExporter:
+    """
+    Appends every finished span to a file, one JSON object per line.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.__lock = threading.Lock()
+
+    def export(self, trace):
+        lines = "".join(json.dumps(span.toDict(), default=str) + "\n" for span in trace)
+        with self.__lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+
+tracer = Tracer()
+
+
+def span(name, **attributes):
+    return tracer.span(name, **attributes)
+
+
+def traced(name):
+    """
+    Decorator: run the function inside a span called `name`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def configure(exporters=None, sampleRate=None):
+    tracer.configure(exporters=exporters, sampleRate=sampleRate)
+
+
+def enable():
+    tracer.enabled = True
+
+
+def disable():
+    tracer.enabled = False
+
+
+def isEnabled():
+    return tracer.enabled
@@ -19,7 +19,6 @@
 
 
 import math
-from collections import defaultdict
 
 from eos.utils.float import floatUnerr
 from utils.repr import makeReprStr
@@ -31,6 +30,8 @@ def _t(x):
 
 class BreacherInfo:
 
+    __slots__ = ("absolute", "relative")
+
     def __init__(self, absolute, relative):
         self.absolute = absolute
         self.relative = relative
@@ -49,122 +50,144 @@ class BreacherInfo:
         return type(self)(absolute=self.absolute / div, relative=self.relative / div)
 
 
+def _scaledBreachers(breachers, factor):
+    # New lists and infos; infos may be shared with other containers
+    if not breachers:
+        return None
+    return {k: [b * factor for b in v] for k, v in breachers.items()}
+
+
+def _mergedBreachers(breachers, other):
+    # Merge `other` into `breachers` (which may be None), returns the result
+    if not other:
+        return breachers
+    if breachers is None:
+        breachers = {}
+    for k, v in other.items():
+        existing = breachers.get(k)
+        if existing is None:
+            breachers[k] = list(v)
+        else:
+            existing.extend(v)
+    return breachers
+
+
 class DmgTypes:
     """
     Container for volley stats, which stores breacher pod data
     in raw form, before application of it to target profile.
+
+    Raw values live in slots; breacher storage is only allocated once a
+    breacher is added. Values with the target profile applied are computed
+    together on first access and cached until the profile or the raw values
+    change. For sums of many containers, use DmgTypes.sum() instead of
+    chaining +.
     """
 
+    __slots__ = ("_em", "_thermal", "_kinetic", "_explosive", "_breachers", "_profile", "_applied")
+
     def __init__(self, em, thermal, kinetic, explosive):
         self._em = em
         self._thermal = thermal
         self._kinetic = kinetic
         self._explosive = explosive
-        self._breachers = defaultdict(lambda: [])
-        self.__profile = None
-        # Cached data
-        self.__cached_em = None
-        self.__cached_thermal = None
-        self.__cached_kinetic = None
-        self.__cached_explosive = None
-        self.__cached_pure = None
-        self.__cached_total = None
+        # None, or breacher key -> list of BreacherInfo
+        self._breachers = None
+        self._profile = None
+        # Cached (em, thermal, kinetic, explosive, pure, total) after profile
+        self._applied = None
 
     @classmethod
     def default(cls):
         return cls(0, 0, 0, 0)
 
+    @classmethod
+    def sum(cls, items):
+        """
+        Sum of many containers, built as one new object. The result has no
+        profile set.
+        """
+        em = thermal = kinetic = explosive = 0
+        breachers = None
+        for item in items:
+            em += item._em
+            thermal += item._thermal
+            kinetic += item._kinetic
+            explosive += item._explosive
+            if item._breachers:
+                breachers = _mergedBreachers(breachers, item._breachers)
+        new = cls(em, thermal, kinetic, explosive)
+        new._breachers = breachers
+        return new
+
     def _clear_cached(self):
-        self.__cached_em = None
-        self.__cached_thermal = None
-        self.__cached_kinetic = None
-        self.__cached_explosive = None
-        self.__cached_pure = None
-        self.__cached_total = None
+        self._applied = None
 
     def add_breacher(self, key, data):
-        self._breachers[key].append(data)
+        if self._breachers is None:
+            self._breachers = {}
+        self._breachers.setdefault(key, []).append(data)
+        self._applied = None
 
     @property
     def profile(self):
-        return self.__profile
+        return self._profile
 
     @profile.setter
     def profile(self, profile):
-        self.__profile = profile
-        self._clear_cached()
+        self._profile = profile
+        self._applied = None
+
+    def _apply(self):
+        profile = self._profile
+        if profile is None:
+            em, thermal, kinetic, explosive = self._em, self._thermal, self._kinetic, self._explosive
+        else:
+            em = self._em * (1 - getattr(profile, "emAmount", 0))
+            thermal = self._thermal * (1 - getattr(profile, "thermalAmount", 0))
+            kinetic = self._kinetic * (1 - getattr(profile, "kineticAmount", 0))
+            explosive = self._explosive * (1 - getattr(profile, "explosiveAmount", 0))
+        if not self._breachers:
+            pure = 0
+        elif profile is None:
+            pure = sum(
+                max((b.absolute for b in bs), default=0)
+                for bs in self._breachers.values())
+        else:
+            hp = getattr(profile, "hp", math.inf)
+            pure = sum(
+                max((min(b.absolute, b.relative * hp) for b in bs), default=0)
+                for bs in self._breachers.values())
+        applied = self._applied = (em, thermal, kinetic, explosive, pure, em + thermal + kinetic + explosive + pure)
+        return applied
 
     @property
     def em(self):
-        if self.__cached_em is not None:
-            return self.__cached_em
-        dmg = self._em
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "emAmount", 0)
-        self.__cached_em = dmg
-        return dmg
+        return (self._applied or self._apply())[0]
 
     @property
     def thermal(self):
-        if self.__cached_thermal is not None:
-            return self.__cached_thermal
-        dmg = self._thermal
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "thermalAmount", 0)
-        self.__cached_thermal = dmg
-        return dmg
+        return (self._applied or self._apply())[1]
 
     @property
     def kinetic(self):
-        if self.__cached_kinetic is not None:
-            return self.__cached_kinetic
-        dmg = self._kinetic
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "kineticAmount", 0)
-        self.__cached_kinetic = dmg
-        return dmg
+        return (self._applied or self._apply())[2]
 
     @property
     def explosive(self):
-        if self.__cached_explosive is not None:
-            return self.__cached_explosive
-        dmg = self._explosive
-        if self.profile is not None:
-            dmg *= 1 - getattr(self.profile, "explosiveAmount", 0)
-        self.__cached_explosive = dmg
-        return dmg
+        return (self._applied or self._apply())[3]
 
     @property
     def pure(self):
-        if self.__cached_pure is not None:
-            return self.__cached_pure
-        if self.profile is None:
-            dmg = sum(
-                max((b.absolute for b in bs), default=0)
-                for bs in self._breachers.values())
-        else:
-            dmg = sum(
-                max((min(b.absolute, b.relative * getattr(self.profile, "hp", math.inf)) for b in bs), default=0)
-                for bs in self._breachers.values())
-        self.__cached_pure = dmg
-        return dmg
+        return (self._applied or self._apply())[4]
 
     @property
     def total(self):
-        if self.__cached_total is not None:
-            return self.__cached_total
-        dmg = self.em + self.thermal + self.kinetic + self.explosive + self.pure
-        self.__cached_total = dmg
-        return dmg
+        return (self._applied or self._apply())[5]
 
     # Iterator is needed to support tuple-style unpacking
     def __iter__(self):
-        yield self.em
-        yield self.thermal
-        yield self.kinetic
-        yield self.explosive
-        yield self.pure
-        yield self.total
+        return iter(self._applied or self._apply())
 
     def __eq__(self, other):
         if not isinstance(other, DmgTypes):
@@ -176,7 +199,7 @@ class DmgTypes:
                 floatUnerr(self._thermal) == floatUnerr(other._thermal) and
                 floatUnerr(self._kinetic) == floatUnerr(other._kinetic) and
                 floatUnerr(self._explosive) == floatUnerr(other._explosive) and
-                sorted(self._breachers) == sorted(other._breachers) and
+                sorted(self._breachers or ()) == sorted(other._breachers or ()) and
                 self.profile == other.profile)
 
     def __add__(self, other):
@@ -185,11 +208,9 @@ class DmgTypes:
             thermal=self._thermal + other._thermal,
             kinetic=self._kinetic + other._kinetic,
             explosive=self._explosive + other._explosive)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k].extend(v)
-        for k, v in other._breachers.items():
-            new._breachers[k].extend(v)
+        new._profile = self._profile
+        if self._breachers or other._breachers:
+            new._breachers = _mergedBreachers(_mergedBreachers(None, self._breachers), other._breachers)
         return new
 
     def __iadd__(self, other):
@@ -197,9 +218,9 @@ class DmgTypes:
         self._thermal += other._thermal
         self._kinetic += other._kinetic
         self._explosive += other._explosive
-        for k, v in other._breachers.items():
-            self._breachers[k].extend(v)
-        self._clear_cached()
+        if other._breachers:
+            self._breachers = _mergedBreachers(self._breachers, other._breachers)
+        self._applied = None
         return self
 
     def __mul__(self, mul):
@@ -208,9 +229,8 @@ class DmgTypes:
             thermal=self._thermal * mul,
             kinetic=self._kinetic * mul,
             explosive=self._explosive * mul)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k] = [b * mul for b in v]
+        new._profile = self._profile
+        new._breachers = _scaledBreachers(self._breachers, mul)
         return new
 
     def __imul__(self, mul):
@@ -220,10 +240,8 @@ class DmgTypes:
         self._thermal *= mul
         self._kinetic *= mul
         self._explosive *= mul
-        for v in self._breachers.values():
-            for b in v:
-                b *= mul
-        self._clear_cached()
+        self._breachers = _scaledBreachers(self._breachers, mul)
+        self._applied = None
         return self
 
     def __truediv__(self, div):
@@ -232,20 +250,26 @@ class DmgTypes:
             thermal=self._thermal / div,
             kinetic=self._kinetic / div,
             explosive=self._explosive / div)
-        new.profile = self.profile
-        for k, v in self._breachers.items():
-            new._breachers[k] = [b / div for b in v]
+        new._profile = self._profile
+        if self._breachers:
+            new._breachers = {k: [b / div for b in v] for k, v in self._breachers.items()}
+        return new
+
+    def __deepcopy__(self, memo):
+        new = type(self)(self._em, self._thermal, self._kinetic, self._explosive)
+        new._profile = self._profile
+        new._breachers = _scaledBreachers(self._breachers, 1)
         return new
 
     def __bool__(self):
         return any((
             self._em, self._thermal, self._kinetic, self._explosive,
-            any(b.absolute or b.relative for b in self._breachers)))
+            any(b.absolute or b.relative for bs in (self._breachers or {}).values() for b in bs)))
 
     def __repr__(self):
         class_name = type(self).__name__
         return (f'<{class_name}(em={self._em}, thermal={self._thermal}, kinetic={self._kinetic}, '
-                f'explosive={self._explosive}, breachers={len(self._breachers)})>')
+                f'explosive={self._explosive}, breachers={len(self._breachers or ())})>')
 
     @staticmethod
     def names(short=None, postProcessor=None, includePure=False):
@@ -263,12 +287,27 @@ class DmgTypes:
 class RRTypes:
     """Container for tank data stats."""
 
+    __slots__ = ("shield", "armor", "hull", "capacitor")
+
     def __init__(self, shield, armor, hull, capacitor):
         self.shield = shield
         self.armor = armor
         self.hull = hull
         self.capacitor = capacitor
 
+    @classmethod
+    def sum(cls, items):
+        """
+        Sum of many containers, built as one new object.
+        """
+        shield = armor = hull = capacitor = 0
+        for item in items:
+            shield += item.shield
+            armor += item.armor
+            hull += item.hull
+            capacitor += item.capacitor
+        return cls(shield, armor, hull, capacitor)
+
     # Iterator is needed to support tuple-style unpacking
     def __iter__(self):
         yield self.shield
@@ -313,7 +352,7 @@ class RRTypes:
 
     def __imul__(self, mul):
         if mul == 1:
-            return
+            return self
         self.shield *= mul
         self.armor *= mul
         self.hull *= mul
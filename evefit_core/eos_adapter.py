@@ -0,0 +1,846 @@
+# evefit_core/eos_adapter.py
+"""
+Adapter between the app's fits and the bundled eos engine.
+
+Fits are parsed with FitParser, built as plain in-memory eos objects and
+calculated; nothing is ever added to the saved data session, flushed or
+committed. Saved data is pointed at an in-memory database before eos is
+first imported, so eos never opens the user's pyfa database either.
+
+    adapter = EosAdapter()            # needs evefit_core/eve.db
+    stats = adapter.evaluate(fit, skills)
+
+eos isn't thread-safe (items and their gamedata sessions are shared), so
+every eos call runs on one dedicated thread. Run several processes for
+parallel evaluation, see evefit_core.prefork.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from evefit_core.fit_models import Fit, FitStats, SkillProfile
+from evefit_core.fit_parser import FitParser, ParsedFit
+from evefit_core.skills import MAX_SKILL_LEVEL, SkillProfileRepository, get_skill_repository
+from evefit_core.type_index import (
+    CATEGORY_CHARGE,
+    CATEGORY_DRONE,
+    CATEGORY_FIGHTER,
+    CATEGORY_IMPLANT,
+    CATEGORY_MODULE,
+    CATEGORY_SHIP,
+    CATEGORY_SKILL,
+    CATEGORY_STRUCTURE,
+    CATEGORY_STRUCTURE_MODULE,
+    CATEGORY_SUBSYSTEM,
+    DEFAULT_GAMEDATA,
+    TypeIndex,
+)
+
+# eos is vendored and imported as a top-level package
+EOS_PARENT = Path(__file__).resolve().parent
+
+# (layer, attribute prefix) of the ship's resonance attributes
+_RESIST_LAYERS = (("Shield", "shield"), ("Armor", "armor"), ("Hull", ""))
+_DAMAGE_TYPES = (("EM", "Em"), ("Therm", "Thermal"), ("Kin", "Kinetic"), ("Expl", "Explosive"))
+
+# Skill profiles whose eos character is kept around
+MAX_CHARACTERS = 32
+
+# Categories of the items load() reads up front: everything a fit can hold,
+# and skills for the characters
+PRELOAD_CATEGORIES = (
+    CATEGORY_SHIP,
+    CATEGORY_MODULE,
+    CATEGORY_CHARGE,
+    CATEGORY_SKILL,
+    CATEGORY_DRONE,
+    CATEGORY_IMPLANT,
+    CATEGORY_SUBSYSTEM,
+    CATEGORY_STRUCTURE,
+    CATEGORY_STRUCTURE_MODULE,
+    CATEGORY_FIGHTER,
+)
+
+
+class EosUnavailable(RuntimeError):
+    """
+    eos or its gamedata can't be loaded.
+    """
+
+
+def read_gamedata_version(path: Union[str, Path] = DEFAULT_GAMEDATA) -> Optional[str]:
+    """
+    Client build of a gamedata database, without importing eos. None when
+    there is no usable database at `path`.
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT field_value FROM metadata WHERE field_name LIKE 'client_build'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return None
+    return str(row[0]) if row else None
+
+
+def load_eos(gamedata_path: Union[str, Path] = DEFAULT_GAMEDATA):
+    """
+    Import eos with in-memory saved data and the given gamedata, load the
+    DB schemes and effects, and return eos.db.
+
+    The connection strings only take effect if eos.db hasn't been imported
+    yet in this process.
+    """
+    if str(EOS_PARENT) not in sys.path:
+        sys.path.insert(0, str(EOS_PARENT))
+
+    try:
+        import eos.config
+
+        if "eos.db" not in sys.modules:
+            eos.config.saveddata_connectionstring = "sqlite:///:memory:"
+            eos.config.gamedata_connectionstring = "sqlite:///" + str(Path(gamedata_path).resolve())
+
+        import eos.db
+
+        eos.db.initialize()
+        import eos.effects  # noqa: F401
+    except ImportError as e:
+        raise EosUnavailable(f"eos can't be imported: {e}") from e
+
+    if eos.db.getGamedataVersion() is None:
+        raise EosUnavailable(f"no usable gamedata at {eos.config.gamedata_connectionstring}")
+    return eos.db
+
+
+def release_db_connections() -> None:
+    """
+    Close pooled eos database connections, if eos is loaded.
+
+    SQLite connections must not be used on both sides of a fork. Loaded
+    gamedata objects stay attached to their sessions; each process opens
+    fresh connections when it next needs one. An in-memory saved data
+    database lives in the connection itself, so that one is left alone.
+    """
+    db = sys.modules.get("eos.db")
+    if db is None:
+        return
+
+    import eos.config
+
+    # The gamedata session never has changes, and doesn't expire its
+    # objects on commit; committing just hands the connection back.
+    for session in list(db.gamedata_sessions.values()):
+        session.commit()
+    db.gamedata_engine.dispose()
+
+    connectionString = eos.config.saveddata_connectionstring
+    if connectionString is not None and connectionString != "sqlite:///:memory:":
+        with db.sd_lock:
+            db.saveddata_session.commit()
+        db.saveddata_engine.dispose()
+
+
+class EosAdapter:
+    """
+    Evaluates fits with eos.
+
+    eos is imported on first use (or in load()). Every method that touches
+    eos objects runs on the adapter's eos thread.
+
+    Each skill profile becomes one eos ProfileCharacter, shared by all fits
+    evaluated with that profile. It only creates and runs the skills that
+    can affect the fit at hand.
+    """
+
+    def __init__(
+        self,
+        gamedata_path: Union[str, Path] = DEFAULT_GAMEDATA,
+        index: Optional[TypeIndex] = None,
+        skill_repository: Optional[SkillProfileRepository] = None,
+    ) -> None:
+        self.gamedata_path = Path(gamedata_path)
+        self.gamedata_version = read_gamedata_version(self.gamedata_path)
+        if self.gamedata_version is None:
+            raise EosUnavailable(f"no usable gamedata at {self.gamedata_path}")
+
+        self.index = index
+        self.skill_repository = skill_repository if skill_repository is not None else get_skill_repository()
+        self._db = None
+        self._items: Dict[int, object] = {}
+        self._skill_names: Optional[Dict[str, object]] = None
+        self._preloaded = False
+        # (profile name, skill digest) -> (ProfileCharacter, unknown skills)
+        self._characters: OrderedDict[Tuple[str, str], Tuple[object, int]] = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def load(self) -> None:
+        """
+        Import eos, build the type index and read all fittable items with
+        their attributes, effects and effect handlers, plus the skill maps
+        the characters use, now instead of on first use.
+
+        Called before a PreforkEngine forks, so the workers share all of it
+        instead of each loading the items its fits happen to need.
+        """
+        self._run(self._load, True)
+
+    def calc_settings(self) -> Dict[str, object]:
+        """
+        eos settings that change the numbers.
+        """
+        if str(EOS_PARENT) not in sys.path:
+            sys.path.insert(0, str(EOS_PARENT))
+        import eos.config
+
+        return dict(eos.config.settings)
+
+    def evaluate(self, fit: Fit, skills: SkillProfile) -> FitStats:
+        parsed, digest = self._prepare(fit, skills)
+        return self._run(self._evaluate, parsed, skills, digest)
+
+    def damage_table(
+        self, fit: Fit, skills: SkillProfile, include_user_profiles: bool = False
+    ) -> List[Tuple[str, Dict[str, float]]]:
+        """
+        Damage of the fit against every target profile: the ideal target,
+        all built-in profiles and optionally the user's pyfa profiles.
+
+        Returns (profile name, stats) pairs; the stats are weapon, drone,
+        fighter and total dps and volley (see eos.damageMatrix.STAT_NAMES).
+        """
+        parsed, digest = self._prepare(fit, skills)
+        return self._run(self._damage_table, parsed, skills, digest, include_user_profiles)
+
+    def ehp_table(
+        self, fits: List[Fit], skills: SkillProfile, include_user_patterns: bool = False
+    ) -> Tuple[List[str], List[List[float]]]:
+        """
+        Total EHP of each fit against every damage pattern (built-in ones,
+        optionally also the user's pyfa patterns).
+
+        Returns (pattern names, one row of EHP values per fit).
+        """
+        prepared = [self._prepare(fit, skills) for fit in fits]
+        return self._run(self._ehp_table, prepared, skills, include_user_patterns)
+
+    def applied_dps_table(
+        self,
+        fit: Fit,
+        skills: SkillProfile,
+        distances: List[float],
+        include_user_profiles: bool = False,
+        transversal: float = 1.0,
+        samples: Optional[int] = None,
+    ) -> List[Tuple[str, List[float]]]:
+        """
+        Applied dps of the fit against every target profile (see
+        damage_table()) at each distance, with turret tracking and missile
+        explosion application against the profile's speed, signature and
+        radius.
+
+        `transversal` is the share of the target's speed that is
+        perpendicular to the line of fire. With `samples`, turret damage
+        is averaged over that many random shots instead of the expected
+        value.
+        """
+        parsed, digest = self._prepare(fit, skills)
+        return self._run(
+            self._applied_dps_table, parsed, skills, digest, list(distances),
+            include_user_profiles, transversal, samples)
+
+    def range_curves(
+        self, fits: List[Fit], skills: SkillProfile, distances: List[float], signature_radii: List[float]
+    ) -> List[Dict[str, object]]:
+        """
+        Range curves of each fit over the same distances (meters): total
+        dps, remote rep HP/s and per-module curves, plus lock time (seconds)
+        against each signature radius.
+
+        Per-module curves are (kind, type name, values) with kind one of
+        "weapon", "drone", "remote_reps", "remote_capacitor" and "ewar";
+        ewar values are the share of full strength.
+        """
+        prepared = [self._prepare(fit, skills) for fit in fits]
+        return self._run(self._range_curves, prepared, skills, list(distances), list(signature_radii))
+
+    def spool_curves(self, fit: Fit, skills: SkillProfile, times: List[float]) -> Dict[str, object]:
+        """
+        Weapon dps and remote rep HP/s of the fit at each time (seconds
+        since spool-up started), and per spooling module its values after
+        each cycle until full spool.
+
+        Per-module entries are (kind, type name, time to full spool, values
+        by cycle) with kind "weapon" or "remote_reps".
+        """
+        parsed, digest = self._prepare(fit, skills)
+        return self._run(self._spool_curves, parsed, skills, digest, list(times))
+
+    def damage_timeline(
+        self,
+        fit: Fit,
+        skills: SkillProfile,
+        duration_ms: float = 60000,
+        step_ms: float = 1000,
+        burst_ms: float = 10000,
+        target_profile: Optional[str] = None,
+    ) -> Dict[str, object]:
+        """
+        Damage the fit deals over `duration_ms`, starting with every weapon
+        activated at once and spooling weapons cold.
+
+        Returns "times" and "dealt" (sampled every `step_ms`), "sustained_dps"
+        and "max_burst", the most damage within any `burst_ms`. Damage is raw
+        unless a target profile is named (see damage_table()).
+        """
+        parsed, digest = self._prepare(fit, skills)
+        return self._run(
+            self._damage_timeline, parsed, skills, digest, duration_ms, step_ms, burst_ms, target_profile)
+
+    def duel(
+        self,
+        fit_a: Fit,
+        skills_a: SkillProfile,
+        fit_b: Fit,
+        skills_b: SkillProfile,
+        distance_m: float,
+        max_seconds: float = 600,
+        transversal: float = 1.0,
+    ) -> Dict[str, object]:
+        """
+        Simulate fit_a fighting fit_b at a fixed distance (see eos.duel).
+
+        Returns "winner" (0 for fit_a, 1 for fit_b, None if both survive
+        max_seconds), "time" the fight lasted, and per side "kill_times",
+        "cap_out_times" (None when cap stable) and HP "traces".
+        """
+        parsed_a, digest_a = self._prepare(fit_a, skills_a)
+        parsed_b, digest_b = self._prepare(fit_b, skills_b)
+        return self._run(
+            self._duel, (parsed_a, skills_a, digest_a), (parsed_b, skills_b, digest_b),
+            distance_m, max_seconds, transversal)
+
+    def fleet_member_stats(
+        self,
+        members: List[Tuple[Fit, SkillProfile]],
+        booster: Optional[Tuple[Fit, SkillProfile]] = None,
+        include_user_profiles: bool = False,
+        spool_scale: Optional[float] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        Stats of each (fit, skills) pair for fleet totals (see
+        evefit_core.fleet), every fit under the booster's command bursts
+        if one is given. The booster is calculated once for all of them.
+
+        Each result has "profiles" with "dps" and "volley" against each
+        (see damage_table()), "ehp" per layer, "remote_reps" ("shield",
+        "armor", "hull" HP/s and "capacitor" GJ/s), "miner_yield" and
+        "drone_yield" (m3/s), "cap_stable" and "cap_state" (stable percent,
+        or seconds until empty). `spool_scale` (0 to 1) sets how far
+        spooling modules are spooled up; None uses the eos setting.
+        """
+        prepared = [(*self._prepare(fit, skills), skills) for fit, skills in members]
+        booster_prepared = None
+        if booster is not None:
+            booster_prepared = (*self._prepare(*booster), booster[1])
+        return self._run(
+            self._fleet_member_stats, prepared, booster_prepared, include_user_profiles, spool_scale)
+
+    def before_fork(self) -> None:
+        """
+        Release database connections and stop the eos thread, so a fork
+        doesn't copy either. Both come back on next use, on each side.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.submit(release_db_connections).result()
+            executor.shutdown(wait=True)
+        else:
+            release_db_connections()
+
+    # ------------------------------------------------------------------ #
+    # Internals; everything after _run() runs on the eos thread
+    # ------------------------------------------------------------------ #
+
+    def _type_index(self) -> TypeIndex:
+        with self._lock:
+            if self.index is None:
+                self.index = TypeIndex.from_gamedata(self.gamedata_path)
+            return self.index
+
+    def _prepare(self, fit: Fit, skills: SkillProfile) -> Tuple[ParsedFit, str]:
+        # Parsing doesn't need eos, so it happens on the calling thread
+        parsed = next(iter(FitParser(self._type_index()).parse_text(fit.eft_text)), None)
+        if parsed is None:
+            raise ValueError("no EFT fit found")
+        if parsed.ship_type_id is None:
+            raise ValueError(f"unknown ship {parsed.ship_type!r}")
+        # Profiles are compiled once; stored profiles have their digest cached
+        return parsed, self.skill_repository.digest(skills)
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eos")
+            executor = self._executor
+        return executor.submit(fn, *args).result()
+
+    def _load(self, preload: bool = False):
+        if self._db is None:
+            self._db = load_eos(self.gamedata_path)
+        self._type_index()
+        if preload and not self._preloaded:
+            self._preload()
+        return self._db
+
+    def _preload(self) -> None:
+        from sqlalchemy.orm import contains_eager, selectinload
+
+        from eos.db import get_gamedata_session
+        from eos.gamedata import Group, Item
+        from eos.saveddata.profileCharacter import skillScope
+
+        # Three queries for all items, not three per item
+        items = (
+            get_gamedata_session()
+            .query(Item)
+            .join(Item.group)
+            .options(contains_eager(Item.group), selectinload(Item._Item__attributes), selectinload(Item.effects))
+            .filter(Group.categoryID.in_(PRELOAD_CATEGORIES))
+            .all()
+        )
+        for item in items:
+            self._items[item.ID] = item
+            for effect in item.effects.values():
+                # Generates the handler from eos.effects
+                effect.handler
+            # Resolves the required skill items, for ProfileCharacter.skillsFor
+            item.requiredSkills
+
+        skill_names = self._skill_names_map()
+        for item in skill_names.values():
+            skillScope(item)
+        self._preloaded = True
+
+    def _calculate(self, parsed: ParsedFit, skills: SkillProfile, digest: str):
+        """
+        Build and calculate an eos fit; returns (fit, unknown skills,
+        skipped items).
+        """
+        self._load()
+        character, unknown_skills = self._character(skills, digest)
+        eos_fit, skipped = self._build_fit(parsed, character)
+        eos_fit.clear()
+        eos_fit.calculateModifiedAttributes()
+        # How many drones fly depends on calculated skills and bandwidth
+        if self._launch_drones(eos_fit):
+            eos_fit.clear()
+            eos_fit.calculateModifiedAttributes()
+        return eos_fit, unknown_skills, skipped
+
+    def _evaluate(self, parsed: ParsedFit, skills: SkillProfile, digest: str) -> FitStats:
+        eos_fit, unknown_skills, skipped = self._calculate(parsed, skills, digest)
+        stats = self._read_stats(eos_fit)
+        stats.misc["unknown_skills"] = float(unknown_skills)
+        stats.misc["skipped_items"] = float(skipped + len(parsed.issues))
+        return stats
+
+    def _damage_table(
+        self, parsed: ParsedFit, skills: SkillProfile, digest: str, include_user_profiles: bool
+    ) -> List[Tuple[str, Dict[str, float]]]:
+        from eos.damageMatrix import DamageMatrix, ProfileColumns
+
+        eos_fit, _, _ = self._calculate(parsed, skills, digest)
+        columns = ProfileColumns.all() if include_user_profiles else ProfileColumns.builtins()
+        return [(profile.fullName, row) for profile, row in DamageMatrix(eos_fit, columns).rows()]
+
+    def _ehp_table(
+        self, prepared: List[Tuple[ParsedFit, str]], skills: SkillProfile, include_user_patterns: bool
+    ) -> Tuple[List[str], List[List[float]]]:
+        from eos.resistMatrix import PatternColumns, ResistMatrix
+
+        columns = PatternColumns.all() if include_user_patterns else PatternColumns.builtins()
+        rows = []
+        for parsed, digest in prepared:
+            eos_fit, _, _ = self._calculate(parsed, skills, digest)
+            rows.append(ResistMatrix.fromShip(eos_fit.ship).totalEhp(columns))
+        return [pattern.fullName for pattern in columns.patterns], rows
+
+    def _applied_dps_table(
+        self,
+        parsed: ParsedFit,
+        skills: SkillProfile,
+        digest: str,
+        distances: List[float],
+        include_user_profiles: bool,
+        transversal: float,
+        samples: Optional[int],
+    ) -> List[Tuple[str, List[float]]]:
+        from eos.application import ApplicationTable
+        from eos.damageMatrix import ProfileColumns
+
+        eos_fit, _, _ = self._calculate(parsed, skills, digest)
+        columns = ProfileColumns.all() if include_user_profiles else ProfileColumns.builtins()
+        table = ApplicationTable(eos_fit, columns, distances, transversal=transversal, samples=samples)
+        return [(profile.fullName, dps) for profile, dps in table.rows()]
+
+    def _range_curves(
+        self,
+        prepared: List[Tuple[ParsedFit, str]],
+        skills: SkillProfile,
+        distances: List[float],
+        signature_radii: List[float],
+    ) -> List[Dict[str, object]]:
+        from eos.rangeCurves import RangeCurves, lockTimeCurve
+
+        results = []
+        for parsed, digest in prepared:
+            eos_fit, _, _ = self._calculate(parsed, skills, digest)
+            curves = RangeCurves(eos_fit, distances)
+            modules = []
+            for kind, entries in (
+                ("weapon", curves.weaponDps),
+                ("drone", curves.droneDps),
+                ("remote_reps", curves.remoteReps),
+                ("remote_capacitor", curves.remoteCapacitor),
+                ("ewar", curves.ewar),
+            ):
+                modules.extend((kind, item.item.name, values) for item, values in entries)
+            results.append({
+                "distances": distances,
+                "dps": curves.totalDps(),
+                "remote_reps": curves.totalRemoteReps(),
+                "modules": modules,
+                "signature_radii": signature_radii,
+                "lock_time": lockTimeCurve(eos_fit, signature_radii),
+            })
+        return results
+
+    def _spool_curves(
+        self, parsed: ParsedFit, skills: SkillProfile, digest: str, times: List[float]
+    ) -> Dict[str, object]:
+        eos_fit, _, _ = self._calculate(parsed, skills, digest)
+        curves = eos_fit.getSpoolCurves()
+        modules = [
+            ("weapon", curve.module.item.name, curve.timeToFull, [dps.total for dps in curve.byCycle()])
+            for curve in curves.weapons]
+        modules.extend(
+            ("remote_reps", curve.module.item.name, curve.timeToFull,
+             [reps.shield + reps.armor + reps.hull for reps in curve.byCycle()])
+            for curve in curves.remoteRepairers)
+        return {
+            "times": times,
+            "time_to_full": curves.timeToFull,
+            "weapon_dps": [dps.total for dps in curves.weaponDpsAt(times)],
+            "remote_reps": [reps.shield + reps.armor + reps.hull for reps in curves.remoteRepsAt(times)],
+            "modules": modules,
+        }
+
+    def _damage_timeline(
+        self,
+        parsed: ParsedFit,
+        skills: SkillProfile,
+        digest: str,
+        duration_ms: float,
+        step_ms: float,
+        burst_ms: float,
+        target_profile: Optional[str],
+    ) -> Dict[str, object]:
+        from eos.damageMatrix import allTargetProfiles
+        from eos.damageTimeline import DamageTimeline
+
+        profile = None
+        if target_profile is not None:
+            profile = next((p for p in allTargetProfiles() if p.fullName == target_profile), None)
+            if profile is None:
+                raise ValueError(f"unknown target profile {target_profile!r}")
+
+        eos_fit, _, _ = self._calculate(parsed, skills, digest)
+        timeline = DamageTimeline(eos_fit, profile)
+        times, dealt = timeline.dealtOverTime(duration_ms, step_ms)
+        burst, burst_start = timeline.maxBurst(burst_ms, duration_ms)
+        return {
+            "times": times,
+            "dealt": dealt,
+            "sustained_dps": timeline.sustainedDps,
+            "max_burst": burst,
+            "max_burst_start": burst_start,
+        }
+
+    def _duel(
+        self,
+        side_a: Tuple[ParsedFit, SkillProfile, str],
+        side_b: Tuple[ParsedFit, SkillProfile, str],
+        distance_m: float,
+        max_seconds: float,
+        transversal: float,
+    ) -> Dict[str, object]:
+        from eos.duel import simulateDuel
+
+        eos_fit_a, _, _ = self._calculate(*side_a)
+        eos_fit_b, _, _ = self._calculate(*side_b)
+        result = simulateDuel(eos_fit_a, eos_fit_b, distance_m, maxTime=max_seconds, transversal=transversal)
+        return {
+            "winner": result.winner,
+            "time": result.time,
+            "kill_times": result.killTimes,
+            "cap_out_times": result.capOutTimes,
+            "traces": result.traces,
+        }
+
+    def _fleet_member_stats(
+        self,
+        prepared: List[Tuple[ParsedFit, str, SkillProfile]],
+        booster_prepared: Optional[Tuple[ParsedFit, str, SkillProfile]],
+        include_user_profiles: bool,
+        spool_scale: Optional[float],
+    ) -> List[Dict[str, object]]:
+        from eos.const import SpoolType
+        from eos.damageMatrix import ProfileColumns
+        from eos.fleetStats import MemberStats, applyCommandBoosts
+        from eos.utils.spoolSupport import SpoolOptions
+
+        columns = ProfileColumns.all() if include_user_profiles else ProfileColumns.builtins()
+        spool = None if spool_scale is None else SpoolOptions(SpoolType.SPOOL_SCALE, spool_scale, True)
+        booster = None
+        if booster_prepared is not None:
+            parsed, digest, skills = booster_prepared
+            booster, _, _ = self._calculate(parsed, skills, digest)
+
+        results = []
+        for parsed, digest, skills in prepared:
+            if booster is None:
+                eos_fit, _, _ = self._calculate(parsed, skills, digest)
+            else:
+                self._load()
+                character, _ = self._character(skills, digest)
+                eos_fit, _ = self._build_fit(parsed, character)
+                applyCommandBoosts(eos_fit, booster)
+                if self._launch_drones(eos_fit):
+                    applyCommandBoosts(eos_fit, booster)
+            stats = MemberStats(eos_fit, columns, spool)
+            results.append({
+                "profiles": stats.profiles,
+                "dps": stats.dps,
+                "volley": stats.volley,
+                "ehp": stats.ehp,
+                "remote_reps": {
+                    "shield": stats.remoteReps.shield,
+                    "armor": stats.remoteReps.armor,
+                    "hull": stats.remoteReps.hull,
+                    "capacitor": stats.remoteReps.capacitor,
+                },
+                "miner_yield": stats.minerYield,
+                "drone_yield": stats.droneYield,
+                "cap_stable": stats.capStable,
+                "cap_state": stats.capState,
+            })
+        return results
+
+    def _item(self, type_id: int):
+        item = self._items.get(type_id)
+        if item is None:
+            item = self._db.getItem(type_id)
+            if item is None:
+                raise ValueError(f"unknown type ID {type_id}")
+            self._items[type_id] = item
+        return item
+
+    def _character(self, skills: SkillProfile, digest: str):
+        """
+        Shared eos character for a skill profile; returns (character, number
+        of skill names not found in gamedata).
+        """
+        from eos.saveddata.profileCharacter import ProfileCharacter
+
+        key = (skills.name, digest)
+        cached = self._characters.get(key)
+        if cached is not None:
+            self._characters.move_to_end(key)
+            return cached
+
+        skill_names = self._skill_names_map()
+        levels: Dict[int, int] = {}
+        unknown = 0
+        for name, level in skills.skills.items():
+            item = skill_names.get(name.casefold())
+            if item is None:
+                unknown += 1
+                continue
+            levels[item.ID] = max(0, min(MAX_SKILL_LEVEL, int(level)))
+
+        cached = self._characters[key] = (ProfileCharacter(skills.name, levels), unknown)
+        while len(self._characters) > MAX_CHARACTERS:
+            self._characters.popitem(last=False)
+        return cached
+
+    def _skill_names_map(self) -> Dict[str, object]:
+        """
+        Case-folded skill name -> skill item. Also fills the skill maps of
+        eos.saveddata.character.Character that ProfileCharacter reads.
+        """
+        from eos.saveddata.character import Character
+
+        if self._skill_names is None:
+            Character.getSkillIDMap()
+            self._skill_names = {name.casefold(): item for name, item in Character.getSkillNameMap().items()}
+        return self._skill_names
+
+    def _build_fit(self, parsed: ParsedFit, character):
+        """
+        Transient eos fit for a parsed fit; returns (fit, items skipped).
+        """
+        from eos.const import FittingModuleState
+        from eos.saveddata.booster import Booster
+        from eos.saveddata.cargo import Cargo
+        from eos.saveddata.citadel import Citadel
+        from eos.saveddata.drone import Drone
+        from eos.saveddata.fighter import Fighter
+        from eos.saveddata.fit import Fit as EosFit
+        from eos.saveddata.implant import Implant
+        from eos.saveddata.module import Module
+        from eos.saveddata.ship import Ship
+
+        ship_item = self._item(parsed.ship_type_id)
+        try:
+            ship = Ship(ship_item)
+        except ValueError:
+            ship = Citadel(ship_item)
+
+        fit = EosFit(ship, parsed.name)
+        fit.character = character
+        skipped = 0
+
+        for entry in parsed.items:
+            if entry.type_id is None:
+                skipped += 1
+                continue
+            item = self._item(entry.type_id)
+            try:
+                if entry.kind == "module":
+                    for _ in range(entry.quantity):
+                        mod = self._module(Module, item, entry)
+                        if entry.charge_id is not None:
+                            charge = self._item(entry.charge_id)
+                            if mod.isValidCharge(charge):
+                                mod.charge = charge
+                        if entry.offline:
+                            mod.state = FittingModuleState.OFFLINE
+                        elif mod.isValidState(FittingModuleState.ACTIVE):
+                            mod.state = FittingModuleState.ACTIVE
+                        fit.modules.append(mod)
+                elif entry.kind == "drone":
+                    drone = Drone(item)
+                    drone.amount = entry.quantity
+                    # Launched once the fit is calculated, see _launch_drones
+                    drone.amountActive = 0
+                    fit.drones.append(drone)
+                elif entry.kind == "fighter":
+                    fighter = Fighter(item)
+                    fighter.amount = entry.quantity
+                    fit.fighters.append(fighter)
+                elif entry.kind == "implant":
+                    fit.implants.append(Implant(item))
+                elif entry.kind == "booster":
+                    fit.boosters.append(Booster(item))
+                else:
+                    cargo = Cargo(item)
+                    cargo.amount = entry.quantity
+                    fit.cargo.append(cargo)
+            except ValueError:
+                # eos rejected the item for this kind of slot
+                skipped += 1
+
+        return fit, skipped
+
+    def _launch_drones(self, fit) -> bool:
+        """
+        Launch the drones of a calculated fit in bay order, as many as the
+        character's max active drones and the ship's drone bandwidth allow.
+        Returns whether any drone was launched; the fit then needs to be
+        calculated again.
+        """
+        slots = int(fit.extraAttributes["maxActiveDrones"])
+        bandwidth = fit.ship.getModifiedItemAttr("droneBandwidth") or 0
+        launched = False
+        for drone in fit.drones:
+            count = min(drone.amount, slots)
+            used = drone.getModifiedItemAttr("droneBandwidthUsed") or 0
+            if used > 0:
+                count = min(count, int(round(bandwidth, 6) // round(used, 6)))
+            drone.amountActive = max(0, count)
+            slots -= drone.amountActive
+            bandwidth -= drone.amountActive * used
+            launched = launched or drone.amountActive > 0
+        return launched
+
+    def _module(self, Module, item, entry):
+        mutation = entry.mutation
+        if mutation is None or mutation.result_id is None or mutation.mutaplasmid_id is None:
+            return Module(item)
+
+        mutaplasmid = self._db.getMutaplasmid(mutation.mutaplasmid_id)
+        mod = Module(self._item(mutation.result_id), baseItem=item, mutaplasmid=mutaplasmid)
+        for mutator in mod.mutators.values():
+            value = mutation.attributes.get(mutator.attribute.name)
+            if value is not None:
+                mutator.value = value
+        return mod
+
+    def _read_stats(self, fit) -> FitStats:
+        ship = fit.ship
+        layers_ehp = fit.ehp
+        weapon_dps = fit.getWeaponDps().total
+        drone_dps = fit.getDroneDps().total
+        cap_stable = bool(fit.capStable)
+
+        resist_profile = {}
+        for layer, prefix in _RESIST_LAYERS:
+            for short, damage in _DAMAGE_TYPES:
+                attr = f"{prefix}{damage}DamageResonance" if prefix else f"{damage.lower()}DamageResonance"
+                resonance = ship.getModifiedItemAttr(attr)
+                if resonance is not None:
+                    resist_profile[f"{layer} {short}"] = (1.0 - resonance) * 100.0
+
+        misc = {
+            "shield_ehp": float(layers_ehp["shield"]),
+            "armor_ehp": float(layers_ehp["armor"]),
+            "hull_ehp": float(layers_ehp["hull"]),
+            "weapon_dps": float(weapon_dps),
+            "drone_dps": float(drone_dps),
+            "cap_capacity": float(ship.getModifiedItemAttr("capacitorCapacity") or 0.0),
+            "max_speed": float(fit.maxSpeed or 0.0),
+            "align_time": float(fit.alignTime),
+            "signature_radius": float(ship.getModifiedItemAttr("signatureRadius") or 0.0),
+            "max_target_range": float(fit.maxTargetRange or 0.0),
+            "max_targets": float(fit.maxTargets),
+        }
+        if cap_stable:
+            misc["cap_stable_percent"] = float(fit.capState)
+
+        return FitStats(
+            ehp=float(sum(layers_ehp.values())),
+            dps=float(weapon_dps + drone_dps),
+            volley=float(fit.getTotalVolley().total),
+            cap_stable=cap_stable,
+            cap_lasts_seconds=None if cap_stable else float(fit.capState),
+            resist_profile=resist_profile,
+            misc=misc,
+        )
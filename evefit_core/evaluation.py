@@ -0,0 +1,238 @@
+# evefit_core/evaluation.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from evefit_core.fit_canon import EftFormatError, fit_fingerprint
+from evefit_core.fit_engine import FitEngine
+from evefit_core.fit_models import EvaluatedFit, Fit, FitStats, SkillProfile
+from evefit_core.skills import SkillProfileRepository, get_skill_repository
+
+# (fit content hash, skill profile hash, gamedata version, settings hash)
+EvalKey = Tuple[str, str, str, str]
+
+
+def fit_content_hash(fit: Fit) -> str:
+    """
+    Canonical fingerprint of the fit's contents, so the same fit pasted with
+    lines in another order or under another name shares cached results.
+    Text that isn't EFT falls back to a hash of its non-blank lines.
+    """
+    try:
+        return fit_fingerprint(fit)
+    except EftFormatError:
+        pass
+
+    h = hashlib.sha1()
+    for line in fit.eft_text.splitlines():
+        line = line.strip()
+        if line:
+            h.update(line.encode("utf-8"))
+            h.update(b"\n")
+    return h.hexdigest()
+
+
+def settings_hash(settings: Dict[str, object]) -> str:
+    """
+    Stable hash of engine settings.
+    """
+    encoded = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache(Protocol):
+    """
+    What FitEvaluator needs from a result cache.
+    """
+
+    def get(self, key: EvalKey) -> Optional[FitStats]: ...
+
+    def peek(self, key: EvalKey) -> Optional[FitStats]: ...
+
+    def peek_many(self, keys: List[EvalKey]) -> Dict[EvalKey, FitStats]: ...
+
+    def put(self, key: EvalKey, stats: FitStats) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class EvaluationCache:
+    """
+    Thread-safe, size-bounded in-memory LRU cache of evaluation results.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[EvalKey, FitStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: EvalKey) -> Optional[FitStats]:
+        with self._lock:
+            stats = self._entries.get(key)
+            if stats is not None:
+                self._entries.move_to_end(key)
+            return stats
+
+    def peek(self, key: EvalKey) -> Optional[FitStats]:
+        """
+        Like get(), but doesn't count as a use for eviction.
+        """
+        with self._lock:
+            return self._entries.get(key)
+
+    def peek_many(self, keys: List[EvalKey]) -> Dict[EvalKey, FitStats]:
+        """
+        peek() for many keys; only the ones found are returned.
+        """
+        with self._lock:
+            found = {}
+            for key in keys:
+                stats = self._entries.get(key)
+                if stats is not None:
+                    found[key] = stats
+            return found
+
+    def put(self, key: EvalKey, stats: FitStats) -> None:
+        with self._lock:
+            self._entries[key] = stats
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FitEvaluator:
+    """
+    Runs FitEngine evaluations on a worker pool, backed by a result cache.
+
+    Results are cached by (fit content hash, skill profile hash, gamedata
+    version, engine settings hash). Identical requests that are already queued or running share
+    one future. Requests that haven't started yet can be dropped with
+    cancel_pending(), e.g. when the user moves on to another fit.
+    """
+
+    def __init__(
+        self,
+        engine: FitEngine,
+        cache: Optional[ResultCache] = None,
+        max_workers: Optional[int] = None,
+        skill_repository: Optional[SkillProfileRepository] = None,
+    ) -> None:
+        self.engine = engine
+        self.cache = cache if cache is not None else EvaluationCache()
+        self.skill_repository = skill_repository if skill_repository is not None else get_skill_repository()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fit-eval")
+        self._in_flight: Dict[EvalKey, Future] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def key_for(self, fit: Fit, skills: SkillProfile) -> EvalKey:
+        return (
+            fit_content_hash(fit),
+            self.skill_repository.digest(skills),
+            str(self.engine.gamedata_version),
+            settings_hash(self.engine.calc_settings()),
+        )
+
+    def cached(self, fit: Fit, skills: SkillProfile) -> Optional[EvaluatedFit]:
+        """
+        Cached result for this fit and profile, without evaluating.
+        """
+        stats = self.cache.peek(self.key_for(fit, skills))
+        if stats is None:
+            return None
+        return EvaluatedFit(fit=fit, stats=stats, skill_profile=skills)
+
+    def cached_many(self, fits: List[Fit], skills: SkillProfile) -> Dict[str, FitStats]:
+        """
+        Cached stats of many fits with one profile, by fit id, looked up in
+        one batch. Fits without cached stats are left out. Hashes every
+        fit, so run it off the UI thread for large libraries.
+        """
+        skill_digest = self.skill_repository.digest(skills)
+        version = str(self.engine.gamedata_version)
+        settings = settings_hash(self.engine.calc_settings())
+        keys = {fit.id: (fit_content_hash(fit), skill_digest, version, settings) for fit in fits}
+        found = self.cache.peek_many(list(set(keys.values())))
+        return {fit_id: found[key] for fit_id, key in keys.items() if key in found}
+
+    def evaluate(self, fit: Fit, skills: SkillProfile) -> EvaluatedFit:
+        """
+        Evaluate synchronously, going through the cache.
+        """
+        key = self.key_for(fit, skills)
+        stats = self.cache.get(key)
+        if stats is None:
+            return self._run(key, fit, skills)
+        return EvaluatedFit(fit=fit, stats=stats, skill_profile=skills)
+
+    def submit(self, fit: Fit, skills: SkillProfile) -> "Future[EvaluatedFit]":
+        """
+        Evaluate on the worker pool.
+
+        Cache hits return an already completed future.
+        """
+        key = self.key_for(fit, skills)
+
+        stats = self.cache.get(key)
+        if stats is not None:
+            future: Future = Future()
+            future.set_result(EvaluatedFit(fit=fit, stats=stats, skill_profile=skills))
+            return future
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None and not future.cancelled():
+                return future
+            future = self._executor.submit(self._run, key, fit, skills)
+            self._in_flight[key] = future
+
+        # Outside the lock: the callback runs right away if the worker
+        # already finished, and _forget takes the lock itself.
+        future.add_done_callback(lambda _f, _key=key: self._forget(_key, _f))
+        return future
+
+    def cancel_pending(self) -> int:
+        """
+        Cancel all requests that haven't started running yet.
+
+        Returns the number of cancelled requests. Running evaluations
+        finish normally and still land in the cache.
+        """
+        with self._lock:
+            futures = list(self._in_flight.values())
+        return sum(1 for future in futures if future.cancel())
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.cancel_pending()
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _run(self, key: EvalKey, fit: Fit, skills: SkillProfile) -> EvaluatedFit:
+        evaluated = self.engine.evaluate_fit(fit, skills)
+        self.cache.put(key, evaluated.stats)
+        return evaluated
+
+    def _forget(self, key: EvalKey, future: Future) -> None:
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
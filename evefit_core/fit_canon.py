@@ -0,0 +1,208 @@
+# evefit_core/fit_canon.py
+"""
+Canonical form and fingerprints of EFT fits.
+
+Two EFT blocks describe the same fit if they contain the same items in the
+same sections, whatever order the lines within a section are in. Whitespace,
+blank lines, comments, empty-slot placeholders and the fit name don't count.
+Offline markers may be spelled any way ("/offline", " /OFFLINE").
+
+    canon = canonicalize(fit.eft_text)
+    canon.fingerprint()                   # offline modules count as different
+    canon.fingerprint(ignore_state=True)  # same hardware, whatever its state
+
+    index = FingerprintIndex(fits)
+    twin = index.find(new_fit)            # an identical fit already stored, or None
+
+The EFT is read with fit_parser.read_eft(). Without gamedata, slots are
+named by section position in standard EFT order (low, med, high, rig, then
+"other"); of the sections holding "Name xN" lines, the first counts as the
+drone bay and the rest as cargo. Pass `slot_of` to canonicalize() to get
+module slots from real type data instead; fit_fingerprint() does so with the
+process-wide TypeIndex whenever gamedata is installed, so a module counts the
+same whether or not "[Empty Low slot]" lines keep it in its rack.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from evefit_core.fit_models import Fit
+from evefit_core.fit_parser import EftFormatError, MutationSpec, read_eft
+from evefit_core.type_index import get_type_index
+
+ONLINE = "online"
+OFFLINE = "offline"
+
+# Slot of modules in racks past the standard four (T3 subsystems, services)
+OTHER_SLOT = "other"
+
+
+@dataclass(frozen=True, order=True)
+class CanonicalEntry:
+    slot: str
+    type_name: str
+    # "" when there is no charge
+    charge: str
+    state: str
+
+
+@dataclass(frozen=True)
+class CanonicalFit:
+    ship_type: str
+    # Sorted (entry, count) pairs
+    entries: Tuple[Tuple[CanonicalEntry, int], ...]
+
+    def fingerprint(self, ignore_state: bool = False) -> str:
+        """
+        Stable hex digest of the fit's contents.
+
+        With ignore_state, a module counts the same online or offline.
+        """
+        counts: Dict[Tuple[str, str, str, str], int] = {}
+        for entry, count in self.entries:
+            key = (
+                entry.slot,
+                entry.type_name.casefold(),
+                entry.charge.casefold(),
+                ONLINE if ignore_state else entry.state,
+            )
+            counts[key] = counts.get(key, 0) + count
+
+        h = hashlib.sha1()
+        h.update(self.ship_type.casefold().encode("utf-8"))
+        for key in sorted(counts):
+            h.update(b"\n")
+            h.update("\t".join(key).encode("utf-8"))
+            h.update(b"\t%d" % counts[key])
+        return h.hexdigest()
+
+
+def _mutation_name(mutation: MutationSpec) -> str:
+    # A mutated module is its own type: "Name {mutaplasmid; attr value, ...}"
+    pairs = ", ".join(f"{name} {value:g}" for name, value in sorted(mutation.attributes.items()))
+    return "{} {{{}; {}}}".format(" ".join(mutation.result_name.split()), " ".join(mutation.mutaplasmid.split()), pairs)
+
+
+def canonicalize(
+    eft_text: str,
+    slot_of: Optional[Callable[[str], Optional[str]]] = None,
+) -> CanonicalFit:
+    """
+    Parse an EFT block into its canonical form.
+
+    `slot_of` maps a module's type name to its slot; when it returns None
+    (or isn't given) the slot is taken from the line's section. Bays keep
+    their section, so a module carried as cargo stays cargo.
+    """
+    parsed = read_eft(eft_text)
+
+    counts: Dict[CanonicalEntry, int] = {}
+    for item in parsed.items:
+        if item.kind == "module":
+            slot = slot_of(item.name) if slot_of is not None else None
+            slot = slot or item.slot or OTHER_SLOT
+        else:
+            # Without type data this is "drone" for the first counted
+            # section and "cargo" for the rest
+            slot = item.kind
+        type_name = _mutation_name(item.mutation) if item.mutation is not None else item.name
+        state = OFFLINE if item.offline else ONLINE
+        entry = CanonicalEntry(slot, type_name, item.charge or "", state)
+        counts[entry] = counts.get(entry, 0) + item.quantity
+
+    return CanonicalFit(ship_type=parsed.ship_type, entries=tuple(sorted(counts.items())))
+
+
+# Keyed on the gamedata version as well as the text: slots come from the
+# type index, so a new gamedata must not reuse fingerprints computed with the
+# old one. Large enough for a whole library with both state modes.
+@lru_cache(maxsize=1 << 16)
+def _text_fingerprint(eft_text: str, ignore_state: bool, gamedata_version: Optional[str]) -> str:
+    index = get_type_index()
+    slot_of = index.slot_of if index is not None else None
+    return canonicalize(eft_text, slot_of).fingerprint(ignore_state)
+
+
+def fit_fingerprint(fit: Fit, ignore_state: bool = False) -> str:
+    """
+    Fingerprint of a fit's EFT text, with slots from gamedata when it's
+    installed. Raises EftFormatError for text that isn't EFT.
+    """
+    index = get_type_index()
+    return _text_fingerprint(fit.eft_text, ignore_state, index.version if index is not None else None)
+
+
+class FingerprintIndex:
+    """
+    Finds fits with identical contents, by fingerprint.
+
+    Fits whose EFT text doesn't parse are never reported as duplicates.
+    """
+
+    def __init__(self, fits: Optional[Iterable[Fit]] = None, ignore_state: bool = False) -> None:
+        self.ignore_state = ignore_state
+        self._by_fingerprint: Dict[str, List[Fit]] = {}
+        for fit in fits or ():
+            self.add(fit)
+
+    def __len__(self) -> int:
+        return sum(len(fits) for fits in self._by_fingerprint.values())
+
+    def _fingerprint(self, fit: Fit) -> Optional[str]:
+        try:
+            return fit_fingerprint(fit, self.ignore_state)
+        except EftFormatError:
+            return None
+
+    def add(self, fit: Fit) -> Optional[Fit]:
+        """
+        Add a fit; returns an already indexed fit with the same contents.
+        """
+        fingerprint = self._fingerprint(fit)
+        if fingerprint is None:
+            return None
+        same = self._by_fingerprint.setdefault(fingerprint, [])
+        twin = same[0] if same else None
+        same.append(fit)
+        return twin
+
+    def remove(self, fit: Fit) -> None:
+        fingerprint = self._fingerprint(fit)
+        same = self._by_fingerprint.get(fingerprint)
+        if not same:
+            return
+        same[:] = [f for f in same if f is not fit and f.id != fit.id]
+        if not same:
+            del self._by_fingerprint[fingerprint]
+
+    def replace(self, old: Fit, new: Fit) -> None:
+        self.remove(old)
+        self.add(new)
+
+    def find(self, fit: Fit) -> Optional[Fit]:
+        """
+        An indexed fit, other than `fit` itself, with the same contents.
+        """
+        fingerprint = self._fingerprint(fit)
+        for other in self._by_fingerprint.get(fingerprint, ()):
+            if other is not fit:
+                return other
+        return None
+
+    def duplicate_groups(self) -> List[List[Fit]]:
+        """
+        Groups of two or more fits with the same contents, in insertion order.
+        """
+        return [list(fits) for fits in self._by_fingerprint.values() if len(fits) > 1]
+
+
+def dedupe(fits: Iterable[Fit], ignore_state: bool = False) -> List[Fit]:
+    """
+    The fits without repeats; the first of each group of identical fits is kept.
+    """
+    index = FingerprintIndex(ignore_state=ignore_state)
+    return [fit for fit in fits if index.add(fit) is None]
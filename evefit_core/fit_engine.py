@@ -2,30 +2,69 @@
 
 from __future__ import annotations
 
-from typing import List
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
+from evefit_core.eos_adapter import EosAdapter, EosUnavailable, read_gamedata_version, release_db_connections
+from evefit_core.fit_canon import EftFormatError, canonicalize
 from evefit_core.fit_models import Fit, SkillProfile, FitStats, EvaluatedFit
+from evefit_core.type_index import DEFAULT_GAMEDATA
 
 
 class FitEngine:
     """
-    Simple, skill-aware fit engine.
+    Skill-aware fit engine.
 
-    Right now this uses a deliberately simple formula:
+    With gamedata (evefit_core/eve.db) fits are calculated by eos, through
+    EosAdapter. Without it, a deliberately simple placeholder formula is
+    used, so the app still works for development:
 
-    - Count modules (non-empty, non-header lines).
+    - Count fitted items (drones and cargo by quantity, charges not at all).
     - Sum all skill levels.
     - Use those as multipliers for some base numbers.
-
-    The goal is NOT realism yet, but:
-      - deterministic behavior,
-      - visible effect of skills,
-      - a clean API we can later wire to real EVE data / services.
     """
 
-    def __init__(self) -> None:
-        # In the future we might keep cache, ship data, etc. here.
-        pass
+    # gamedata_version of the placeholder formula. Part of every evaluation
+    # cache key, so bump it when the formula changes.
+    PLACEHOLDER_VERSION = "placeholder-2"
+
+    def __init__(self, gamedata_path: Union[str, Path] = DEFAULT_GAMEDATA, use_eos: bool = True) -> None:
+        self.adapter: Optional[EosAdapter] = None
+        if use_eos and read_gamedata_version(gamedata_path) is not None:
+            self.adapter = EosAdapter(gamedata_path)
+
+        # Identifies the data the numbers are based on; part of every
+        # evaluation cache key
+        if self.adapter is not None:
+            self.gamedata_version = f"eos-{self.adapter.gamedata_version}"
+        else:
+            self.gamedata_version = self.PLACEHOLDER_VERSION
+
+    def warm_up(self) -> None:
+        """
+        Load whatever the engine needs up front, so the first evaluation
+        isn't slower than the rest. Long-lived processes call this at start.
+        """
+        if self.adapter is not None:
+            self.adapter.load()
+
+    def before_fork(self) -> None:
+        """
+        Called before the process forks workers (see evefit_core.prefork).
+        """
+        if self.adapter is not None:
+            self.adapter.before_fork()
+        else:
+            release_db_connections()
+
+    def calc_settings(self) -> Dict[str, object]:
+        """
+        Engine settings that change the numbers. Part of every evaluation
+        cache key, next to gamedata_version.
+        """
+        if self.adapter is not None:
+            return self.adapter.calc_settings()
+        return {}
 
     # ------------------------------------------------------------------ #
     # Public API
@@ -35,12 +74,57 @@ class FitEngine:
         """
         Calculate stats for the given fit + skill profile.
         """
-        module_lines: List[str] = [
-            ln.strip()
-            for ln in fit.eft_text.splitlines()
-            if ln.strip() and not ln.strip().startswith("[")
-        ]
-        module_count = len(module_lines)
+        if self.adapter is not None:
+            stats = self.adapter.evaluate(fit, skills)
+            return EvaluatedFit(fit=fit, stats=stats, skill_profile=skills)
+        return EvaluatedFit(fit=fit, stats=self._placeholder_stats(fit, skills), skill_profile=skills)
+
+    def duel(
+        self,
+        fit_a: Fit,
+        skills_a: SkillProfile,
+        fit_b: Fit,
+        skills_b: SkillProfile,
+        distance_m: float,
+        max_seconds: float = 600,
+    ) -> Dict[str, object]:
+        """
+        Simulate two fits fighting each other (see EosAdapter.duel). Needs
+        gamedata; the placeholder formula has nothing to simulate.
+        """
+        if self.adapter is None:
+            raise EosUnavailable("duels need eos gamedata")
+        return self.adapter.duel(fit_a, skills_a, fit_b, skills_b, distance_m, max_seconds=max_seconds)
+
+    def fleet_member_stats(
+        self,
+        members: List[Tuple[Fit, SkillProfile]],
+        booster: Optional[Tuple[Fit, SkillProfile]] = None,
+        include_user_profiles: bool = False,
+        spool_scale: Optional[float] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        Per-fit stats for fleet totals (see EosAdapter.fleet_member_stats
+        and evefit_core.fleet). Needs gamedata.
+        """
+        if self.adapter is None:
+            raise EosUnavailable("fleet stats need eos gamedata")
+        return self.adapter.fleet_member_stats(
+            members, booster, include_user_profiles=include_user_profiles, spool_scale=spool_scale)
+
+    def _placeholder_stats(self, fit: Fit, skills: SkillProfile) -> FitStats:
+        # Counted from the canonical form, so that fits with the same
+        # fingerprint (and thus the same cache key) get the same numbers
+        try:
+            canon = canonicalize(fit.eft_text)
+            module_count = sum(count for _, count in canon.entries)
+        except EftFormatError:
+            module_lines: List[str] = [
+                ln.strip()
+                for ln in fit.eft_text.splitlines()
+                if ln.strip() and not ln.strip().startswith("[")
+            ]
+            module_count = len(module_lines)
 
         total_skill_levels = sum(level for level in skills.skills.values())
 
@@ -71,7 +155,7 @@ class FitEngine:
             "skill_levels": float(total_skill_levels),
         }
 
-        stats = FitStats(
+        return FitStats(
             ehp=ehp,
             dps=dps,
             volley=volley,
@@ -80,5 +164,3 @@ class FitEngine:
             resist_profile=resist_profile,
             misc=misc,
         )
-
-        return EvaluatedFit(fit=fit, stats=stats, skill_profile=skills)
@@ -0,0 +1,176 @@
+# evefit_core/fit_index.py
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from evefit_core.fit_models import Fit
+from evefit_core.fit_parser import eft_type_names
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase word tokens.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def fit_tokens(fit: Fit) -> FrozenSet[str]:
+    """
+    All search tokens of a fit: its name, ship and item names.
+    """
+    tokens: Set[str] = set(tokenize(fit.name))
+    tokens.update(tokenize(fit.ship_type))
+    for item_name in eft_type_names(fit.eft_text):
+        tokens.update(tokenize(item_name))
+    return frozenset(tokens)
+
+
+class FitSearchIndex:
+    """
+    In-memory inverted index over fit name, ship and item names.
+
+    A query matches a fit if every query token is a prefix of at least one
+    of the fit's tokens, so results narrow naturally while typing.
+
+    Results are returned in insertion order; `replace` keeps a fit's
+    position. When a query extends the previous one, only the previous
+    results are re-checked instead of consulting the whole index.
+    """
+
+    def __init__(self, fits: Iterable[Fit] = ()) -> None:
+        self._next_doc = 0
+        self._docs: Dict[int, Fit] = {}
+        self._doc_of: Dict[int, int] = {}
+        self._doc_tokens: Dict[int, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+
+        self._last_query: Optional[str] = None
+        self._last_docs: Optional[List[int]] = None
+
+        for fit in fits:
+            self.add(fit)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # ------------------------------------------------------------------ #
+    # Maintenance
+    # ------------------------------------------------------------------ #
+
+    def add(self, fit: Fit) -> None:
+        doc = self._next_doc
+        self._next_doc += 1
+        self._index(doc, fit)
+
+    def remove(self, fit: Fit) -> None:
+        doc = self._doc_of.get(id(fit))
+        if doc is None:
+            return
+        self._unindex(doc)
+        del self._docs[doc]
+
+    def replace(self, old: Fit, new: Fit) -> None:
+        """
+        Swap `old` for `new`, keeping its position in the results.
+        """
+        doc = self._doc_of.get(id(old))
+        if doc is None:
+            self.add(new)
+            return
+        self._unindex(doc)
+        self._index(doc, new)
+
+    # ------------------------------------------------------------------ #
+    # Query
+    # ------------------------------------------------------------------ #
+
+    def search(self, query: str) -> List[Fit]:
+        query = query.strip().lower()
+        terms = tokenize(query)
+
+        if not terms:
+            docs = list(self._docs)
+        elif (
+            self._last_docs is not None
+            and self._last_query
+            and query.startswith(self._last_query)
+        ):
+            docs = [d for d in self._last_docs if self._matches(d, terms)]
+        else:
+            docs = self._lookup(terms)
+
+        self._last_query = query
+        self._last_docs = docs
+        return [self._docs[d] for d in docs]
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _index(self, doc: int, fit: Fit) -> None:
+        tokens = fit_tokens(fit)
+        self._docs[doc] = fit
+        self._doc_of[id(fit)] = doc
+        self._doc_tokens[doc] = tokens
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is None:
+                self._postings[token] = {doc}
+                self._sorted_tokens = None
+            else:
+                posting.add(doc)
+        self._reset_query_cache()
+
+    def _unindex(self, doc: int) -> None:
+        fit = self._docs[doc]
+        self._doc_of.pop(id(fit), None)
+        for token in self._doc_tokens.pop(doc, ()):
+            posting = self._postings[token]
+            posting.discard(doc)
+            if not posting:
+                del self._postings[token]
+                self._sorted_tokens = None
+        self._reset_query_cache()
+
+    def _reset_query_cache(self) -> None:
+        self._last_query = None
+        self._last_docs = None
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+
+        docs: Set[int] = set()
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            docs |= self._postings[tokens[i]]
+            i += 1
+        return docs
+
+    def _lookup(self, terms: List[str]) -> List[int]:
+        # Longer terms match fewer tokens, so start with them to shrink
+        # the candidate set as early as possible.
+        result: Optional[Set[int]] = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            docs = self._prefix_docs(term)
+            result = docs if result is None else result & docs
+            if not result:
+                return []
+        return sorted(result)
+
+    def _matches(self, doc: int, terms: List[str]) -> bool:
+        tokens = self._doc_tokens[doc]
+        for term in terms:
+            if term in tokens:
+                continue
+            if not any(token.startswith(term) for token in tokens):
+                return False
+        return True
+
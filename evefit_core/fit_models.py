@@ -1,7 +1,7 @@
 # evefit_core/fit_models.py
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -60,3 +60,47 @@ class EvaluatedFit:
     fit: Fit
     stats: FitStats
     skill_profile: SkillProfile
+
+
+@dataclass
+class FleetMember:
+    """
+    One fit flown by `count` pilots with the same skills.
+    """
+    fit: Fit
+    skills: SkillProfile
+    count: int = 1
+
+
+@dataclass
+class Fleet:
+    """
+    Fits flown together, optionally under one booster's command bursts.
+
+    The booster only gives bonuses; list it as a member too for its own
+    stats to count.
+    """
+    members: List[FleetMember]
+    booster: Optional[FleetMember] = None
+
+
+@dataclass
+class FleetStats:
+    """
+    Aggregate stats of a fleet.
+
+    dps and volley map target profile names to the whole fleet's damage.
+    ehp is per layer (shield, armor, hull); remote_reps is shield, armor
+    and hull HP/s and capacitor GJ/s; mining is yield in m3/s from
+    "modules", "drones" and in "total". cap has one entry per member, in
+    fleet order.
+    """
+    pilots: int
+    unique_fits: int
+    dps: Dict[str, float]
+    volley: Dict[str, float]
+    ehp: float
+    ehp_layers: Dict[str, float]
+    remote_reps: Dict[str, float]
+    mining: Dict[str, float]
+    cap: List[Dict[str, object]]
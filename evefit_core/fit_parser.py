@@ -0,0 +1,553 @@
+# evefit_core/fit_parser.py
+"""
+Streaming parser for EFT blocks, ship DNA and dumps of many fits.
+
+Fits are yielded one at a time as soon as they are complete, so files with
+tens of thousands of fits never have to be held in memory:
+
+    parser = FitParser(get_type_index())
+    for parsed in parser.parse_file("killmails.txt"):
+        if parsed.issues:
+            for issue in parsed.issues:
+                print(f"line {issue.line}: {issue.message}: {issue.text}")
+        fit = parsed.to_fit()
+
+A dump is any mix of EFT blocks (each starting at its "[Ship, Name]"
+header) and DNA lines ("587:2881;3:31718;1::"). All names are resolved
+through one TypeIndex; lines that can't be resolved are reported with their
+line number and left out of the fit. Without an index (no gamedata) EFT
+still parses, but types stay unresolved and kinds and slots are guessed
+from the section layout. DNA needs an index for names.
+
+read_eft() reads the single block of a fit's eft_text; fingerprints
+(fit_canon), the daemon and the benchmarks read EFT through it, and the
+search index through eft_type_names(), so there is one reading of EFT.
+"""
+
+from __future__ import annotations
+
+import re
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from evefit_core.fit_models import Fit
+from evefit_core.type_index import TypeIndex, TypeInfo
+
+# Module racks in the order EFT lists them
+RACK_ORDER = ("low", "med", "high", "rig")
+# Section order when writing EFT
+EFT_SLOT_ORDER = ("low", "med", "high", "rig", "subsystem", "service")
+EFT_BAY_ORDER = ("drone", "fighter", "implant", "booster", "cargo")
+# Placeholders written for empty racks, so the racks after them keep their place
+EFT_EMPTY_SLOTS = {
+    "low": "[Empty Low slot]",
+    "med": "[Empty Med slot]",
+    "high": "[Empty High slot]",
+    "rig": "[Empty Rig slot]",
+    "subsystem": "[Empty Subsystem slot]",
+    "service": "[Empty Service slot]",
+}
+
+_COUNT_RE = re.compile(r"^(.*\S)\s+x(\d+)$", re.IGNORECASE)
+_OFFLINE_RE = re.compile(r"\s*/\s*offline$", re.IGNORECASE)
+_MUTATION_REF_RE = re.compile(r"^(.*\S)\s+\[(\d+)\]$")
+_MUTATION_DEF_RE = re.compile(r"^\[(\d+)\]\s+(.+)$")
+_EMPTY_SLOT_RE = re.compile(r"^\[empty .* slot\]$", re.IGNORECASE)
+_DNA_RE = re.compile(r"^(?:fitting:|dna:)?(\d+(?::\d+_?(?:;\d+)?)*):+$", re.IGNORECASE)
+_COMMENT_PREFIXES = ("#", "//")
+
+Line = Tuple[int, str]
+
+
+class EftFormatError(ValueError):
+    """
+    The text isn't an EFT block.
+    """
+
+
+@dataclass
+class ParseIssue:
+    line: int
+    text: str
+    message: str
+
+
+@dataclass
+class MutationSpec:
+    # The mutated (abyssal) type the module turns into
+    result_name: str
+    result_id: Optional[int]
+    mutaplasmid: str
+    mutaplasmid_id: Optional[int]
+    attributes: Dict[str, float]
+
+
+@dataclass
+class ParsedItem:
+    name: str
+    type_id: Optional[int]
+    # module, drone, fighter, implant, booster or cargo
+    kind: str
+    quantity: int = 1
+    slot: Optional[str] = None
+    charge: Optional[str] = None
+    charge_id: Optional[int] = None
+    offline: bool = False
+    mutation: Optional[MutationSpec] = None
+    line: int = 0
+
+
+@dataclass
+class ParsedFit:
+    ship_type: str
+    ship_type_id: Optional[int]
+    name: str
+    # "eft" or "dna"
+    source: str
+    # First line of the fit in the input
+    line: int
+    items: List[ParsedItem] = field(default_factory=list)
+    issues: List[ParseIssue] = field(default_factory=list)
+    # The EFT block as read; generated for DNA
+    text: str = ""
+
+    def to_eft(self) -> str:
+        """
+        The fit as a normalized EFT block.
+        """
+        lines = [f"[{self.ship_type}, {self.name}]"]
+        mutations: List[MutationSpec] = []
+
+        def module_line(item: ParsedItem) -> str:
+            text = item.name
+            if item.mutation is not None:
+                mutations.append(item.mutation)
+                text += f" [{len(mutations)}]"
+            if item.charge:
+                text += f", {item.charge}"
+            if item.offline:
+                text += " /offline"
+            return text
+
+        modules = [item for item in self.items if item.kind == "module"]
+        racks = [
+            (slot, [module_line(m) for m in modules if m.slot == slot for _ in range(m.quantity)])
+            for slot in EFT_SLOT_ORDER + (None,)
+        ]
+        # Racks are told apart by position: an empty rack before a filled
+        # one still gets its section, like pyfa writes it
+        while racks and not racks[-1][1]:
+            racks.pop()
+        for slot, rack in racks:
+            lines.append("")
+            lines.extend(rack or [EFT_EMPTY_SLOTS[slot]])
+
+        for kind in EFT_BAY_ORDER:
+            bay = [item for item in self.items if item.kind == kind]
+            if not bay:
+                continue
+            lines.append("")
+            for item in bay:
+                counted = kind in ("drone", "fighter", "cargo")
+                lines.append(f"{item.name} x{item.quantity}" if counted else item.name)
+
+        for ref, mutation in enumerate(mutations, 1):
+            attributes = ", ".join(f"{name} {value:g}" for name, value in mutation.attributes.items())
+            lines.extend(["", f"[{ref}] {mutation.result_name}", f"  {mutation.mutaplasmid}", f"  {attributes}"])
+
+        return "\n".join(lines)
+
+    def to_fit(self) -> Fit:
+        """
+        A new app fit; every call gets a fresh ID, as imports often hold
+        several fits with the same ship and name.
+        """
+        return Fit(
+            id=f"{self.ship_type}-{uuid.uuid4().hex}",
+            name=self.name,
+            ship_type=self.ship_type,
+            eft_text=self.text or self.to_eft(),
+        )
+
+
+def _is_comment(line: str) -> bool:
+    return line.startswith(_COMMENT_PREFIXES)
+
+
+def _is_header(line: str) -> bool:
+    return (
+        line.startswith("[")
+        and line.endswith("]")
+        and _MUTATION_DEF_RE.match(line) is None
+        and _EMPTY_SLOT_RE.match(line) is None
+    )
+
+
+def _split_count(line: str) -> Tuple[str, int]:
+    # "Name xN" -> ("Name", N)
+    counted = _COUNT_RE.match(line) if line[-1:].isdigit() else None
+    return (counted.group(1), int(counted.group(2))) if counted is not None else (line, 1)
+
+
+def _split_module(line: str) -> Tuple[str, str, bool, Optional[str]]:
+    # "Name [ref], Charge /offline" -> (name, charge, offline, mutation ref)
+    offline = _OFFLINE_RE.search(line)
+    text = line[: offline.start()] if offline is not None else line
+    type_name, _, charge_name = text.partition(",")
+    type_name, charge_name = type_name.strip(), charge_name.strip()
+    ref = _MUTATION_REF_RE.match(type_name) if type_name.endswith("]") else None
+    if ref is not None:
+        return ref.group(1), charge_name, offline is not None, ref.group(2)
+    return type_name, charge_name, offline is not None, None
+
+
+def eft_type_names(text: str) -> Iterator[str]:
+    """
+    Every type name in an EFT block: items, charges, mutated types and
+    mutaplasmids, not the ship. A quick scan for search indexes; nothing is
+    resolved and no ParsedFit is built.
+    """
+    # Lines still to come of a mutation definition: 2 = mutaplasmid, 1 = attributes
+    in_mutation = 0
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line or _is_comment(line):
+            in_mutation = 0
+            continue
+        if in_mutation:
+            in_mutation -= 1
+            if in_mutation:
+                yield line
+            continue
+        if line[0] == "[":
+            match = _MUTATION_DEF_RE.match(line)
+            if match is not None:
+                in_mutation = 2
+                yield match.group(2).strip()
+            # Headers and empty-slot placeholders
+            continue
+        type_name, charge_name, _, _ = _split_module(_split_count(line)[0])
+        if type_name:
+            yield type_name
+        if charge_name:
+            yield charge_name
+
+
+class FitParser:
+    """
+    Parses fits from text, lines or files, lazily.
+
+    Issues on lines that don't belong to any fit (text before the first
+    header, say) are collected in `stray_issues`.
+    """
+
+    def __init__(self, index: Optional[TypeIndex] = None) -> None:
+        self.index = index
+        self.stray_issues: List[ParseIssue] = []
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def parse_file(self, path: Union[str, Path], encoding: str = "utf-8") -> Iterator[ParsedFit]:
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            yield from self.parse_lines(f)
+
+    def parse_text(self, text: str) -> Iterator[ParsedFit]:
+        return self.parse_lines(text.splitlines())
+
+    def parse_lines(self, lines: Iterable[str], first_line: int = 1) -> Iterator[ParsedFit]:
+        block: Optional[List[Line]] = None
+        for number, raw in enumerate(lines, first_line):
+            line = raw.strip()
+
+            dna = _DNA_RE.match(line)
+            if dna is not None:
+                if block is not None:
+                    yield self._parse_eft(block)
+                    block = None
+                yield self._parse_dna(dna.group(1), number, line)
+                continue
+
+            if _is_header(line):
+                if block is not None:
+                    yield self._parse_eft(block)
+                block = [(number, line)]
+                continue
+
+            if block is not None:
+                block.append((number, line))
+            elif line and not _is_comment(line):
+                self.stray_issues.append(ParseIssue(number, line, "not part of any fit"))
+
+        if block is not None:
+            yield self._parse_eft(block)
+
+    # ------------------------------------------------------------------ #
+    # EFT
+    # ------------------------------------------------------------------ #
+
+    def _resolve(self, name: str, fit: ParsedFit, number: int, text: str) -> Tuple[bool, Optional[TypeInfo]]:
+        # (usable, info); unusable names are reported on the fit
+        if self.index is None:
+            return True, None
+        info = self.index.lookup(name)
+        if info is None:
+            fit.issues.append(ParseIssue(number, text, f"unknown type {name!r}"))
+            return False, None
+        return True, info
+
+    def _parse_eft(self, block: List[Line]) -> ParsedFit:
+        number, header = block[0]
+        inside = header[1:-1]
+        ship, _, name = inside.partition(",")
+        ship = " ".join(ship.split())
+        name = name.strip() or ship
+
+        # Trailing blank lines and comments before the next fit aren't part of it
+        while len(block) > 1 and (not block[-1][1] or _is_comment(block[-1][1])):
+            block.pop()
+
+        fit = ParsedFit(
+            ship_type=ship,
+            ship_type_id=None,
+            name=name,
+            source="eft",
+            line=number,
+            text="\n".join(line for _, line in block),
+        )
+        if not ship:
+            fit.issues.append(ParseIssue(number, header, "ship name is empty"))
+        else:
+            usable, info = self._resolve(ship, fit, number, header)
+            if info is not None:
+                if info.kind != "ship":
+                    fit.issues.append(ParseIssue(number, header, f"{info.name!r} is not a ship"))
+                fit.ship_type = info.name
+                fit.ship_type_id = info.type_id
+
+        sections, mutations = self._sections(block[1:], fit)
+        racks = 0
+        counted_sections = 0
+        for section in sections:
+            # The cheap character checks spare most lines the regexes
+            lines = [(n, line) for n, line in section if not (line[0] == "[" and _EMPTY_SLOT_RE.match(line))]
+            if any(line[-1].isdigit() and _COUNT_RE.match(line) for _, line in lines):
+                self._parse_bay(lines, counted_sections, fit)
+                counted_sections += 1
+            else:
+                rack = RACK_ORDER[racks] if racks < len(RACK_ORDER) else None
+                racks += 1
+                self._parse_rack(lines, rack, mutations, fit)
+
+        # Mutations are read before the racks; report in line order
+        fit.issues.sort(key=lambda issue: issue.line)
+        return fit
+
+    def _sections(self, lines: List[Line], fit: ParsedFit) -> Tuple[List[List[Line]], Dict[str, MutationSpec]]:
+        sections: List[List[Line]] = [[]]
+        for number, line in lines:
+            if not line:
+                if sections[-1]:
+                    sections.append([])
+            elif not _is_comment(line):
+                sections[-1].append((number, line))
+
+        remaining: List[List[Line]] = []
+        mutations: Dict[str, MutationSpec] = {}
+        for section in sections:
+            kept: List[Line] = []
+            i = 0
+            while i < len(section):
+                number, line = section[i]
+                match = _MUTATION_DEF_RE.match(line)
+                if match is None:
+                    kept.append(section[i])
+                    i += 1
+                    continue
+                ref, result_name = match.groups()
+                mutaplasmid = section[i + 1][1] if i + 1 < len(section) else ""
+                attributes = section[i + 2] if i + 2 < len(section) else (number, "")
+                mutations[ref] = self._mutation(result_name.strip(), mutaplasmid, attributes, number, fit)
+                i += 3
+            if kept:
+                remaining.append(kept)
+        return remaining, mutations
+
+    def _mutation(self, result_name: str, mutaplasmid: str, attributes: Line, number: int, fit: ParsedFit) -> MutationSpec:
+        _, result = self._resolve(result_name, fit, number, result_name)
+        _, plasmid = self._resolve(mutaplasmid, fit, number + 1, mutaplasmid) if mutaplasmid else (True, None)
+        if not mutaplasmid:
+            fit.issues.append(ParseIssue(number, result_name, "mutation without a mutaplasmid"))
+
+        values: Dict[str, float] = {}
+        attr_number, attr_text = attributes
+        for pair in attr_text.split(","):
+            pair = pair.strip()
+            if not pair:
+                continue
+            attr_name, _, value = pair.rpartition(" ")
+            try:
+                values[attr_name.strip()] = float(value)
+            except ValueError:
+                fit.issues.append(ParseIssue(attr_number, attr_text, f"bad mutated attribute {pair!r}"))
+
+        return MutationSpec(
+            result_name=result.name if result is not None else result_name,
+            result_id=result.type_id if result is not None else None,
+            mutaplasmid=plasmid.name if plasmid is not None else mutaplasmid,
+            mutaplasmid_id=plasmid.type_id if plasmid is not None else None,
+            attributes=values,
+        )
+
+    def _parse_rack(self, lines: List[Line], rack: Optional[str], mutations: Dict[str, MutationSpec], fit: ParsedFit) -> None:
+        for number, line in lines:
+            type_name, charge_name, offline, ref = _split_module(line)
+            mutation = None
+            if ref is not None:
+                mutation = mutations.get(ref)
+                if mutation is None:
+                    fit.issues.append(ParseIssue(number, line, f"no mutation [{ref}] in this fit"))
+
+            usable, info = self._resolve(type_name, fit, number, line)
+            if not usable:
+                continue
+
+            item = ParsedItem(
+                name=info.name if info is not None else " ".join(type_name.split()),
+                type_id=info.type_id if info is not None else None,
+                kind="module",
+                slot=rack,
+                offline=offline,
+                mutation=mutation,
+                line=number,
+            )
+            if info is not None:
+                kind = info.kind
+                if kind == "module":
+                    item.slot = info.slot
+                elif kind in ("implant", "booster", "drone", "fighter"):
+                    item.kind, item.slot = kind, None
+                else:
+                    item.kind, item.slot = "cargo", None
+
+            if charge_name:
+                usable, charge = self._resolve(charge_name, fit, number, line)
+                if usable:
+                    item.charge = charge.name if charge is not None else " ".join(charge_name.split())
+                    item.charge_id = charge.type_id if charge is not None else None
+
+            if item.kind != "module" and (item.charge or item.offline or item.mutation):
+                fit.issues.append(ParseIssue(number, line, f"{item.name!r} is not a module"))
+            fit.items.append(item)
+
+    def _parse_bay(self, lines: List[Line], position: int, fit: ParsedFit) -> None:
+        parsed = []
+        for number, line in lines:
+            type_name, quantity = _split_count(line)
+            usable, info = self._resolve(type_name, fit, number, line)
+            if usable:
+                parsed.append((number, " ".join(type_name.split()), quantity, info))
+
+        # A section of only drones is the drone bay, of only fighters the
+        # fighter bay; anything else is cargo. Without type data, the first
+        # counted section is taken for drones.
+        kinds = {info.kind for _, _, _, info in parsed if info is not None}
+        if self.index is None:
+            kind = "drone" if position == 0 else "cargo"
+        elif kinds == {"drone"}:
+            kind = "drone"
+        elif kinds == {"fighter"}:
+            kind = "fighter"
+        else:
+            kind = "cargo"
+
+        for number, name, quantity, info in parsed:
+            fit.items.append(ParsedItem(
+                name=info.name if info is not None else name,
+                type_id=info.type_id if info is not None else None,
+                kind=kind,
+                quantity=quantity,
+                line=number,
+            ))
+
+    # ------------------------------------------------------------------ #
+    # DNA
+    # ------------------------------------------------------------------ #
+
+    def _parse_dna(self, dna: str, number: int, line: str) -> ParsedFit:
+        parts = dna.split(":")
+        ship_id = int(parts[0])
+        fit = ParsedFit(ship_type=str(ship_id), ship_type_id=ship_id, name="", source="dna", line=number)
+
+        if self.index is None:
+            fit.issues.append(ParseIssue(number, line, "DNA needs gamedata to resolve type IDs"))
+        else:
+            ship = self.index.by_id(ship_id)
+            if ship is None:
+                fit.issues.append(ParseIssue(number, line, f"unknown ship type ID {ship_id}"))
+            else:
+                fit.ship_type = ship.name
+                if ship.kind != "ship":
+                    fit.issues.append(ParseIssue(number, line, f"{ship.name!r} is not a ship"))
+        fit.name = f"{fit.ship_type} (DNA)"
+
+        for part in parts[1:]:
+            type_part, _, quantity_part = part.partition(";")
+            in_cargo = type_part.endswith("_")
+            type_id = int(type_part.rstrip("_"))
+            quantity = int(quantity_part) if quantity_part else 1
+            if quantity <= 0:
+                continue
+
+            info = self.index.by_id(type_id) if self.index is not None else None
+            if info is None:
+                if self.index is not None:
+                    fit.issues.append(ParseIssue(number, line, f"unknown type ID {type_id}"))
+                continue
+
+            kind = info.kind
+            if in_cargo or kind not in ("module", "drone", "fighter", "implant", "booster"):
+                kind = "cargo"
+            fit.items.append(ParsedItem(
+                name=info.name,
+                type_id=type_id,
+                kind=kind,
+                quantity=quantity,
+                slot=info.slot if kind == "module" else None,
+                line=number,
+            ))
+
+        fit.text = fit.to_eft()
+        return fit
+
+
+def read_eft(text: str, index: Optional[TypeIndex] = None) -> ParsedFit:
+    """
+    Parse a single EFT block, like a fit's eft_text. Unlike FitParser, the
+    text must start with its "[Ship, Name]" header (blank lines and comments
+    before it aside), otherwise EftFormatError is raised.
+    """
+    block = [(number, line.strip()) for number, line in enumerate(text.splitlines(), 1)]
+    while block and (not block[0][1] or _is_comment(block[0][1])):
+        block.pop(0)
+    if not block:
+        raise EftFormatError("empty EFT text")
+    header = block[0][1]
+    if not _is_header(header):
+        raise EftFormatError("first EFT line must be like [Ship, Fit Name]")
+    if not header[1:-1].partition(",")[0].strip():
+        raise EftFormatError("ship name is empty")
+    return FitParser(index)._parse_eft(block)
+
+
+def iter_fits(source: Union[str, Path, Iterable[str]], index: Optional[TypeIndex] = None) -> Iterator[ParsedFit]:
+    """
+    Parse fits from a file path or any iterable of lines.
+    """
+    parser = FitParser(index)
+    if isinstance(source, (str, Path)):
+        return parser.parse_file(source)
+    return parser.parse_lines(source)
@@ -0,0 +1,121 @@
+# evefit_core/fleet.py
+"""
+Aggregate stats of a whole fleet.
+
+Pilots flying the same fit with the same skills are calculated once: members
+are grouped by fit content hash and skill digest, only one fit per group is
+sent to the engine, and its numbers are counted once per pilot.
+
+    fleet = Fleet(members=[FleetMember(dps_fit, skills, 20), FleetMember(logi_fit, skills, 5)],
+                  booster=FleetMember(command_fit, booster_skills))
+    stats = evaluate_fleet(FitEngine(), fleet)
+    stats.dps["Uniform (generic)"], stats.ehp_layers["armor"], stats.remote_reps["armor"]
+
+With a PreforkEngine the distinct fits are calculated in its workers.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from evefit_core.evaluation import fit_content_hash
+from evefit_core.fit_models import Fit, Fleet, FleetStats, SkillProfile
+from evefit_core.skills import SkillProfileRepository, get_skill_repository
+
+_LAYERS = ("shield", "armor", "hull")
+_REP_TYPES = ("shield", "armor", "hull", "capacitor")
+
+
+class FleetEngine(Protocol):
+    """
+    What evaluate_fleet needs from an engine (FitEngine, PreforkEngine).
+    """
+
+    def fleet_member_stats(
+        self,
+        members: List[Tuple[Fit, SkillProfile]],
+        booster: Optional[Tuple[Fit, SkillProfile]] = None,
+        include_user_profiles: bool = False,
+        spool_scale: Optional[float] = None,
+    ) -> List[Dict[str, object]]: ...
+
+
+def evaluate_fleet(
+    engine: FleetEngine,
+    fleet: Fleet,
+    include_user_profiles: bool = False,
+    spool_scale: Optional[float] = None,
+    skill_repository: Optional[SkillProfileRepository] = None,
+) -> FleetStats:
+    """
+    Calculate every distinct fit of the fleet once and add them up.
+
+    `spool_scale` (0 to 1) sets how far spooling weapons and remote
+    repairers are spooled up; None uses the engine's setting.
+    """
+    repository = skill_repository if skill_repository is not None else get_skill_repository()
+
+    # (fit content hash, skill digest) -> index into unique
+    groups: Dict[Tuple[str, str], int] = {}
+    unique: List[Tuple[Fit, SkillProfile]] = []
+    counts: List[int] = []
+    member_groups: List[int] = []
+    for member in fleet.members:
+        if member.count <= 0:
+            raise ValueError(f"fleet member {member.fit.name!r} has count {member.count}")
+        key = (fit_content_hash(member.fit), repository.digest(member.skills))
+        index = groups.get(key)
+        if index is None:
+            index = groups[key] = len(unique)
+            unique.append((member.fit, member.skills))
+            counts.append(0)
+        counts[index] += member.count
+        member_groups.append(index)
+
+    booster = None
+    if fleet.booster is not None:
+        booster = (fleet.booster.fit, fleet.booster.skills)
+    results = engine.fleet_member_stats(
+        unique, booster, include_user_profiles=include_user_profiles, spool_scale=spool_scale) if unique else []
+
+    profiles: List[str] = results[0]["profiles"] if results else []
+    dps = [0.0] * len(profiles)
+    volley = [0.0] * len(profiles)
+    ehp_layers = dict.fromkeys(_LAYERS, 0.0)
+    remote_reps = dict.fromkeys(_REP_TYPES, 0.0)
+    miner_yield = drone_yield = 0.0
+    for result, count in zip(results, counts):
+        for i in range(len(profiles)):
+            dps[i] += result["dps"][i] * count
+            volley[i] += result["volley"][i] * count
+        for layer in _LAYERS:
+            ehp_layers[layer] += result["ehp"][layer] * count
+        for rep_type in _REP_TYPES:
+            remote_reps[rep_type] += result["remote_reps"][rep_type] * count
+        miner_yield += result["miner_yield"] * count
+        drone_yield += result["drone_yield"] * count
+
+    cap = []
+    for member, index in zip(fleet.members, member_groups):
+        result = results[index]
+        stable = bool(result["cap_stable"])
+        cap.append({
+            "fit_id": member.fit.id,
+            "name": member.fit.name,
+            "count": member.count,
+            "cap_stable": stable,
+            "cap_stable_percent": float(result["cap_state"]) if stable else None,
+            "cap_lasts_seconds": None if stable else float(result["cap_state"]),
+        })
+
+    return FleetStats(
+        pilots=sum(counts),
+        unique_fits=len(unique),
+        dps=dict(zip(profiles, dps)),
+        volley=dict(zip(profiles, volley)),
+        ehp=sum(ehp_layers.values()),
+        ehp_layers=ehp_layers,
+        remote_reps=remote_reps,
+        mining={"modules": miner_yield, "drones": drone_yield, "total": miner_yield + drone_yield},
+        cap=cap,
+    )
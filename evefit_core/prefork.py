@@ -0,0 +1,179 @@
+# evefit_core/prefork.py
+"""
+Pre-forked evaluation workers that share warm gamedata copy-on-write.
+
+The parent process loads everything the engine needs once (FitEngine.warm_up),
+moves all live objects out of the garbage collector's reach with gc.freeze()
+and then forks the workers. Workers start with the parent's heap mapped
+copy-on-write. The collector never walks the frozen objects, so it never
+writes to their pages, and those pages stay shared between all workers. Each
+additional worker only pays for what it allocates itself. Reference count
+updates still dirty the pages of objects a worker actually touches, so
+sharing isn't perfect.
+
+Only works where the "fork" start method is available (Linux, macOS).
+
+    engine = PreforkEngine(FitEngine(), processes=os.cpu_count())
+    evaluator = FitEvaluator(engine, max_workers=engine.processes)
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import random
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from evefit_core.fit_engine import FitEngine
+from evefit_core.fit_models import EvaluatedFit, Fit, FitStats, SkillProfile
+
+# The warm engine; set in the parent before forking, inherited by workers
+_worker_engine: Optional[FitEngine] = None
+
+
+def _init_worker() -> None:
+    # Ctrl-C goes to the parent, which shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    random.seed()
+
+
+def _evaluate_in_worker(fit: Fit, skills: SkillProfile) -> FitStats:
+    return _worker_engine.evaluate_fit(fit, skills).stats
+
+
+def _duel_in_worker(matchup: Tuple[Fit, SkillProfile, Fit, SkillProfile, float]) -> Dict[str, object]:
+    return _worker_engine.duel(*matchup)
+
+
+def _fleet_members_in_worker(
+    batch: Tuple[List[Tuple[Fit, SkillProfile]], Optional[Tuple[Fit, SkillProfile]], bool, Optional[float]]
+) -> List[Dict[str, object]]:
+    return _worker_engine.fleet_member_stats(*batch)
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _memory_kib(pid: int) -> Optional[Dict[str, int]]:
+    # Linux only: proportional and private memory of one process
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    fields = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        parts = value.split()
+        if parts and parts[0].isdigit():
+            fields[name] = int(parts[0])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+        "shared": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+    }
+
+
+class PreforkEngine:
+    """
+    FitEngine stand-in that evaluates in pre-forked worker processes.
+
+    Has the same interface FitEvaluator uses (evaluate_fit, gamedata_version,
+    calc_settings), so caching and request coalescing keep working in the
+    parent. evaluate_fit blocks until a worker is done; give FitEvaluator at
+    least `processes` threads to keep every worker busy.
+    """
+
+    def __init__(self, engine: Optional[FitEngine] = None, processes: Optional[int] = None) -> None:
+        global _worker_engine
+
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("PreforkEngine needs the 'fork' start method")
+
+        engine = engine if engine is not None else FitEngine()
+        engine.warm_up()
+
+        self.engine = engine
+        self.gamedata_version = engine.gamedata_version
+        self.processes = processes or os.cpu_count() or 1
+
+        _worker_engine = engine
+        # Releases database connections and stops the engine's threads
+        engine.before_fork()
+
+        gc.collect()
+        gc.freeze()
+        try:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+            )
+            # With "fork", the first submit starts every worker at once,
+            # while the heap is still frozen
+            self._executor.submit(_ready).result()
+        finally:
+            # The workers have their copy; the parent can collect normally again
+            gc.unfreeze()
+
+    def warm_up(self) -> None:
+        # Done in __init__, before forking
+        pass
+
+    def calc_settings(self) -> Dict[str, object]:
+        return self.engine.calc_settings()
+
+    def evaluate_fit(self, fit: Fit, skills: SkillProfile) -> EvaluatedFit:
+        stats = self._executor.submit(_evaluate_in_worker, fit, skills).result()
+        return EvaluatedFit(fit=fit, stats=stats, skill_profile=skills)
+
+    def duels(
+        self, matchups: List[Tuple[Fit, SkillProfile, Fit, SkillProfile, float]]
+    ) -> List[Dict[str, object]]:
+        """
+        Run many duels (fit_a, skills_a, fit_b, skills_b, distance_m) spread
+        over the workers; results come back in order.
+        """
+        chunksize = max(1, len(matchups) // (self.processes * 4))
+        return list(self._executor.map(_duel_in_worker, matchups, chunksize=chunksize))
+
+    def fleet_member_stats(
+        self,
+        members: List[Tuple[Fit, SkillProfile]],
+        booster: Optional[Tuple[Fit, SkillProfile]] = None,
+        include_user_profiles: bool = False,
+        spool_scale: Optional[float] = None,
+    ) -> List[Dict[str, object]]:
+        """
+        FitEngine.fleet_member_stats spread over the workers: one batch of
+        members per worker, so each calculates the booster only once.
+        """
+        batches = [members[i::self.processes] for i in range(min(self.processes, len(members)))]
+        futures = [
+            self._executor.submit(_fleet_members_in_worker, (batch, booster, include_user_profiles, spool_scale))
+            for batch in batches]
+        results: List[Optional[Dict[str, object]]] = [None] * len(members)
+        for offset, future in enumerate(futures):
+            results[offset::self.processes] = future.result()
+        return results
+
+    def memory_report(self) -> Dict[int, Optional[Dict[str, int]]]:
+        """
+        Memory use per process in KiB, parent first (Linux only, else None).
+
+        "pss" splits shared pages between the processes sharing them, so the
+        sum of all pss values is the real footprint of the pool.
+        """
+        report = {os.getpid(): _memory_kib(os.getpid())}
+        for child in multiprocessing.active_children():
+            report[child.pid] = _memory_kib(child.pid)
+        return report
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,233 @@
+# evefit_core/result_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from evefit_core.evaluation import EvalKey, EvaluationCache
+from evefit_core.fit_models import FitStats
+from evefit_core.storage import DATA_DIR
+
+RESULT_CACHE_FILE = DATA_DIR / "eval_cache.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key              TEXT PRIMARY KEY,
+    gamedata_version TEXT NOT NULL,
+    stats            TEXT NOT NULL,
+    last_used        REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE INDEX IF NOT EXISTS results_gamedata_version ON results (gamedata_version);
+"""
+
+
+def _digest_key(key: EvalKey) -> str:
+    return hashlib.sha256("\0".join(key).encode("utf-8")).hexdigest()
+
+
+def _stats_to_json(stats: FitStats) -> str:
+    return json.dumps(asdict(stats), separators=(",", ":"))
+
+
+def _stats_from_json(raw: str) -> Optional[FitStats]:
+    try:
+        return FitStats(**json.loads(raw))
+    except (TypeError, ValueError):
+        return None
+
+
+class PersistentEvaluationCache:
+    """
+    Disk-backed evaluation result cache, shared across processes.
+
+    Results live in an SQLite database in WAL mode, so any number of
+    threads and processes can read while one writes. Each thread uses its
+    own connection. A small in-memory LRU sits in front of the database
+    for repeated lookups within one process.
+
+    The database keeps at most `max_entries` results; the least recently
+    used ones are evicted first. Opening the cache with a `gamedata_version`
+    drops every result computed against a different gamedata version.
+
+    Implements the same interface as EvaluationCache, so it can be handed
+    to FitEvaluator directly.
+    """
+
+    # Only check the size bound every this many writes
+    EVICT_EVERY = 256
+    # Don't rewrite last_used on every hit; this many seconds is close enough
+    TOUCH_RESOLUTION = 60.0
+    # Keys per SELECT in peek_many(), below SQLite's parameter limit
+    PEEK_BATCH = 500
+
+    def __init__(
+        self,
+        path: Path = RESULT_CACHE_FILE,
+        max_entries: int = 500_000,
+        memory_entries: int = 2_000,
+        gamedata_version: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = EvaluationCache(max_entries=memory_entries)
+        self._local = threading.local()
+        # Every connection opened, on any thread, so close() can reach them
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._writes = 0
+        self._write_lock = threading.Lock()
+
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if gamedata_version is not None:
+            self.invalidate_other_versions(gamedata_version)
+
+    # ------------------------------------------------------------------ #
+    # ResultCache interface
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: EvalKey) -> Optional[FitStats]:
+        stats = self._memory.get(key)
+        if stats is not None:
+            return stats
+
+        digest = _digest_key(key)
+        row = self._conn().execute(
+            "SELECT stats, last_used FROM results WHERE key = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        stats = _stats_from_json(row[0])
+        if stats is None:
+            return None
+
+        now = time.time()
+        if now - row[1] > self.TOUCH_RESOLUTION:
+            with self._write_lock:
+                self._execute_write("UPDATE results SET last_used = ? WHERE key = ?", (now, digest))
+
+        self._memory.put(key, stats)
+        return stats
+
+    def peek(self, key: EvalKey) -> Optional[FitStats]:
+        stats = self._memory.peek(key)
+        if stats is not None:
+            return stats
+
+        row = self._conn().execute(
+            "SELECT stats FROM results WHERE key = ?", (_digest_key(key),)
+        ).fetchone()
+        return _stats_from_json(row[0]) if row is not None else None
+
+    def peek_many(self, keys: List[EvalKey]) -> Dict[EvalKey, FitStats]:
+        found = self._memory.peek_many(keys)
+        missing = {_digest_key(key): key for key in keys if key not in found}
+        digests = list(missing)
+        conn = self._conn()
+        for start in range(0, len(digests), self.PEEK_BATCH):
+            batch = digests[start:start + self.PEEK_BATCH]
+            rows = conn.execute(
+                f"SELECT key, stats FROM results WHERE key IN ({','.join('?' * len(batch))})", batch
+            ).fetchall()
+            for digest, raw in rows:
+                stats = _stats_from_json(raw)
+                if stats is not None:
+                    found[missing[digest]] = stats
+        return found
+
+    def put(self, key: EvalKey, stats: FitStats) -> None:
+        self._memory.put(key, stats)
+
+        # EvalKey is (fit, profile, gamedata version, settings)
+        gamedata_version = key[2]
+        with self._write_lock:
+            self._execute_write(
+                "INSERT OR REPLACE INTO results (key, gamedata_version, stats, last_used) VALUES (?, ?, ?, ?)",
+                (_digest_key(key), gamedata_version, _stats_to_json(stats), time.time()),
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict()
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._write_lock:
+            self._execute_write("DELETE FROM results", ())
+
+    # ------------------------------------------------------------------ #
+    # Maintenance
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def invalidate_other_versions(self, gamedata_version: str) -> int:
+        """
+        Drop all results not computed against `gamedata_version`.
+
+        Returns the number of dropped results.
+        """
+        self._memory.clear()
+        with self._write_lock:
+            cur = self._execute_write(
+                "DELETE FROM results WHERE gamedata_version != ?", (str(gamedata_version),)
+            )
+        return cur.rowcount
+
+    def evict(self) -> None:
+        """
+        Enforce max_entries now instead of waiting for the next check.
+        """
+        with self._write_lock:
+            self._evict()
+
+    def close(self) -> None:
+        """
+        Close the connections of all threads. A thread that uses the cache
+        afterwards opens a new one.
+        """
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Closed from whichever thread calls close()
+            conn = sqlite3.connect(str(self.path), timeout=30.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def _execute_write(self, sql: str, params: tuple) -> sqlite3.Cursor:
+        return self._conn().execute(sql, params)
+
+    def _evict(self) -> None:
+        conn = self._conn()
+        count = conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM results WHERE key IN "
+                "(SELECT key FROM results ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import asdict
+import os
+import threading
+from array import array
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from evefit_core.fit_models import SkillProfile
 
@@ -13,12 +17,411 @@ DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 SKILLS_DIR = DATA_DIR / "skills"
 SKILLS_DIR.mkdir(parents=True, exist_ok=True)
 
+MAX_SKILL_LEVEL = 5
+
 
 def _slugify_name(name: str) -> str:
     slug = name.strip().replace(" ", "_")
     return slug or "profile"
 
 
+def _write_json_atomic(path: Path, data: dict) -> None:
+    """
+    Write JSON to a temporary sibling file and move it over `path`.
+
+    Readers never see a half-written profile, and the directory entry
+    changes in one step, so the repository picks up a new mtime.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _clamp_level(level: int) -> int:
+    return max(0, min(MAX_SKILL_LEVEL, level))
+
+
+def _levels_digest(levels: Iterable[Tuple[str, int]]) -> str:
+    # sha1 over sorted (name, level) pairs; the same for a SkillVector and
+    # the mapping it was built from
+    h = hashlib.sha1()
+    for name, level in sorted(levels):
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(bytes((level,)))
+    return h.hexdigest()
+
+
+class SkillIndex:
+    """
+    Interns skill names to small integer IDs.
+
+    One index is shared by all profiles of a repository, so every profile
+    stores the same skill under the same ID. Safe to use from several
+    threads.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, name: str) -> int:
+        skill_id = self._ids.get(name)
+        if skill_id is None:
+            with self._lock:
+                # Another thread may have added it in the meantime
+                skill_id = self._ids.get(name)
+                if skill_id is None:
+                    skill_id = len(self._names)
+                    self._names.append(name)
+                    self._ids[name] = skill_id
+        return skill_id
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def name_of(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+
+class SkillVector:
+    """
+    Immutable, compact skill levels of one profile.
+
+    `ids` holds sorted skill IDs from a SkillIndex, `levels` the matching
+    levels (0-5) as one byte each.
+    """
+
+    __slots__ = ("ids", "levels", "_digest")
+
+    def __init__(self, ids: array, levels: bytes) -> None:
+        self.ids = ids
+        self.levels = levels
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_mapping(cls, skills: Dict[str, int], index: SkillIndex) -> "SkillVector":
+        pairs = sorted((index.intern(name), _clamp_level(level)) for name, level in skills.items())
+        return cls(
+            ids=array("I", (skill_id for skill_id, _ in pairs)),
+            levels=bytes(level for _, level in pairs),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return iter(zip(self.ids, self.levels))
+
+    def level(self, skill_id: int, default: int = 0) -> int:
+        # ids are sorted, so a bisect would do; profiles are small enough
+        # that the C-level index() is faster in practice.
+        try:
+            return self.levels[self.ids.index(skill_id)]
+        except ValueError:
+            return default
+
+    def to_dict(self, index: SkillIndex) -> Dict[str, int]:
+        return {index.name_of(skill_id): level for skill_id, level in self}
+
+    @property
+    def total_levels(self) -> int:
+        return sum(self.levels)
+
+    def digest(self, index: SkillIndex) -> str:
+        """
+        Content hash of the skill levels.
+
+        Skill IDs are index-local, so the hash is computed over names to stay
+        stable across processes and index instances.
+        """
+        if self._digest is None:
+            self._digest = _levels_digest(self.to_dict(index).items())
+        return self._digest
+
+
+@dataclass
+class _ProfileEntry:
+    stamp: Tuple[int, int]
+    profile: SkillProfile
+    vector: SkillVector
+
+
+def _parse_profile_file(path: Path) -> Optional[Tuple[str, Dict[str, int]]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    name = data.get("name") or path.stem
+    skills = data.get("skills") or {}
+
+    if not isinstance(skills, dict):
+        skills = {}
+
+    clean_skills: Dict[str, int] = {}
+    for k, v in skills.items():
+        try:
+            clean_skills[str(k)] = int(v)
+        except (TypeError, ValueError):
+            continue
+
+    return name, clean_skills
+
+
+class SkillProfileRepository:
+    """
+    Skill profiles stored as one JSON file per profile in a directory.
+
+    The repository remembers (mtime, size) of every file it parsed and only
+    re-reads files whose stamp changed since the last refresh. Writes made
+    through the repository update the in-memory state directly, so they never
+    trigger a reparse.
+
+    `generation` increases whenever the set of profiles or any profile's
+    contents changes; callers can compare it to skip rebuilding UI state.
+
+    All methods may be called from any thread; evaluation workers take
+    digests while the UI refreshes.
+    """
+
+    def __init__(self, directory: Path = SKILLS_DIR, index: Optional[SkillIndex] = None) -> None:
+        self.directory = directory
+        self.index = index if index is not None else SkillIndex()
+        self.generation = 0
+        self._entries: Dict[str, _ProfileEntry] = {}
+        # Stamps of files that failed to parse, so they aren't retried
+        # until they change on disk.
+        self._unreadable: Dict[str, Tuple[int, int]] = {}
+        self._profiles: Optional[List[SkillProfile]] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------ #
+    # Loading
+    # ------------------------------------------------------------------ #
+
+    def refresh(self) -> bool:
+        """
+        Bring the in-memory profiles up to date with the directory.
+
+        Returns True if anything changed.
+        """
+        with self._lock:
+            seen: Dict[str, Tuple[int, int]] = {}
+            try:
+                with os.scandir(self.directory) as it:
+                    for dir_entry in it:
+                        if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                            continue
+                        st = dir_entry.stat()
+                        seen[dir_entry.name] = (st.st_mtime_ns, st.st_size)
+            except FileNotFoundError:
+                pass
+
+            changed = False
+
+            for filename in list(self._entries):
+                if filename not in seen:
+                    del self._entries[filename]
+                    changed = True
+
+            for filename, stamp in seen.items():
+                entry = self._entries.get(filename)
+                if entry is not None and entry.stamp == stamp:
+                    continue
+                if self._unreadable.get(filename) == stamp:
+                    continue
+
+                parsed = _parse_profile_file(self.directory / filename)
+                if parsed is None:
+                    self._unreadable[filename] = stamp
+                    if self._entries.pop(filename, None) is not None:
+                        changed = True
+                    continue
+
+                self._unreadable.pop(filename, None)
+
+                name, skills = parsed
+                self._store(filename, stamp, name, skills)
+                changed = True
+
+            if changed:
+                self._invalidate()
+            return changed
+
+    def profiles(self) -> List[SkillProfile]:
+        """
+        All profiles, ordered by filename.
+
+        If no profiles exist, a single "No skills" profile is returned.
+        """
+        with self._lock:
+            self.refresh()
+            if self._profiles is None:
+                profiles = [self._entries[k].profile for k in sorted(self._entries)]
+                if not profiles:
+                    profiles.append(SkillProfile(name="No skills (dummy)", skills={}))
+                self._profiles = profiles
+            return list(self._profiles)
+
+    def get(self, name: str) -> Optional[SkillProfile]:
+        entry = self._entry_for_name(name)
+        return entry.profile if entry is not None else None
+
+    def vector(self, name: str) -> Optional[SkillVector]:
+        entry = self._entry_for_name(name)
+        return entry.vector if entry is not None else None
+
+    def vector_for(self, profile: SkillProfile) -> SkillVector:
+        """
+        Compact vector for any profile, stored or not.
+
+        Stored, unmodified profiles reuse their cached vector. Other profiles
+        intern their skill names into the shared index.
+        """
+        entry = self._stored_entry(profile)
+        if entry is not None:
+            return entry.vector
+        return SkillVector.from_mapping(profile.skills, self.index)
+
+    def digest(self, profile: SkillProfile) -> str:
+        """
+        Content digest of a profile, stored or not.
+
+        Profiles that aren't stored (inline daemon profiles, unsaved edits)
+        are hashed from their mapping so they don't grow the shared index.
+        Equal contents give equal digests either way.
+        """
+        entry = self._stored_entry(profile)
+        if entry is not None:
+            return entry.vector.digest(self.index)
+        return _levels_digest((name, _clamp_level(level)) for name, level in profile.skills.items())
+
+    # ------------------------------------------------------------------ #
+    # Writing
+    # ------------------------------------------------------------------ #
+
+    def save(self, profile: SkillProfile) -> None:
+        """
+        Save a single profile to <directory>/<slug>.json.
+        """
+        filename = f"{_slugify_name(profile.name)}.json"
+        path = self.directory / filename
+
+        with self._lock:
+            _write_json_atomic(path, asdict(profile))
+            self._store(filename, self._stamp(path), profile.name, dict(profile.skills))
+            self._invalidate()
+
+    def delete(self, name: str) -> None:
+        """
+        Delete the file corresponding to the given profile name, if it exists.
+        """
+        filename = f"{_slugify_name(name)}.json"
+        path = self.directory / filename
+        with self._lock:
+            if path.exists():
+                path.unlink()
+            if self._entries.pop(filename, None) is not None:
+                self._invalidate()
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        """
+        Rename a profile's file (and its internal "name" field).
+
+        If the old file doesn't exist, this is a no-op.
+        If the new file exists, it will be overwritten.
+        """
+        old_filename = f"{_slugify_name(old_name)}.json"
+        new_filename = f"{_slugify_name(new_name)}.json"
+
+        old_path = self.directory / old_filename
+        new_path = self.directory / new_filename
+
+        with self._lock:
+            if not old_path.exists():
+                return
+
+            try:
+                data = json.loads(old_path.read_text(encoding="utf-8"))
+            except Exception:
+                data = {}
+            if not isinstance(data, dict):
+                data = {}
+
+            data["name"] = new_name
+
+            _write_json_atomic(new_path, data)
+
+            if old_path != new_path and old_path.exists():
+                old_path.unlink()
+            self._entries.pop(old_filename, None)
+
+            # Reparse the written file so the entry matches what a fresh load
+            # would see, including any cleanup done by _parse_profile_file.
+            parsed = _parse_profile_file(new_path)
+            if parsed is not None:
+                self._store(new_filename, self._stamp(new_path), *parsed)
+            self._invalidate()
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _stamp(path: Path) -> Tuple[int, int]:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def _store(self, filename: str, stamp: Tuple[int, int], name: str, skills: Dict[str, int]) -> None:
+        # The profile is kept as read; the vector is only for digests and lookups
+        vector = SkillVector.from_mapping(skills, self.index)
+        profile = SkillProfile(name=name, skills=skills)
+        self._entries[filename] = _ProfileEntry(stamp=stamp, profile=profile, vector=vector)
+
+    def _entry_for_name(self, name: str) -> Optional[_ProfileEntry]:
+        with self._lock:
+            entry = self._entries.get(f"{_slugify_name(name)}.json")
+            if entry is not None and entry.profile.name == name:
+                return entry
+            for entry in self._entries.values():
+                if entry.profile.name == name:
+                    return entry
+            return None
+
+    def _stored_entry(self, profile: SkillProfile) -> Optional[_ProfileEntry]:
+        # Only the very object the repository handed out; edited copies and
+        # inline profiles with the same name are not the stored profile
+        entry = self._entry_for_name(profile.name)
+        return entry if entry is not None and entry.profile is profile else None
+
+    def _invalidate(self) -> None:
+        self._profiles = None
+        self.generation += 1
+
+
+_default_repository: Optional[SkillProfileRepository] = None
+_default_repository_lock = threading.Lock()
+
+
+def get_skill_repository() -> SkillProfileRepository:
+    """
+    Process-wide repository over data/skills.
+    """
+    global _default_repository
+    with _default_repository_lock:
+        if _default_repository is None:
+            _default_repository = SkillProfileRepository()
+        return _default_repository
+
+
 def load_skill_profiles() -> List[SkillProfile]:
     """
     Load all skill profiles from JSON files in data/skills.
@@ -33,57 +436,24 @@ def load_skill_profiles() -> List[SkillProfile]:
           }
         }
 
+    Only files changed since the previous call are parsed again.
     If no files exist, we return a single "No skills" profile.
     """
-    profiles: List[SkillProfile] = []
-
-    for path in sorted(SKILLS_DIR.glob("*.json")):
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            continue
-
-        name = data.get("name") or path.stem
-        skills = data.get("skills") or {}
-
-        if not isinstance(skills, dict):
-            skills = {}
-
-        clean_skills: Dict[str, int] = {}
-        for k, v in skills.items():
-            try:
-                clean_skills[str(k)] = int(v)
-            except (TypeError, ValueError):
-                continue
-
-        profiles.append(SkillProfile(name=name, skills=clean_skills))
-
-    if not profiles:
-        profiles.append(SkillProfile(name="No skills (dummy)", skills={}))
-
-    return profiles
+    return get_skill_repository().profiles()
 
 
 def save_skill_profile(profile: SkillProfile) -> None:
     """
     Save a single profile to data/skills/<slug>.json.
     """
-    slug = _slugify_name(profile.name)
-    filename = f"{slug}.json"
-    path = SKILLS_DIR / filename
-
-    data = asdict(profile)
-    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    get_skill_repository().save(profile)
 
 
 def delete_skill_profile(name: str) -> None:
     """
     Delete the JSON file corresponding to the given profile name, if it exists.
     """
-    slug = _slugify_name(name)
-    path = SKILLS_DIR / f"{slug}.json"
-    if path.exists():
-        path.unlink()
+    get_skill_repository().delete(name)
 
 
 def rename_skill_profile(old_name: str, new_name: str) -> None:
@@ -93,23 +463,4 @@ def rename_skill_profile(old_name: str, new_name: str) -> None:
     If the old file doesn't exist, this is a no-op.
     If the new file exists, it will be overwritten.
     """
-    old_slug = _slugify_name(old_name)
-    new_slug = _slugify_name(new_name)
-
-    old_path = SKILLS_DIR / f"{old_slug}.json"
-    new_path = SKILLS_DIR / f"{new_slug}.json"
-
-    if not old_path.exists():
-        return
-
-    try:
-        data = json.loads(old_path.read_text(encoding="utf-8"))
-    except Exception:
-        data = {}
-
-    data["name"] = new_name
-
-    new_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-
-    if old_path != new_path and old_path.exists():
-        old_path.unlink()
+    get_skill_repository().rename(old_name, new_name)
@@ -0,0 +1,291 @@
+# evefit_core/startup_profile.py
+"""
+Import-time and cold-start profiler.
+
+Imports a module in fresh interpreters with `-X importtime`, reports where
+the time goes and optionally checks it against a budget, for example in CI:
+
+    python -m evefit_core.startup_profile eos.db --lazy --budget-ms 800
+    python -m evefit_core.startup_profile eos.db --first-use "eos.db.getItem('Rifter')"
+    python -m evefit_core.startup_profile eos.db --budget eos.effects=300 --json
+
+Exits with status 1 when a budget is exceeded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# eos is vendored and imported as a top-level package
+EOS_PARENT = Path(__file__).resolve().parent
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+# Runs in the child interpreter; prints timings as JSON on the last line
+_CHILD_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+first_use = None
+if {statement!r}:
+    exec({statement!r})
+    first_use = (time.perf_counter() - imported) * 1000.0
+# Imported last so it doesn't count as already imported for the target
+import json
+print(json.dumps({{"import_ms": (imported - start) * 1000.0, "first_use_ms": first_use}}))
+"""
+
+
+@dataclass
+class ModuleTiming:
+    name: str
+    depth: int
+    self_ms: float
+    cumulative_ms: float
+
+
+@dataclass
+class StartupRun:
+    import_ms: float
+    first_use_ms: Optional[float]
+    modules: Dict[str, ModuleTiming] = field(default_factory=dict)
+
+
+@dataclass
+class StartupReport:
+    module: str
+    lazy: bool
+    runs: int
+    import_ms: float
+    first_use_ms: Optional[float]
+    # Medians over all runs, slowest cumulative first
+    modules: List[ModuleTiming]
+
+
+# --------------------------------------------------------------------------- #
+# Measuring
+# --------------------------------------------------------------------------- #
+
+def parse_importtime(stderr: str) -> Dict[str, ModuleTiming]:
+    """
+    Parse `python -X importtime` output into per-module timings.
+    """
+    timings: Dict[str, ModuleTiming] = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        # The output indents nested imports by two spaces per level
+        timings[name] = ModuleTiming(
+            name=name,
+            depth=max(0, (len(indent) - 1) // 2),
+            self_ms=int(self_us) / 1000.0,
+            cumulative_ms=int(cumulative_us) / 1000.0,
+        )
+    return timings
+
+
+def _child_env(lazy: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    paths = [str(PROJECT_ROOT), str(EOS_PARENT)]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    if lazy:
+        env["EOS_LAZY_INIT"] = "1"
+    else:
+        env.pop("EOS_LAZY_INIT", None)
+    return env
+
+
+def run_once(module: str, lazy: bool = False, statement: str = "") -> StartupRun:
+    script = _CHILD_SCRIPT.format(module=module, statement=statement)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        env=_child_env(lazy),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        # importtime noise first, the actual error last
+        tail = "\n".join(proc.stderr.strip().splitlines()[-15:])
+        raise RuntimeError(f"Importing {module} failed:\n{tail}")
+
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    return StartupRun(
+        import_ms=timings["import_ms"],
+        first_use_ms=timings["first_use_ms"],
+        modules=parse_importtime(proc.stderr),
+    )
+
+
+def profile_startup(
+    module: str,
+    lazy: bool = False,
+    statement: str = "",
+    runs: int = 3,
+    warmup: int = 1,
+) -> StartupReport:
+    """
+    Profile importing `module` over several fresh interpreters.
+
+    Warmup runs make sure bytecode caches exist and are not counted.
+    """
+    for _ in range(warmup):
+        run_once(module, lazy, statement)
+    results = [run_once(module, lazy, statement) for _ in range(max(1, runs))]
+
+    names = {name for run in results for name in run.modules}
+    modules = []
+    for name in names:
+        timings = [run.modules[name] for run in results if name in run.modules]
+        modules.append(ModuleTiming(
+            name=name,
+            depth=timings[0].depth,
+            self_ms=statistics.median(t.self_ms for t in timings),
+            cumulative_ms=statistics.median(t.cumulative_ms for t in timings),
+        ))
+    modules.sort(key=lambda t: t.cumulative_ms, reverse=True)
+
+    first_use = [run.first_use_ms for run in results if run.first_use_ms is not None]
+    return StartupReport(
+        module=module,
+        lazy=lazy,
+        runs=len(results),
+        import_ms=statistics.median(run.import_ms for run in results),
+        first_use_ms=statistics.median(first_use) if first_use else None,
+        modules=modules,
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Budgets
+# --------------------------------------------------------------------------- #
+
+def check_budget(
+    report: StartupReport,
+    total_ms: Optional[float] = None,
+    first_use_ms: Optional[float] = None,
+    module_budgets: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Human-readable budget violations; empty when everything is within budget.
+
+    Module budgets apply to cumulative time, i.e. including what the module
+    imports itself. A module that wasn't imported at all is within budget.
+    """
+    violations: List[str] = []
+
+    if total_ms is not None and report.import_ms > total_ms:
+        violations.append(f"import {report.module}: {report.import_ms:.1f} ms > budget {total_ms:.1f} ms")
+
+    if first_use_ms is not None and report.first_use_ms is not None and report.first_use_ms > first_use_ms:
+        violations.append(f"first use: {report.first_use_ms:.1f} ms > budget {first_use_ms:.1f} ms")
+
+    by_name = {t.name: t for t in report.modules}
+    for name, budget in (module_budgets or {}).items():
+        timing = by_name.get(name)
+        if timing is not None and timing.cumulative_ms > budget:
+            violations.append(f"{name}: {timing.cumulative_ms:.1f} ms > budget {budget:.1f} ms")
+
+    return violations
+
+
+def _parse_module_budget(text: str):
+    name, sep, ms = text.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected MODULE=MS, got {text!r}")
+    try:
+        return name.strip(), float(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad budget in {text!r}") from None
+
+
+# --------------------------------------------------------------------------- #
+# Reporting
+# --------------------------------------------------------------------------- #
+
+def format_report(report: StartupReport, top: int = 25) -> str:
+    mode = "lazy" if report.lazy else "eager"
+    lines = [f"import {report.module} ({mode}, median of {report.runs}): {report.import_ms:.1f} ms"]
+    if report.first_use_ms is not None:
+        lines.append(f"first use after import: {report.first_use_ms:.1f} ms")
+
+    lines.append("")
+    lines.append(f"{'cumulative ms':>13} {'self ms':>9}  module")
+    for timing in report.modules[:top]:
+        lines.append(f"{timing.cumulative_ms:13.1f} {timing.self_ms:9.1f}  {'  ' * timing.depth}{timing.name}")
+
+    slowest_self = sorted(report.modules, key=lambda t: t.self_ms, reverse=True)[:10]
+    lines.append("")
+    lines.append("slowest by own time: " + ", ".join(f"{t.name} {t.self_ms:.1f} ms" for t in slowest_self))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m evefit_core.startup_profile",
+        description="Profile import time and cold start of a module.",
+    )
+    parser.add_argument("module", nargs="?", default="eos.db", help="module to import (default: eos.db)")
+    parser.add_argument("--lazy", action="store_true", help="import with EOS_LAZY_INIT=1")
+    parser.add_argument("--first-use", default="", metavar="STATEMENT", help="statement to time after the import")
+    parser.add_argument("--runs", type=int, default=3, help="measured runs (default: 3)")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured runs first (default: 1)")
+    parser.add_argument("--top", type=int, default=25, help="modules to list (default: 25)")
+    parser.add_argument("--budget-ms", type=float, help="budget for the whole import")
+    parser.add_argument("--first-use-budget-ms", type=float, help="budget for --first-use")
+    parser.add_argument(
+        "--budget",
+        action="append",
+        type=_parse_module_budget,
+        default=[],
+        metavar="MODULE=MS",
+        help="cumulative budget for one module, may be repeated",
+    )
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        report = profile_startup(args.module, args.lazy, args.first_use, args.runs, args.warmup)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    violations = check_budget(report, args.budget_ms, args.first_use_budget_ms, dict(args.budget))
+
+    if args.json:
+        data = {
+            "module": report.module,
+            "lazy": report.lazy,
+            "runs": report.runs,
+            "import_ms": report.import_ms,
+            "first_use_ms": report.first_use_ms,
+            "modules": [t.__dict__ for t in report.modules[: args.top]],
+            "violations": violations,
+        }
+        print(json.dumps(data, indent=2))
+    else:
+        print(format_report(report, args.top))
+        if violations:
+            print("\nBudget exceeded:")
+            for violation in violations:
+                print(f"  {violation}")
+
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+# evefit_core/type_index.py
+"""
+Name -> type ID index over the gamedata database.
+
+Built once with two plain SQL queries, instead of loading eos Item objects
+one name at a time, and then shared by everything that turns names into
+types (the fit parser, canonical slots):
+
+    index = TypeIndex.from_gamedata()
+    info = index.lookup("200mm AutoCannon II")   # TypeInfo or None
+    info.type_id, info.kind, info.slot           # 2881, "module", "high"
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+# Same default as eos.config.gamedata_connectionstring
+DEFAULT_GAMEDATA = Path(__file__).resolve().parent / "eve.db"
+
+# invcategories / invgroups IDs
+CATEGORY_SHIP = 6
+CATEGORY_MODULE = 7
+CATEGORY_CHARGE = 8
+CATEGORY_SKILL = 16
+CATEGORY_DRONE = 18
+CATEGORY_IMPLANT = 20
+CATEGORY_SUBSYSTEM = 32
+CATEGORY_STRUCTURE = 65
+CATEGORY_STRUCTURE_MODULE = 66
+CATEGORY_FIGHTER = 87
+GROUP_BOOSTER = 303
+
+# Slot effects -> slot names, as used by fit_canon
+SLOT_EFFECTS = {
+    11: "low",
+    13: "med",
+    12: "high",
+    2663: "rig",
+    3772: "subsystem",
+    6306: "service",
+}
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lookup form of a type name: single spaces, case-folded.
+    """
+    return _WS_RE.sub(" ", name).strip().casefold()
+
+
+@dataclass(frozen=True)
+class TypeInfo:
+    type_id: int
+    name: str
+    group_id: int
+    category_id: int
+    slot: Optional[str] = None
+
+    @property
+    def kind(self) -> str:
+        """
+        ship, module, charge, drone, fighter, implant, booster or other.
+        """
+        category = self.category_id
+        if category in (CATEGORY_SHIP, CATEGORY_STRUCTURE):
+            return "ship"
+        if category in (CATEGORY_MODULE, CATEGORY_SUBSYSTEM, CATEGORY_STRUCTURE_MODULE):
+            return "module"
+        if category == CATEGORY_CHARGE:
+            return "charge"
+        if category == CATEGORY_DRONE:
+            return "drone"
+        if category == CATEGORY_FIGHTER:
+            return "fighter"
+        if category == CATEGORY_IMPLANT:
+            return "booster" if self.group_id == GROUP_BOOSTER else "implant"
+        return "other"
+
+
+class TypeIndex:
+    """
+    Immutable lookup of types by (normalized) name and by ID.
+
+    `version` identifies the gamedata the index was read from, so results
+    derived from it can be cached per gamedata.
+    """
+
+    def __init__(self, types: Iterable[TypeInfo], version: Optional[str] = None) -> None:
+        self.version = version
+        self._by_id: Dict[int, TypeInfo] = {}
+        self._by_name: Dict[str, TypeInfo] = {}
+        for info in types:
+            self._by_id[info.type_id] = info
+            # Several unpublished types can share a name; the first one wins,
+            # and from_gamedata lists published types first
+            self._by_name.setdefault(normalize_name(info.name), info)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[TypeInfo]:
+        return iter(self._by_id.values())
+
+    def lookup(self, name: str) -> Optional[TypeInfo]:
+        return self._by_name.get(normalize_name(name))
+
+    def by_id(self, type_id: int) -> Optional[TypeInfo]:
+        return self._by_id.get(type_id)
+
+    def slot_of(self, name: str) -> Optional[str]:
+        """
+        Slot of a module by name; fits fit_canon.canonicalize(slot_of=...).
+        """
+        info = self.lookup(name)
+        return info.slot if info is not None else None
+
+    @classmethod
+    def from_gamedata(cls, path: Union[str, Path] = DEFAULT_GAMEDATA) -> "TypeIndex":
+        """
+        Read all types from a gamedata database (eve.db), read-only.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"no gamedata at {path}")
+
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            version = _client_build(conn)
+            if version is None:
+                st = path.stat()
+                version = f"{st.st_mtime_ns}-{st.st_size}"
+
+            slots: Dict[int, str] = {}
+            effect_ids = ",".join(str(e) for e in SLOT_EFFECTS)
+            for type_id, effect_id in conn.execute(
+                f"SELECT typeID, effectID FROM dgmtypeeffects WHERE effectID IN ({effect_ids})"
+            ):
+                slots[type_id] = SLOT_EFFECTS[effect_id]
+
+            rows = conn.execute(
+                "SELECT t.typeID, t.typeName, t.groupID, g.categoryID "
+                "FROM invtypes t JOIN invgroups g ON g.groupID = t.groupID "
+                "WHERE t.typeName IS NOT NULL "
+                "ORDER BY t.published DESC, t.typeID"
+            )
+            return cls(
+                (
+                    TypeInfo(type_id, name, group_id, category_id, slots.get(type_id))
+                    for type_id, name, group_id, category_id in rows
+                ),
+                version=version,
+            )
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Tuple[int, str, int, int, Optional[str]]],
+        version: Optional[str] = None,
+    ) -> "TypeIndex":
+        """
+        Build from (type_id, name, group_id, category_id, slot) tuples.
+        """
+        return cls((TypeInfo(*row) for row in rows), version=version)
+
+
+def _client_build(conn: sqlite3.Connection) -> Optional[str]:
+    # Same field eos_adapter.read_gamedata_version() reads
+    try:
+        row = conn.execute("SELECT field_value FROM metadata WHERE field_name LIKE 'client_build'").fetchone()
+    except sqlite3.Error:
+        return None
+    return str(row[0]) if row else None
+
+
+_index: Optional[TypeIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_type_index() -> Optional[TypeIndex]:
+    """
+    Process-wide index over the default gamedata, or None without gamedata.
+    """
+    global _index
+    with _index_lock:
+        if _index is None and DEFAULT_GAMEDATA.exists():
+            _index = TypeIndex.from_gamedata(DEFAULT_GAMEDATA)
+        return _index
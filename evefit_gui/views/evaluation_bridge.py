@@ -0,0 +1,48 @@
+# evefit_gui/views/evaluation_bridge.py
+
+from concurrent.futures import Future
+
+from PySide6.QtCore import QObject, Signal
+
+
+class EvaluationBridge(QObject):
+    """
+    Delivers results of background evaluations to the UI thread.
+
+    Futures complete on worker threads; the signals emitted here are queued
+    to the thread the bridge lives in, so slots may touch widgets freely.
+    Cancelled futures are dropped silently.
+    """
+
+    # (request id, EvaluatedFit)
+    finished = Signal(object, object)
+    # (request id, error message)
+    failed = Signal(object, str)
+    # (tag, result) of other background work, see watch_result()
+    result_ready = Signal(object, object)
+
+    def watch(self, request_id: int, future: Future) -> None:
+        future.add_done_callback(lambda f: self._on_done(request_id, f))
+
+    def _on_done(self, request_id: int, future: Future) -> None:
+        if future.cancelled():
+            return
+
+        exc = future.exception()
+        if exc is not None:
+            self.failed.emit(request_id, str(exc))
+            return
+
+        self.finished.emit(request_id, future.result())
+
+    def watch_result(self, tag, future: Future) -> None:
+        """
+        Emit result_ready(tag, result) once the future succeeds; failures
+        and cancellations are dropped.
+        """
+        future.add_done_callback(lambda f: self._on_result(tag, f))
+
+    def _on_result(self, tag, future: Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        self.result_ready.emit(tag, future.result())
@@ -0,0 +1,158 @@
+# evefit_gui/views/fit_list_model.py
+
+from typing import Callable, List, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from evefit_core.fit_models import Fit, FitStats
+
+
+StatsLookup = Callable[[Fit], Optional[FitStats]]
+
+
+class FitListModel(QAbstractListModel):
+    """
+    Lazy list model over a sequence of fits.
+
+    The model only keeps references to the fits; the view asks for row data
+    on demand, so nothing per-row is built up front. Rows are exposed to the
+    view in batches through canFetchMore/fetchMore, which keeps the first
+    paint cheap for very large libraries.
+
+    Sorting reorders the references only. Stat-based sort keys use whatever
+    the stats lookup has cached and never trigger an evaluation; fits without
+    cached stats always sort last.
+    """
+
+    FIT_ROLE = Qt.UserRole
+    FETCH_BATCH = 1000
+
+    # "library" keeps the order the fits were given in
+    SORT_KEYS = ("library", "name", "ship", "ehp", "dps", "volley")
+
+    def __init__(self, stats_lookup: Optional[StatsLookup] = None, parent=None):
+        super().__init__(parent)
+
+        self._stats_lookup = stats_lookup
+        # Fits in the order they were given, and in display order
+        self._source: List[Fit] = []
+        self._rows: List[Fit] = []
+        self._loaded = 0
+        self._sort_key = "library"
+        self._descending = False
+
+    # -------------------------
+    # Qt model API
+    # -------------------------
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._loaded
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        if row < 0 or row >= self._loaded:
+            return None
+
+        fit = self._rows[row]
+
+        if role == Qt.DisplayRole:
+            return fit.name
+        if role == Qt.ToolTipRole:
+            return fit.ship_type
+        if role == self.FIT_ROLE:
+            return fit
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._loaded < len(self._rows)
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        if parent.isValid():
+            return
+
+        remaining = len(self._rows) - self._loaded
+        count = min(self.FETCH_BATCH, remaining)
+        if count <= 0:
+            return
+
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def set_fits(self, fits: Sequence[Fit]) -> None:
+        """
+        Replace all rows. Keeps the current sort order.
+        """
+        self.beginResetModel()
+        self._source = list(fits)
+        self._apply_sort()
+        self._loaded = min(self.FETCH_BATCH, len(self._rows))
+        self.endResetModel()
+
+    def set_sort(self, key: str, descending: bool = False) -> None:
+        if key not in self.SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {key!r}")
+
+        self._sort_key = key
+        self._descending = descending
+
+        self.beginResetModel()
+        self._apply_sort()
+        self._loaded = min(max(self._loaded, self.FETCH_BATCH), len(self._rows))
+        self.endResetModel()
+
+    def fit_at(self, row: int) -> Optional[Fit]:
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def row_of(self, fit_id: str) -> int:
+        """
+        Row of the first fit with the given id, or -1.
+
+        Rows beyond the loaded range are fetched so the returned row is valid
+        for the view.
+        """
+        for row, fit in enumerate(self._rows):
+            if fit.id == fit_id:
+                while self._loaded <= row:
+                    self.fetchMore()
+                return row
+        return -1
+
+    # -------------------------
+    # Sorting
+    # -------------------------
+    def _apply_sort(self) -> None:
+        key = self._sort_key
+        reverse = self._descending
+
+        if key == "library":
+            self._rows = list(self._source)
+        elif key == "name":
+            self._rows = sorted(self._source, key=lambda f: f.name.lower(), reverse=reverse)
+        elif key == "ship":
+            self._rows = sorted(
+                self._source, key=lambda f: (f.ship_type.lower(), f.name.lower()), reverse=reverse
+            )
+        else:
+            lookup = self._stats_lookup
+            with_stats = []
+            without_stats = []
+            for fit in self._source:
+                stats = lookup(fit) if lookup is not None else None
+                if stats is None:
+                    without_stats.append(fit)
+                else:
+                    with_stats.append((getattr(stats, key), fit))
+            with_stats.sort(key=lambda pair: pair[0], reverse=reverse)
+            self._rows = [fit for _, fit in with_stats] + without_stats
@@ -1,41 +1,86 @@
 # evefit_gui/views/main_window.py
 
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
     QHBoxLayout,
-    QListWidget,
-    QListWidgetItem,
+    QListView,
     QVBoxLayout,
     QLabel,
     QToolBar,
     QComboBox,
     QLineEdit,
     QMessageBox,
+    QFileDialog,
 )
 from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QModelIndex, QTimer
 
+from evefit_core.evaluation import FitEvaluator
 from evefit_core.fit_engine import FitEngine
-from evefit_core.fit_models import Fit, SkillProfile
+from evefit_core.fit_canon import EftFormatError, FingerprintIndex, fit_fingerprint
+from evefit_core.fit_index import FitSearchIndex
+from evefit_core.fit_parser import FitParser, ParsedFit, ParseIssue
+from evefit_core.fit_models import Fit, FitStats, SkillProfile
+from evefit_core.result_cache import PersistentEvaluationCache
 from evefit_core.storage import load_fits, save_fits
-from evefit_core.skills import load_skill_profiles
+from evefit_core.skills import get_skill_repository
+from evefit_core.type_index import get_type_index
 
 from .add_fit_dialog import AddFitDialog
+from .evaluation_bridge import EvaluationBridge
+from .fit_list_model import FitListModel
 from .manage_profiles_dialog import ManageProfilesDialog
 
 
 class MainWindow(QMainWindow):
+    # Delay between the last keystroke and running the search
+    SEARCH_DEBOUNCE_MS = 150
+
+    # Number of rows above and below the selection to evaluate in the
+    # background after each selection change. 0 disables prefetching.
+    PREFETCH_NEIGHBOURS = 0
+
+    # Parse problems listed in the summary after an import
+    IMPORT_ISSUES_SHOWN = 10
+
+    # (label, model sort key, descending)
+    SORT_OPTIONS = (
+        ("Library order", "library", False),
+        ("Name", "name", False),
+        ("Ship", "ship", False),
+        ("EHP", "ehp", True),
+        ("DPS", "dps", True),
+        ("Volley", "volley", True),
+    )
+
     def __init__(self):
         super().__init__()
 
         self.setWindowTitle("EVE Fit Tool – Personal Planner")
 
-        # Core engine
+        # Core engine; evaluations run on a worker pool with a result cache
         self.engine = FitEngine()
+        self.result_cache = PersistentEvaluationCache(gamedata_version=self.engine.gamedata_version)
+        self.evaluator = FitEvaluator(self.engine, cache=self.result_cache)
+        self.evaluation_bridge = EvaluationBridge(self)
+        self.evaluation_bridge.finished.connect(self._on_evaluation_finished)
+        self.evaluation_bridge.failed.connect(self._on_evaluation_failed)
+        self.evaluation_bridge.result_ready.connect(self._on_background_result)
+        self._request_id = 0
+        # Fit id -> stats with the active profile, all the stat sorts look
+        # at. Filled from evaluation results and batched cache lookups run
+        # on _stats_loader, so sorting never touches the cache itself.
+        self._known_stats: Dict[str, FitStats] = {}
+        self._stats_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stats-load")
 
         # Skill profiles
-        self.skill_profiles = load_skill_profiles()
+        self.skill_repository = get_skill_repository()
+        self.skill_profiles = self.skill_repository.profiles()
+        self._skill_generation = self.skill_repository.generation
         self.active_skill_profile: SkillProfile = self.skill_profiles[0]
 
         # Load fits from disk; if none, start with some dummy fits
@@ -59,10 +104,18 @@ class MainWindow(QMainWindow):
             ]
 
         # Filtered list for search
+        self.search_index = FitSearchIndex(self.fits)
+        # Spots fits that are already in the library under another name.
+        # Fingerprinting parses every fit, so the index is built on
+        # _stats_loader and is None until it arrives.
+        self.fingerprints: Optional[FingerprintIndex] = None
+        self._fingerprint_build: Optional[Tuple[List[Fit], Future]] = None
         self.filtered_fits = list(self.fits)
 
         self._build_ui()
         self._populate_fits()
+        self._load_cached_stats(self.fits)
+        self._build_fingerprints()
 
     # -------------------------
     # UI Setup
@@ -77,6 +130,11 @@ class MainWindow(QMainWindow):
         action_add_fit.triggered.connect(self._on_add_fit)
         toolbar.addAction(action_add_fit)
 
+        # Import a file of EFT/DNA fits
+        action_import = QAction("Import…", self)
+        action_import.triggered.connect(self._on_import_fits)
+        toolbar.addAction(action_import)
+
         # Edit fit
         action_edit_fit = QAction("Edit", self)
         action_edit_fit.triggered.connect(self._on_edit_fit)
@@ -107,17 +165,34 @@ class MainWindow(QMainWindow):
         toolbar.addWidget(QLabel(" Search: "))
 
         self.search_edit = QLineEdit()
-        self.search_edit.setPlaceholderText("Name, ship, or EFT text...")
+        self.search_edit.setPlaceholderText("Name, ship, or module...")
         self.search_edit.textChanged.connect(self._on_search_text_changed)
         toolbar.addWidget(self.search_edit)
 
+        # Sort order
+        toolbar.addWidget(QLabel(" Sort: "))
+
+        self.sort_combo = QComboBox()
+        for label, key, descending in self.SORT_OPTIONS:
+            self.sort_combo.addItem(label, (key, descending))
+        self.sort_combo.currentIndexChanged.connect(self._on_sort_changed)
+        toolbar.addWidget(self.sort_combo)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._refresh_filtered_fits)
+
         # Main layout
         central = QWidget()
         layout = QHBoxLayout(central)
 
         # Left: fits list
-        self.fit_list = QListWidget()
-        self.fit_list.currentItemChanged.connect(self._on_fit_selected)
+        self.fit_model = FitListModel(stats_lookup=self._cached_stats, parent=self)
+        self.fit_list = QListView()
+        self.fit_list.setUniformItemSizes(True)
+        self.fit_list.setModel(self.fit_model)
+        self.fit_list.selectionModel().currentChanged.connect(self._on_fit_selected)
 
         # Right: stats panel
         right = QWidget()
@@ -148,15 +223,24 @@ class MainWindow(QMainWindow):
         if isinstance(profile, SkillProfile):
             self.active_skill_profile = profile
             self.label_profile.setText(f"Profile: {profile.name}")
+            self._known_stats.clear()
+            self._load_cached_stats(self.fits)
 
-            current = self.fit_list.currentItem()
-            if current is not None:
+            current = self.fit_list.currentIndex()
+            if current.isValid():
                 self._on_fit_selected(current, None)
 
     def _reload_skill_profiles(self):
         current_name = self.active_skill_profile.name if self.active_skill_profile else None
 
-        self.skill_profiles = load_skill_profiles()
+        # Only changed files are re-read; if nothing changed at all,
+        # keep the combo box as it is.
+        self.skill_repository.refresh()
+        if self.skill_repository.generation == self._skill_generation:
+            return
+        self._skill_generation = self.skill_repository.generation
+
+        self.skill_profiles = self.skill_repository.profiles()
         if not self.skill_profiles:
             self.active_skill_profile = SkillProfile(name="No skills (dummy)", skills={})
             self.skill_profiles = [self.active_skill_profile]
@@ -175,6 +259,8 @@ class MainWindow(QMainWindow):
 
         self.active_skill_profile = self.skill_profiles[selected_index]
         self.label_profile.setText(f"Profile: {self.active_skill_profile.name}")
+        self._known_stats.clear()
+        self._load_cached_stats(self.fits)
 
     def _on_manage_profiles(self):
         dlg = ManageProfilesDialog(self)
@@ -185,22 +271,13 @@ class MainWindow(QMainWindow):
     # Filtering
     # -------------------------
     def _on_search_text_changed(self, text: str):
-        self._refresh_filtered_fits()
+        # Restart the timer on every keystroke; only the final text is searched
+        self.search_timer.start()
 
     def _refresh_filtered_fits(self):
-        query = self.search_edit.text().strip().lower()
-        if not query:
-            self.filtered_fits = list(self.fits)
-        else:
-            filtered = []
-            for fit in self.fits:
-                if (
-                    query in fit.name.lower()
-                    or query in fit.ship_type.lower()
-                    or query in fit.eft_text.lower()
-                ):
-                    filtered.append(fit)
-            self.filtered_fits = filtered
+        self.search_timer.stop()
+
+        self.filtered_fits = self.search_index.search(self.search_edit.text())
 
         self._populate_fits()
 
@@ -208,12 +285,97 @@ class MainWindow(QMainWindow):
     # Fit List
     # -------------------------
     def _populate_fits(self):
-        self.fit_list.clear()
+        # Resetting the model drops the selection, so outstanding results
+        # no longer belong to anything on screen
+        self._request_id += 1
+        self.fit_model.set_fits(self.filtered_fits)
+
+    def _current_fit(self) -> Optional[Fit]:
+        current = self.fit_list.currentIndex()
+        if not current.isValid():
+            return None
+        return self.fit_model.data(current, FitListModel.FIT_ROLE)
+
+    def _cached_stats(self, fit: Fit) -> Optional[FitStats]:
+        return self._known_stats.get(fit.id)
+
+    def _load_cached_stats(self, fits: List[Fit]):
+        # Look the fits up in the result cache in one batch, off the UI thread
+        if not fits:
+            return
+        profile = self.active_skill_profile
+        future = self._stats_loader.submit(self.evaluator.cached_many, list(fits), profile)
+        self.evaluation_bridge.watch_result(("stats", profile.name), future)
+
+    def _on_background_result(self, tag, result):
+        kind, key = tag
+        if kind == "stats":
+            self._on_cached_stats_loaded(key, result)
+        elif kind == "fingerprints":
+            self._publish_fingerprints(key, result)
+        elif kind == "import":
+            self._on_import_parsed(*result)
+
+    def _on_cached_stats_loaded(self, profile_name: str, found: Dict[str, FitStats]):
+        if profile_name != self.active_skill_profile.name or not found:
+            return
+        # Results that arrived in the meantime are newer
+        for fit_id, stats in found.items():
+            self._known_stats.setdefault(fit_id, stats)
+        self._resort_by_stats()
+
+    def _build_fingerprints(self):
+        snapshot = list(self.fits)
+        future = self._stats_loader.submit(FingerprintIndex, snapshot)
+        self._fingerprint_build = (snapshot, future)
+        self.evaluation_bridge.watch_result(("fingerprints", snapshot), future)
+
+    def _publish_fingerprints(self, snapshot: List[Fit], index: FingerprintIndex):
+        if self.fingerprints is not None:
+            return
+        # The index was built from a snapshot; catch up with fits added,
+        # edited or deleted while it was being built
+        current = {id(f) for f in self.fits}
+        built = {id(f) for f in snapshot}
+        for f in snapshot:
+            if id(f) not in current:
+                index.remove(f)
+        for f in self.fits:
+            if id(f) not in built:
+                index.add(f)
+        self.fingerprints = index
+        self._fingerprint_build = None
+
+    def _ready_fingerprints(self) -> FingerprintIndex:
+        # Duplicate checks need the whole library; wait for the build if a
+        # fit is added right after startup
+        if self.fingerprints is None:
+            snapshot, future = self._fingerprint_build
+            self._publish_fingerprints(snapshot, future.result())
+        return self.fingerprints
+
+    def _remember_stats(self, evaluated):
+        if evaluated.skill_profile.name == self.active_skill_profile.name:
+            self._known_stats[evaluated.fit.id] = evaluated.stats
+
+    def _resort_by_stats(self):
+        key, descending = self.sort_combo.currentData()
+        if key in ("library", "name", "ship"):
+            return
+        current = self._current_fit()
+        self.fit_model.set_sort(key, descending)
+        if current is not None:
+            self._select_fit_by_id(current.id)
+
+    def _on_sort_changed(self, index: int):
+        if index < 0:
+            return
+        key, descending = self.sort_combo.itemData(index)
 
-        for fit in self.filtered_fits:
-            item = QListWidgetItem(fit.name)
-            item.setData(Qt.UserRole, fit)
-            self.fit_list.addItem(item)
+        current = self._current_fit()
+        self.fit_model.set_sort(key, descending)
+        if current is not None:
+            self._select_fit_by_id(current.id)
 
     # -------------------------
     # Add Fit
@@ -223,21 +385,100 @@ class MainWindow(QMainWindow):
         if dlg.exec():
             new_fit = dlg.result_fit
             if new_fit:
+                twin = self._ready_fingerprints().find(new_fit)
+                if twin is not None:
+                    reply = QMessageBox.question(
+                        self,
+                        "Duplicate fit",
+                        f"This fit is identical to:\n\n{twin.name} – {twin.ship_type}\n\nAdd it anyway?",
+                        QMessageBox.Yes | QMessageBox.No,
+                        QMessageBox.No,
+                    )
+                    if reply != QMessageBox.Yes:
+                        self._select_fit_by_id(twin.id)
+                        return
                 self.fits.append(new_fit)
+                self.search_index.add(new_fit)
+                self._ready_fingerprints().add(new_fit)
                 save_fits(self.fits)
                 self._refresh_filtered_fits()
+                self._load_cached_stats([new_fit])
+
+    # -------------------------
+    # Import Fits
+    # -------------------------
+    def _on_import_fits(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import fits", "", "Fits (*.txt *.eft *.cfg);;All files (*)")
+        if not path:
+            return
+
+        # Queued behind the fingerprint build, so the index is ready by the
+        # time the results come back
+        future = self._stats_loader.submit(self._read_import, path)
+        self.evaluation_bridge.watch_result(("import", path), future)
+
+    @staticmethod
+    def _read_import(path: str) -> Tuple[List[Tuple[ParsedFit, Fit]], List[ParseIssue], Optional[str]]:
+        # Runs on _stats_loader. Fingerprints every fit once so the
+        # duplicate check on the UI thread only hits the cache.
+        parser = FitParser(get_type_index())
+        results = []
+        error = None
+        try:
+            for parsed in parser.parse_file(path):
+                fit = parsed.to_fit()
+                try:
+                    fit_fingerprint(fit)
+                except EftFormatError:
+                    pass
+                results.append((parsed, fit))
+        except OSError as e:
+            error = str(e)
+        return results, parser.stray_issues, error
+
+    def _on_import_parsed(
+        self, results: List[Tuple[ParsedFit, Fit]], stray_issues: List[ParseIssue], error: Optional[str]
+    ):
+        if error is not None:
+            QMessageBox.warning(self, "Import failed", error)
+
+        fingerprints = self._ready_fingerprints()
+        added = duplicates = 0
+        imported = []
+        issues = []
+        for parsed, fit in results:
+            issues.extend(parsed.issues)
+            if fingerprints.find(fit) is not None:
+                duplicates += 1
+                continue
+            self.fits.append(fit)
+            self.search_index.add(fit)
+            fingerprints.add(fit)
+            imported.append(fit)
+            added += 1
+        issues.extend(stray_issues)
+
+        if added:
+            save_fits(self.fits)
+            self._refresh_filtered_fits()
+            self._load_cached_stats(imported)
+
+        summary = f"Imported {added} fits, skipped {duplicates} already in the library."
+        if issues:
+            shown = "\n".join(f"line {i.line}: {i.message}" for i in issues[: self.IMPORT_ISSUES_SHOWN])
+            more = len(issues) - self.IMPORT_ISSUES_SHOWN
+            summary += f"\n\n{len(issues)} problems:\n{shown}" + (f"\n… and {more} more" if more > 0 else "")
+        QMessageBox.information(self, "Import", summary)
 
     # -------------------------
     # Edit Fit
     # -------------------------
     def _on_edit_fit(self):
-        current_item = self.fit_list.currentItem()
-        if current_item is None:
+        fit = self._current_fit()
+        if fit is None:
             QMessageBox.information(self, "No selection", "Select a fit to edit.")
             return
 
-        fit: Fit = current_item.data(Qt.UserRole)
-
         dlg = AddFitDialog(self, existing_fit=fit)
         if not dlg.exec():
             return
@@ -249,23 +490,26 @@ class MainWindow(QMainWindow):
         for idx, f in enumerate(self.fits):
             if f is fit or f.id == fit.id:
                 self.fits[idx] = updated_fit
+                self.search_index.replace(f, updated_fit)
+                if self.fingerprints is not None:
+                    self.fingerprints.replace(f, updated_fit)
                 break
 
+        self._known_stats.pop(fit.id, None)
         save_fits(self.fits)
         self._refresh_filtered_fits()
         self._select_fit_by_id(updated_fit.id)
+        self._load_cached_stats([updated_fit])
 
     # -------------------------
     # Delete Fit
     # -------------------------
     def _on_delete_fit(self):
-        current_item = self.fit_list.currentItem()
-        if current_item is None:
+        fit = self._current_fit()
+        if fit is None:
             QMessageBox.information(self, "No selection", "Select a fit to delete.")
             return
 
-        fit: Fit = current_item.data(Qt.UserRole)
-
         reply = QMessageBox.question(
             self,
             "Delete fit",
@@ -276,7 +520,13 @@ class MainWindow(QMainWindow):
         if reply != QMessageBox.Yes:
             return
 
+        removed = [f for f in self.fits if f is fit or f.id == fit.id]
         self.fits = [f for f in self.fits if f is not fit and f.id != fit.id]
+        for f in removed:
+            self.search_index.remove(f)
+            if self.fingerprints is not None:
+                self.fingerprints.remove(f)
+            self._known_stats.pop(f.id, None)
         save_fits(self.fits)
 
         self._refresh_filtered_fits()
@@ -285,27 +535,58 @@ class MainWindow(QMainWindow):
         self.label_stats.setText("(stats will appear here)")
 
     def _select_fit_by_id(self, fit_id: str):
-        for i in range(self.fit_list.count()):
-            item = self.fit_list.item(i)
-            fit = item.data(Qt.UserRole)
-            if isinstance(fit, Fit) and fit.id == fit_id:
-                self.fit_list.setCurrentItem(item)
-                break
+        row = self.fit_model.row_of(fit_id)
+        if row >= 0:
+            self.fit_list.setCurrentIndex(self.fit_model.index(row))
 
     # -------------------------
     # Fit Selection
     # -------------------------
-    def _on_fit_selected(self, current: QListWidgetItem, previous):
-        if current is None:
+    def _on_fit_selected(self, current: QModelIndex, previous):
+        if current is None or not current.isValid():
             return
 
-        fit: Fit = current.data(Qt.UserRole)
-        evaluated = self.engine.evaluate_fit(fit, self.active_skill_profile)
-        stats = evaluated.stats
+        fit: Fit = self.fit_model.data(current, FitListModel.FIT_ROLE)
+        profile = self.active_skill_profile
+
+        # Anything still queued is for a selection the user has left
+        self.evaluator.cancel_pending()
+        self._request_id += 1
 
         self.label_title.setText(f"{fit.name} – {fit.ship_type}")
-        self.label_profile.setText(f"Profile: {self.active_skill_profile.name}")
+        self.label_profile.setText(f"Profile: {profile.name}")
+
+        evaluated = self.evaluator.cached(fit, profile)
+        if evaluated is not None:
+            self._remember_stats(evaluated)
+            self._show_stats(evaluated.stats)
+        else:
+            self.label_stats.setText("(evaluating...)")
+            self.evaluation_bridge.watch(self._request_id, self.evaluator.submit(fit, profile))
+
+        self._prefetch_around(current.row(), profile)
+
+    def _prefetch_around(self, row: int, profile: SkillProfile):
+        for offset in range(1, self.PREFETCH_NEIGHBOURS + 1):
+            for neighbour in (row + offset, row - offset):
+                fit = self.fit_model.fit_at(neighbour)
+                if fit is not None:
+                    # Never the current request id; only remembered
+                    self.evaluation_bridge.watch(-1, self.evaluator.submit(fit, profile))
+
+    def _on_evaluation_finished(self, request_id: int, evaluated):
+        self._remember_stats(evaluated)
+        # Results of stale requests are cached already; only show the latest
+        if request_id != self._request_id:
+            return
+        self._show_stats(evaluated.stats)
+
+    def _on_evaluation_failed(self, request_id: int, message: str):
+        if request_id != self._request_id:
+            return
+        self.label_stats.setText(f"(evaluation failed: {message})")
 
+    def _show_stats(self, stats: FitStats):
         lines = [
             f"EHP: {stats.ehp:.1f}",
             f"DPS: {stats.dps:.1f}",
@@ -329,3 +610,9 @@ class MainWindow(QMainWindow):
                 lines.append(f"  {key}: {val}")
 
         self.label_stats.setText("\n".join(lines))
+
+    def closeEvent(self, event):
+        self.evaluator.shutdown()
+        self._stats_loader.shutdown(wait=True, cancel_futures=True)
+        self.result_cache.close()
+        super().closeEvent(event)
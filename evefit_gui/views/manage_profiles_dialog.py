@@ -14,12 +14,7 @@ from PySide6.QtWidgets import (
 )
 
 from evefit_core.fit_models import SkillProfile
-from evefit_core.skills import (
-    load_skill_profiles,
-    save_skill_profile,
-    delete_skill_profile,
-    rename_skill_profile,
-)
+from evefit_core.skills import get_skill_repository
 
 
 class ManageProfilesDialog(QDialog):
@@ -34,7 +29,8 @@ class ManageProfilesDialog(QDialog):
         super().__init__(parent)
 
         self.setWindowTitle("Manage Profiles")
-        self.profiles: List[SkillProfile] = load_skill_profiles()
+        self.repository = get_skill_repository()
+        self.profiles: List[SkillProfile] = self.repository.profiles()
 
         layout = QVBoxLayout(self)
 
@@ -93,8 +89,8 @@ class ManageProfilesDialog(QDialog):
             return
 
         profile = SkillProfile(name=name, skills={})
-        save_skill_profile(profile)
-        self.profiles = load_skill_profiles()
+        self.repository.save(profile)
+        self.profiles = self.repository.profiles()
         self._populate_list()
 
     def _on_rename(self):
@@ -124,8 +120,8 @@ class ManageProfilesDialog(QDialog):
             QMessageBox.warning(self, "Duplicate", "A profile with this name already exists.")
             return
 
-        rename_skill_profile(current_profile.name, new_name)
-        self.profiles = load_skill_profiles()
+        self.repository.rename(current_profile.name, new_name)
+        self.profiles = self.repository.profiles()
         self._populate_list()
 
     def _on_delete(self):
@@ -146,6 +142,6 @@ class ManageProfilesDialog(QDialog):
         if reply != QMessageBox.Yes:
             return
 
-        delete_skill_profile(profile.name)
-        self.profiles = load_skill_profiles()
+        self.repository.delete(profile.name)
+        self.profiles = self.repository.profiles()
         self._populate_list()
@@ -0,0 +1,73 @@
+import pytest
+
+from evefit_core import fit_canon
+from evefit_core.fit_canon import fit_fingerprint
+from evefit_core.fit_models import Fit
+from evefit_core.type_index import TypeIndex
+
+ROWS = [
+    (587, "Rifter", 25, 6, None),
+    (2048, "Damage Control II", 60, 7, "low"),
+    (12058, "1MN Afterburner II", 46, 7, "med"),
+    (2881, "200mm AutoCannon II", 55, 7, "high"),
+    (12608, "Hail S", 83, 8, None),
+    (2456, "Hobgoblin II", 100, 18, None),
+]
+
+
+@pytest.fixture
+def type_index(monkeypatch):
+    indexes = {"current": TypeIndex.from_rows(ROWS, version="1")}
+    monkeypatch.setattr(fit_canon, "get_type_index", lambda: indexes["current"])
+    return indexes
+
+
+def fingerprint(text, ignore_state=False, name="Fit"):
+    return fit_fingerprint(Fit(id=name, name=name, ship_type="Rifter", eft_text=text), ignore_state)
+
+
+EFT = """\
+[Rifter, Brawler]
+Damage Control II
+
+1MN Afterburner II
+
+200mm AutoCannon II, Hail S
+200mm AutoCannon II
+
+Hobgoblin II x3
+"""
+
+
+def test_line_order_whitespace_and_name_dont_count(type_index):
+    reordered = """\
+[Rifter, Something Else]
+Damage Control II
+
+  1MN Afterburner II
+
+
+200mm   AutoCannon II
+200mm AutoCannon II,Hail S
+
+Hobgoblin II x3
+"""
+    assert fingerprint(reordered, name="Other") == fingerprint(EFT)
+
+
+def test_offline_markers_count_unless_state_is_ignored(type_index):
+    offline = EFT.replace("1MN Afterburner II\n", "1MN Afterburner II /offline\n")
+    shouting = EFT.replace("1MN Afterburner II\n", "1MN Afterburner II  /OFFLINE\n")
+
+    assert fingerprint(offline) != fingerprint(EFT)
+    assert fingerprint(offline) == fingerprint(shouting)
+    assert fingerprint(offline, ignore_state=True) == fingerprint(EFT, ignore_state=True)
+
+
+def test_new_gamedata_is_not_served_from_the_cache(type_index):
+    # Module slots come from the type index; give one another slot
+    before = fingerprint(EFT)
+
+    rows = [row if row[0] != 2048 else row[:4] + ("med",) for row in ROWS]
+    type_index["current"] = TypeIndex.from_rows(rows, version="2")
+    assert fingerprint(EFT) != before
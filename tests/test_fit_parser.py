@@ -0,0 +1,203 @@
+import pytest
+
+from evefit_core.fit_canon import canonicalize
+from evefit_core.fit_parser import FitParser
+from evefit_core.type_index import TypeIndex
+
+
+@pytest.fixture
+def index():
+    return TypeIndex.from_rows([
+        (587, "Rifter", 25, 6, None),
+        (2048, "Damage Control II", 60, 7, "low"),
+        (52227, "Abyssal Damage Control", 60, 7, "low"),
+        (12058, "1MN Afterburner II", 46, 7, "med"),
+        (2881, "200mm AutoCannon II", 55, 7, "high"),
+        (31718, "Small Projectile Burst Aerator I", 1233, 7, "rig"),
+        (12608, "Hail S", 83, 8, None),
+        (2456, "Hobgoblin II", 100, 18, None),
+        (40556, "Templar II", 1652, 87, None),
+        (10228, "Zainou 'Gnome' Shield Management SM-703", 300, 20, None),
+        (28672, "Synth Blue Pill Booster", 303, 20, None),
+        (47781, "Unstable Damage Control Mutaplasmid", 1964, 17, None),
+        (34, "Tritanium", 18, 4, None),
+    ])
+
+
+def parse_one(text, index=None):
+    fits = list(FitParser(index).parse_text(text))
+    assert len(fits) == 1
+    return fits[0]
+
+
+def items_by_name(parsed):
+    return {item.name: item for item in parsed.items}
+
+
+EFT = """\
+[Rifter, Brawler]
+Damage Control II
+
+1MN Afterburner II /offline
+
+200mm AutoCannon II, Hail S
+200mm AutoCannon II, Hail S
+
+Small Projectile Burst Aerator I
+
+Zainou 'Gnome' Shield Management SM-703
+Synth Blue Pill Booster
+
+Hobgoblin II x3
+
+Tritanium x100
+"""
+
+
+def test_eft_resolves_slots_charges_and_states(index):
+    parsed = parse_one(EFT, index)
+
+    assert parsed.source == "eft"
+    assert (parsed.ship_type, parsed.ship_type_id, parsed.name) == ("Rifter", 587, "Brawler")
+    assert parsed.issues == []
+
+    items = items_by_name(parsed)
+    assert items["Damage Control II"].slot == "low"
+    assert items["1MN Afterburner II"].slot == "med"
+    assert items["1MN Afterburner II"].offline
+    assert items["Small Projectile Burst Aerator I"].slot == "rig"
+
+    guns = [item for item in parsed.items if item.name == "200mm AutoCannon II"]
+    assert len(guns) == 2
+    assert all(gun.slot == "high" and (gun.charge, gun.charge_id) == ("Hail S", 12608) for gun in guns)
+
+
+def test_eft_classifies_bays(index):
+    items = items_by_name(parse_one(EFT, index))
+
+    assert items["Zainou 'Gnome' Shield Management SM-703"].kind == "implant"
+    assert items["Synth Blue Pill Booster"].kind == "booster"
+    assert (items["Hobgoblin II"].kind, items["Hobgoblin II"].quantity) == ("drone", 3)
+    assert (items["Tritanium"].kind, items["Tritanium"].quantity) == ("cargo", 100)
+
+
+def test_counted_sections_by_content(index):
+    parsed = parse_one(
+        "[Rifter, Bays]\n\nTemplar II x2\n\nHobgoblin II x1\nTritanium x5\n",
+        index,
+    )
+    kinds = {item.name: item.kind for item in parsed.items}
+    assert kinds == {"Templar II": "fighter", "Hobgoblin II": "cargo", "Tritanium": "cargo"}
+
+
+def test_eft_without_index_uses_section_layout():
+    parsed = parse_one(EFT)
+
+    assert parsed.ship_type_id is None
+    assert parsed.issues == []
+    slots = {item.name: item.slot for item in parsed.items if item.kind == "module"}
+    assert slots["Damage Control II"] == "low"
+    assert slots["1MN Afterburner II"] == "med"
+    assert slots["200mm AutoCannon II"] == "high"
+    assert slots["Small Projectile Burst Aerator I"] == "rig"
+    bays = {item.name: item.kind for item in parsed.items if item.kind != "module"}
+    assert bays == {"Hobgoblin II": "drone", "Tritanium": "cargo"}
+
+
+def test_mutated_module(index):
+    parsed = parse_one(
+        "[Rifter, Mutated]\n"
+        "Abyssal Damage Control [1]\n"
+        "\n"
+        "[1] Abyssal Damage Control\n"
+        "  Unstable Damage Control Mutaplasmid\n"
+        "  cpu 20.5, hullEmDamageResonance 0.6\n",
+        index,
+    )
+
+    assert parsed.issues == []
+    (item,) = parsed.items
+    assert (item.name, item.slot) == ("Abyssal Damage Control", "low")
+    mutation = item.mutation
+    assert (mutation.result_name, mutation.result_id) == ("Abyssal Damage Control", 52227)
+    assert (mutation.mutaplasmid, mutation.mutaplasmid_id) == ("Unstable Damage Control Mutaplasmid", 47781)
+    assert mutation.attributes == {"cpu": 20.5, "hullEmDamageResonance": 0.6}
+
+    again = parse_one(parsed.to_eft(), index)
+    assert again.items[0].mutation == mutation
+
+
+def test_dna(index):
+    parsed = parse_one("587:2048;1:2881;3:2456;5:34_;10::", index)
+
+    assert parsed.source == "dna"
+    assert (parsed.ship_type, parsed.ship_type_id) == ("Rifter", 587)
+    assert parsed.issues == []
+    summary = [(item.name, item.kind, item.quantity, item.slot) for item in parsed.items]
+    assert summary == [
+        ("Damage Control II", "module", 1, "low"),
+        ("200mm AutoCannon II", "module", 3, "high"),
+        ("Hobgoblin II", "drone", 5, None),
+        ("Tritanium", "cargo", 10, None),
+    ]
+
+
+def test_issues_carry_line_numbers(index):
+    parser = FitParser(index)
+    fits = list(parser.parse_text(
+        "stray text\n"
+        "[Rifter, Broken]\n"
+        "Damage Control II\n"
+        "Not A Module\n"
+        "\n"
+        "200mm AutoCannon II, Not A Charge\n"
+        "Damage Control II [7]\n"
+        "Hobgoblin II, Hail S\n"
+        "\n"
+        "Nothing Here x2\n"
+        "587:999999;1::\n"
+    ))
+
+    assert [(issue.line, issue.text) for issue in parser.stray_issues] == [(1, "stray text")]
+    eft, dna = fits
+    assert [(issue.line, issue.message) for issue in eft.issues] == [
+        (4, "unknown type 'Not A Module'"),
+        (6, "unknown type 'Not A Charge'"),
+        (7, "no mutation [7] in this fit"),
+        (8, "'Hobgoblin II' is not a module"),
+        (10, "unknown type 'Nothing Here'"),
+    ]
+    assert [(issue.line, issue.message) for issue in dna.issues] == [(11, "unknown type ID 999999")]
+    # Unknown lines are left out, the rest of the fit is kept
+    assert [item.name for item in eft.items] == [
+        "Damage Control II", "200mm AutoCannon II", "Damage Control II", "Hobgoblin II"]
+
+
+def test_several_fits_in_one_dump(index):
+    fits = list(FitParser(index).parse_text(EFT + "\n# next\n587:2881;3::\n" + EFT))
+    assert [(fit.source, fit.line) for fit in fits] == [("eft", 1), ("dna", 19), ("eft", 20)]
+
+
+def test_to_eft_keeps_empty_racks(index):
+    parsed = parse_one("587:2881;3:12058;1::", index)
+    text = parsed.to_eft()
+
+    assert text.split("\n\n")[1] == "[Empty Low slot]"
+    slots = {item.name: item.slot for item in parse_one(text).items}
+    assert slots == {"1MN Afterburner II": "med", "200mm AutoCannon II": "high"}
+    entries = {entry.type_name: entry.slot for entry, _ in canonicalize(text).entries}
+    assert entries == {"1MN Afterburner II": "med", "200mm AutoCannon II": "high"}
+
+
+def test_to_eft_stops_after_last_filled_rack(index):
+    text = parse_one("587:2048;1::", index).to_eft()
+    assert text == "[Rifter, Rifter (DNA)]\n\nDamage Control II"
+
+
+def test_to_fit_ids_are_unique(index):
+    fits = list(FitParser(index).parse_text(EFT + "\n" + EFT))
+    first, second = (parsed.to_fit() for parsed in fits)
+
+    assert (first.name, first.ship_type) == (second.name, second.ship_type)
+    assert first.id != second.id
+    assert first.eft_text == fits[0].text
@@ -0,0 +1,49 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from evefit_core.eos_adapter import EOS_PARENT
+
+
+@pytest.fixture
+def eos_modules(monkeypatch):
+    # Only the effect code is needed, no gamedata; eos.db is never queried
+    if str(EOS_PARENT) not in sys.path:
+        monkeypatch.syspath_prepend(str(EOS_PARENT))
+    config = pytest.importorskip("eos.config")
+    if "eos.db" not in sys.modules:
+        config.saveddata_connectionstring = "sqlite:///:memory:"
+        config.gamedata_connectionstring = "sqlite:///:memory:"
+    pytest.importorskip("eos.db")
+    gamedata = pytest.importorskip("eos.gamedata")
+    effectProfiler = pytest.importorskip("eos.effectProfiler")
+    profileCharacter = pytest.importorskip("eos.saveddata.profileCharacter")
+    monkeypatch.setattr(profileCharacter, "_handlerScopes", {})
+    monkeypatch.setattr(profileCharacter, "_skillScopes", {})
+    return gamedata, effectProfiler, profileCharacter
+
+
+def skill_with_effect(gamedata, effect_id):
+    effect = gamedata.Effect()
+    effect.ID = effect_id
+    effect.name = f"effect{effect_id}"
+    effect.init()
+    return SimpleNamespace(ID=effect_id, effects={effect.name: effect})
+
+
+def test_skill_scope_read_while_profiling_stays_correct(eos_modules):
+    gamedata, effectProfiler, profileCharacter = eos_modules
+    # Controlled Bursts: boosts modules requiring Gunnery
+    skill = skill_with_effect(gamedata, 287)
+
+    profiler = effectProfiler.EffectProfiler()
+    profiler.enable()
+    try:
+        assert profileCharacter.skillScope(skill) == frozenset({"Gunnery"})
+    finally:
+        profiler.disable()
+
+    assert profileCharacter.skillScope(skill) == frozenset({"Gunnery"})
+    effect = next(iter(skill.effects.values()))
+    assert profileCharacter.handlerScope(effect.handler) == frozenset({"Gunnery"})
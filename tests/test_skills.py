@@ -0,0 +1,36 @@
+import threading
+
+from evefit_core.skills import SkillIndex, SkillProfile, SkillProfileRepository
+
+
+def test_unsaved_profiles_digest_like_stored_without_interning(tmp_path):
+    repo = SkillProfileRepository(tmp_path)
+    repo.save(SkillProfile(name="Main", skills={"Gunnery": 4, "Navigation": 9}))
+    stored = repo.get("Main")
+    interned = len(repo.index)
+
+    # Same content under the same name, as sent inline by a daemon client
+    inline = SkillProfile(name="Main", skills={"Navigation": 5, "Gunnery": 4})
+    assert repo.digest(inline) == repo.digest(stored)
+
+    other = SkillProfile(name="Inline", skills={"Small Hybrid Turret": 3})
+    assert repo.digest(other) != repo.digest(stored)
+    assert len(repo.index) == interned
+
+
+def test_index_interns_each_name_once_across_threads():
+    index = SkillIndex()
+    names = [f"Skill {i}" for i in range(2000)]
+
+    def intern_all():
+        for name in names:
+            index.intern(name)
+
+    threads = [threading.Thread(target=intern_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(index) == len(names)
+    assert sorted(index.id_of(name) for name in names) == list(range(len(names)))